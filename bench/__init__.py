@@ -0,0 +1,5 @@
+"""
+Budget Famille - Bench
+=======================
+Outils de mesure de performance hors ligne (faux réseau social local, benchmarks).
+"""
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Budget Famille - Mock Social Server
+====================================
+Faux LinkedIn / Instagram / Facebook / X servi en local.
+
+Reproduit les sélecteurs utilisés par les posters (tweetTextarea_N et addButton des threads,
+share-actions__primary-action, dialog Next/Share d'Instagram...) avec
+login factice, bannières de cookies, dialogues de composition et
+endpoints d'upload à latence configurable.
+
+Usage:
+    python -m bench.mock_server --port 8765 --upload-latency 500
+
+Puis pointer les posters dessus:
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765/linkedin python main.py ...
+"""
+
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qs
+from typing import List, Dict, Any, Optional
+
+PLATFORMS = ('linkedin', 'instagram', 'facebook', 'twitter')
+
+# Chemins (relatifs à /<plateforme>) des pages de login et d'accueil
+LOGIN_PATHS = {
+    'linkedin': '/login',
+    'instagram': '/accounts/login/',
+    'facebook': '/login',
+    'twitter': '/i/flow/login',
+}
+
+HOME_PATHS = {
+    'linkedin': '/feed/',
+    'instagram': '/',
+    'facebook': '/',
+    'twitter': '/home',
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JavaScript commun
+# ═══════════════════════════════════════════════════════════════════════════════
+
+COMMON_JS = """
+const PLATFORM = '%(platform)s';
+function acceptCookies() {
+    document.cookie = PLATFORM + '_consent=1; path=/';
+    document.querySelectorAll('.mock-cookie').forEach(el => el.remove());
+}
+let uploadPromise = null;
+function startUpload(input, onDone) {
+    const file = input.files[0];
+    if (!file) return;
+    uploadPromise = fetch('/' + PLATFORM + '/upload', {method: 'POST', body: file})
+        .then(r => r.json());
+    if (onDone) uploadPromise.then(onDone);
+}
+async function publish(parts) {
+    const media = uploadPromise ? await uploadPromise : null;
+    uploadPromise = null;
+    const r = await fetch('/' + PLATFORM + '/publish', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({parts: parts, media: media && media.id, path: location.pathname}),
+    });
+    return r.json();
+}
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+body { font-family: sans-serif; margin: 0; }
+.mock-overlay { position: fixed; inset: 0; background: rgba(0,0,0,.4); z-index: 900; }
+.mock-cookie[role=dialog], .mock-cookie.banner { position: fixed; bottom: 0; left: 0; right: 0;
+    background: #fff; padding: 16px; z-index: 1000; }
+[role=dialog].modal { position: fixed; top: 10%%; left: 25%%; width: 50%%; background: #fff;
+    padding: 16px; z-index: 800; border: 1px solid #ccc; }
+[contenteditable] { min-height: 80px; border: 1px solid #ccc; padding: 4px; }
+.hidden { display: none !important; }
+</style>
+<script>%(common_js)s</script>
+</head>
+<body>
+%(cookie)s
+%(body)s
+</body>
+</html>
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Pages par plateforme
+# ═══════════════════════════════════════════════════════════════════════════════
+
+COOKIE_BANNERS = {
+    'linkedin': """
+<div class="mock-cookie banner artdeco-global-alert">
+  <p>LinkedIn utilise des cookies.</p>
+  <button action-type="ACCEPT" onclick="acceptCookies()">Accept</button>
+</div>""",
+    'instagram': """
+<div class="mock-cookie banner">
+  <p>Allow the use of cookies by Instagram?</p>
+  <button onclick="acceptCookies()">Allow all cookies</button>
+</div>""",
+    'facebook': """
+<div class="mock-cookie mock-overlay"></div>
+<div class="mock-cookie" role="dialog" data-testid="cookie-policy-manage-dialog">
+  <p>Autoriser l'utilisation des cookies de Facebook ?</p>
+  <div role="button" tabindex="0" onclick="acceptCookies()">Allow all cookies</div>
+  <div role="button" tabindex="0" onclick="acceptCookies()">Decline optional cookies</div>
+</div>""",
+    'twitter': """
+<div class="mock-cookie banner">
+  <p>Did someone say … cookies?</p>
+  <button data-testid="cookie-banner-accept" onclick="acceptCookies()">Accept all cookies</button>
+</div>""",
+}
+
+LOGIN_PAGES = {
+    'linkedin': """
+<form method="post" action="/linkedin/login">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form>""",
+    'instagram': """
+<form method="post" action="/instagram/accounts/login/">
+  <input name="username" type="text">
+  <input name="password" type="password">
+  <button type="submit">Log in</button>
+</form>""",
+    'facebook': """
+<form method="post" action="/facebook/login">
+  <input id="email" name="email" type="text">
+  <input id="pass" name="pass" type="password">
+  <button name="login" type="submit">Log In</button>
+</form>""",
+    'twitter': """
+<form method="post" action="/twitter/i/flow/login" id="flow">
+  <div id="step-username">
+    <input autocomplete="username" name="text" type="text">
+    <button type="button" onclick="
+        document.getElementById('step-username').classList.add('hidden');
+        document.getElementById('step-password').classList.remove('hidden');">Next</button>
+  </div>
+  <div id="step-password" class="hidden">
+    <input name="password" type="password">
+    <button type="submit" data-testid="LoginForm_Login_Button">Log in</button>
+  </div>
+</form>""",
+}
+
+HOME_PAGES = {
+    'linkedin': """
+<header><img class="global-nav__me-photo" alt="Moi" src="data:,"></header>
+<main>
+  <button class="share-box-feed-entry__trigger" aria-label="Start a post"
+          onclick="document.getElementById('share').classList.remove('hidden')">Start a post</button>
+</main>
+<div id="share" class="share-box artdeco-modal modal hidden" role="dialog">
+  <div class="ql-editor" data-placeholder="What do you want to talk about?"
+       contenteditable="true" role="textbox"></div>
+  <input type="file" accept="image/*" onchange="startUpload(this)">
+  <div class="share-box-footer">
+    <button class="share-actions__primary-action artdeco-button--primary" onclick="
+        const editor = document.querySelector('.ql-editor');
+        publish([editor.innerText]).then(() => {
+            editor.innerText = '';
+            document.getElementById('share').classList.add('hidden');
+        });">Post</button>
+  </div>
+</div>""",
+    'instagram': """
+<nav>
+  <a href="#" onclick="openCreate(); return false;"><svg aria-label="Home" width="24" height="24"></svg></a>
+  <a href="#" onclick="openCreate(); return false;">
+    <svg aria-label="New post" width="24" height="24"><rect width="24" height="24"></rect></svg>
+    <span>Create</span>
+  </a>
+</nav>
+<div id="create" class="modal hidden" role="dialog">
+  <header><h1 role="heading">Create new post</h1>
+    <button type="button" id="ig-next" class="hidden" onclick="nextStep()">Next</button>
+    <button type="button" id="ig-share" class="hidden" onclick="share()">Share</button>
+  </header>
+  <div id="step-select"><input type="file" accept="image/*,video/*" onchange="startUpload(this); goStep(1)"></div>
+  <div id="step-caption" class="hidden">
+    <textarea aria-label="Write a caption..."></textarea>
+  </div>
+  <div id="shared" class="hidden">Your post has been shared.</div>
+</div>
+<script>
+let step = 0;
+function openCreate() { document.getElementById('create').classList.remove('hidden'); }
+function goStep(n) {
+    step = n;
+    document.getElementById('step-select').classList.toggle('hidden', n !== 0);
+    document.getElementById('ig-next').classList.toggle('hidden', !(n === 1 || n === 2));
+    document.getElementById('step-caption').classList.toggle('hidden', n !== 3);
+    document.getElementById('ig-share').classList.toggle('hidden', n !== 3);
+}
+function nextStep() { goStep(step + 1); }
+function share() {
+    document.getElementById('ig-share').classList.add('hidden');
+    publish([document.querySelector('#step-caption textarea').value]).then(() => {
+        document.getElementById('step-caption').classList.add('hidden');
+        document.getElementById('shared').classList.remove('hidden');
+    });
+}
+</script>""",
+    'facebook': """
+<div role="navigation" data-pagelet="LeftRail"><div aria-label="Account" role="button">Compte</div></div>
+<main>
+  %(page_header)s
+  <div role="button" tabindex="0" aria-label="Create a post"
+       onclick="document.getElementById('composer').classList.remove('hidden')">What's on your mind?</div>
+</main>
+<div id="composer" class="modal hidden" role="dialog">
+  <div contenteditable="true" role="textbox" aria-label="What's on your mind?"></div>
+  <div role="button" tabindex="0" aria-label="Photo/video">Photo/video</div>
+  <input type="file" accept="image/*,video/*" onchange="startUpload(this)">
+  <div role="button" tabindex="0" aria-label="Post" onclick="
+      const box = document.querySelector('#composer [role=textbox]');
+      publish([box.innerText]).then(() => {
+          box.innerText = '';
+          document.getElementById('composer').classList.add('hidden');
+      });">Post</div>
+</div>""",
+    'twitter': """
+<nav><a data-testid="SideNav_NewTweet_Button" href="#">Post</a></nav>
+<main data-testid="primaryColumn">
+  <div id="thread">
+    <div data-testid="tweetTextarea_0" contenteditable="true" role="textbox"></div>
+  </div>
+  <input data-testid="fileInput" type="file" accept="image/*,video/*" onchange="startUpload(this)">
+  <button data-testid="addButton" aria-label="Add post" onclick="
+      const thread = document.getElementById('thread');
+      const area = document.createElement('div');
+      area.setAttribute('data-testid', 'tweetTextarea_' + thread.children.length);
+      area.setAttribute('contenteditable', 'true');
+      area.setAttribute('role', 'textbox');
+      thread.appendChild(area);">+</button>
+  <button data-testid="tweetButtonInline" onclick="
+      const areas = [...document.querySelectorAll('#thread [role=textbox]')];
+      publish(areas.map(a => a.innerText)).then(() => {
+          areas.forEach((a, i) => { if (i) a.remove(); else a.innerText = ''; });
+      });">Post</button>
+</main>""",
+}
+
+
+class MockSocialServer:
+    """Serveur HTTP local imitant les quatre réseaux sociaux."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, page_latency_ms: float = 0,
+                 upload_latency_ms: float = 0, upload_ms_per_mb: float = 0):
+        self.host = host
+        self.port = port
+        self.page_latency_ms = page_latency_ms
+        self.upload_latency_ms = upload_latency_ms
+        self.upload_ms_per_mb = upload_ms_per_mb
+        self.published: List[Dict[str, Any]] = []
+        self.uploads: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def base_url(self, platform: str) -> str:
+        """URL de base à passer au poster (ou via <PLATFORM>_BASE_URL)."""
+        return f"{self.url}/{platform}"
+
+    def env(self) -> Dict[str, str]:
+        """Variables d'environnement pointant tous les posters vers ce serveur."""
+        return {f'{p.upper()}_BASE_URL': self.base_url(p) for p in PLATFORMS}
+
+    def start(self) -> 'MockSocialServer':
+        server = self
+
+        class Handler(MockRequestHandler):
+            mock = server
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='mock-social', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def reset(self):
+        with self._lock:
+            self.published.clear()
+            self.uploads.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routage des requêtes du faux réseau social."""
+
+    mock: MockSocialServer = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # ─── Utilitaires ──────────────────────────────────────────────────────────
+
+    def _split(self):
+        path = urlsplit(self.path).path
+        parts = path.split('/', 2)
+        platform = parts[1] if len(parts) > 1 else ''
+        rest = '/' + parts[2] if len(parts) > 2 else '/'
+        return platform, rest
+
+    def _cookies(self) -> SimpleCookie:
+        return SimpleCookie(self.headers.get('Cookie', ''))
+
+    def _has_cookie(self, name: str) -> bool:
+        return name in self._cookies()
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, data, status: int = 200):
+        self._send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def _redirect(self, location: str, cookie: str = None):
+        headers = {'Location': location}
+        if cookie:
+            headers['Set-Cookie'] = f"{cookie}=1; Path=/"
+        self._send(303, b'', 'text/plain', headers)
+
+    def _page(self, platform: str, title: str, body: str):
+        if self.mock.page_latency_ms:
+            time.sleep(self.mock.page_latency_ms / 1000)
+
+        cookie = '' if self._has_cookie(f'{platform}_consent') else COOKIE_BANNERS[platform]
+        html = PAGE_TEMPLATE % {
+            'title': title,
+            'common_js': COMMON_JS % {'platform': platform},
+            'cookie': cookie,
+            'body': body,
+        }
+        self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    # ─── Routes ───────────────────────────────────────────────────────────────
+
+    def do_GET(self):
+        platform, rest = self._split()
+
+        if platform == '_mock' and rest == '/posts':
+            with self.mock._lock:
+                return self._json(list(self.mock.published))
+
+        if platform not in PLATFORMS:
+            return self._send(404, b'not found', 'text/plain')
+
+        logged_in = self._has_cookie(f'{platform}_session')
+        login_path = f"/{platform}{LOGIN_PATHS[platform]}"
+        home_path = f"/{platform}{HOME_PATHS[platform]}"
+
+        if rest == LOGIN_PATHS[platform]:
+            if logged_in:
+                return self._redirect(home_path)
+            return self._page(platform, f"{platform} - login", LOGIN_PAGES[platform])
+
+        if not logged_in:
+            return self._redirect(login_path)
+
+        if rest == HOME_PATHS[platform]:
+            body = HOME_PAGES[platform]
+            if platform == 'facebook':
+                body = body % {'page_header': ''}
+            return self._page(platform, f"{platform} - home", body)
+
+        if platform == 'linkedin' and rest == '/':
+            return self._redirect(home_path)
+
+        if platform == 'facebook' and rest.count('/') == 1:
+            # Page Facebook gérée: même composer, avec l'identifiant de la page
+            name = rest.strip('/')
+            header = f'<h1 data-page-name="{name}">{name}</h1>'
+            return self._page(platform, f"{name} | Facebook", HOME_PAGES['facebook'] % {'page_header': header})
+
+        return self._send(404, b'not found', 'text/plain')
+
+    def do_POST(self):
+        platform, rest = self._split()
+
+        if platform not in PLATFORMS:
+            return self._send(404, b'not found', 'text/plain')
+
+        body = self._read_body()
+
+        if rest == LOGIN_PATHS[platform]:
+            fields = parse_qs(body.decode('utf-8', 'replace'))
+            if not any(values and values[0] for values in fields.values()):
+                return self._redirect(f"/{platform}{LOGIN_PATHS[platform]}")
+            return self._redirect(f"/{platform}{HOME_PATHS[platform]}", cookie=f'{platform}_session')
+
+        if rest == '/upload':
+            delay = self.mock.upload_latency_ms + self.mock.upload_ms_per_mb * len(body) / (1024 * 1024)
+            if delay:
+                time.sleep(delay / 1000)
+            with self.mock._lock:
+                upload_id = len(self.mock.uploads) + 1
+                self.mock.uploads.append({'id': upload_id, 'platform': platform, 'size': len(body)})
+            return self._json({'id': upload_id, 'size': len(body)})
+
+        if rest == '/publish':
+            try:
+                data = json.loads(body or b'{}')
+            except json.JSONDecodeError:
+                return self._json({'error': 'invalid json'}, status=400)
+            entry = {
+                'platform': platform,
+                'parts': data.get('parts') or [],
+                'media': data.get('media'),
+                'path': data.get('path'),
+                'timestamp': time.time(),
+            }
+            with self.mock._lock:
+                self.mock.published.append(entry)
+            return self._json({'ok': True, 'id': len(self.mock.published)})
+
+        return self._send(404, b'not found', 'text/plain')
+
+
+def main():
+    import click
+
+    @click.command()
+    @click.option('--host', default='127.0.0.1', help='Adresse d\'écoute')
+    @click.option('--port', default=8765, type=int, help='Port d\'écoute')
+    @click.option('--page-latency', default=0.0, type=float, help='Latence par page (ms)')
+    @click.option('--upload-latency', default=0.0, type=float, help='Latence fixe par upload (ms)')
+    @click.option('--upload-ms-per-mb', default=0.0, type=float, help='Latence d\'upload par Mo (ms)')
+    def run(host, port, page_latency, upload_latency, upload_ms_per_mb):
+        """Lance le faux réseau social local."""
+        server = MockSocialServer(host, port, page_latency, upload_latency, upload_ms_per_mb).start()
+        print(f"🧪 Mock social server sur {server.url}")
+        for key, value in server.env().items():
+            print(f"   export {key}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.stop()
+
+    run()
+
+
+if __name__ == '__main__':
+    main()
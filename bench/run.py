@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Budget Famille - Benchmarks
+============================
+Mesure le pipeline de publication contre le serveur factice local.
+
+Usage:
+    python -m bench.run                     # Tous les benchmarks
+    python -m bench.run --only posts        # Uniquement get_pending_posts
+    python -m bench.run --quick             # Tailles réduites
+    python -m bench.run --save-baseline     # Enregistre la référence
+
+Les résultats sont écrits dans bench/results/ et comparés à
+bench/baseline.json: une métrique qui se dégrade au-delà de la
+tolérance fait échouer la commande (code de sortie 1).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Callable
+
+import click
+
+# Exécutable depuis la racine du projet (python -m bench.run) ou directement
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench.mock_server import MockSocialServer, PLATFORMS
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / 'results'
+BASELINE_FILE = BENCH_DIR / 'baseline.json'
+
+BENCHMARKS = ('browser', 'posts', 'caption', 'upload', 'e2e')
+
+# Identifiants factices acceptés par le serveur local
+MOCK_CREDENTIALS = {
+    'LINKEDIN_EMAIL': 'bench@example.com',
+    'LINKEDIN_PASS': 'bench',
+    'INSTAGRAM_USER': 'bench',
+    'INSTAGRAM_PASS': 'bench',
+    'FACEBOOK_EMAIL': 'bench@example.com',
+    'FACEBOOK_PASS': 'bench',
+    'TWITTER_USER': 'bench',
+    'TWITTER_PASS': 'bench',
+}
+
+
+class BenchResults:
+    """Collecte des métriques (valeur, unité, sens d'amélioration)."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.skipped: Dict[str, str] = {}
+
+    def add(self, name: str, value: float, unit: str = 's', higher_is_better: bool = False):
+        self.metrics[name] = {
+            'value': round(value, 4),
+            'unit': unit,
+            'higher_is_better': higher_is_better,
+        }
+        click.echo(f"   {name:<40} {value:>10.4f} {unit}")
+
+    def skip(self, benchmark: str, reason: str):
+        self.skipped[benchmark] = reason
+        click.echo(f"   ⚠️  {benchmark} ignoré: {reason}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'metrics': self.metrics,
+            'skipped': self.skipped,
+        }
+
+
+def timed(func: Callable, repeat: int = 1) -> float:
+    """Médiane du temps d'exécution de func sur `repeat` essais."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_pending_posts
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_posts_tree(root: Path, count: int):
+    """Crée `count` dossiers de posts synthétiques (1 sur 10 avec config.json)."""
+    config = json.dumps({'platforms': ['linkedin', 'facebook', 'twitter'], 'schedule': None})
+    for i in range(count):
+        post_dir = root / f"2025-01-01-{i:06d}"
+        post_dir.mkdir()
+        (post_dir / 'caption.txt').write_text(f"Post synthétique {i}\n\n#BudgetFamille", encoding='utf-8')
+        if i % 10 == 0:
+            (post_dir / 'config.json').write_text(config, encoding='utf-8')
+
+
+def bench_pending_posts(results: BenchResults, sizes: List[int]):
+    from utils.helpers import get_pending_posts
+
+    for size in sizes:
+        root = Path(tempfile.mkdtemp(prefix='bench-posts-'))
+        try:
+            build_posts_tree(root, size)
+            duration = timed(lambda: get_pending_posts(root), repeat=3 if size <= 1000 else 1)
+            results.add(f"pending_posts.{size}", duration)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Navigateur (serveur factice)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def launch_context(playwright, user_data_dir: Path):
+    return playwright.chromium.launch_persistent_context(
+        user_data_dir=str(user_data_dir),
+        channel=os.getenv('BROWSER_CHANNEL') or None,
+        headless=True,
+    )
+
+
+def bench_browser_start(results: BenchResults, playwright, server: MockSocialServer, repeat: int):
+    home = server.base_url('twitter') + '/home'
+
+    def start_and_load(user_data_dir: Path):
+        context = launch_context(playwright, user_data_dir)
+        page = context.pages[0] if context.pages else context.new_page()
+        page.goto(home, wait_until='domcontentloaded')
+        context.close()
+
+    cold = []
+    for _ in range(repeat):
+        user_data_dir = Path(tempfile.mkdtemp(prefix='bench-cold-'))
+        cold.append(timed(lambda: start_and_load(user_data_dir)))
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    warm_dir = Path(tempfile.mkdtemp(prefix='bench-warm-'))
+    start_and_load(warm_dir)
+    warm = [timed(lambda: start_and_load(warm_dir)) for _ in range(repeat)]
+    shutil.rmtree(warm_dir, ignore_errors=True)
+
+    results.add('browser.cold_start', statistics.median(cold))
+    results.add('browser.warm_start', statistics.median(warm))
+
+
+def logged_in_page(playwright, server: MockSocialServer, platform_name: str, user_data_dir: Path):
+    """Ouvre un contexte déjà connecté (cookies de session/consentement) sur la plateforme."""
+    context = launch_context(playwright, user_data_dir)
+    context.add_cookies([
+        {'name': f'{platform_name}_session', 'value': '1', 'url': server.url},
+        {'name': f'{platform_name}_consent', 'value': '1', 'url': server.url},
+    ])
+    page = context.pages[0] if context.pages else context.new_page()
+    return context, page
+
+
+def bench_caption_entry(results: BenchResults, playwright, server: MockSocialServer,
+                        lengths: List[int], type_delay: int):
+    user_data_dir = Path(tempfile.mkdtemp(prefix='bench-caption-'))
+    context, page = logged_in_page(playwright, server, 'twitter', user_data_dir)
+    try:
+        page.goto(server.base_url('twitter') + '/home', wait_until='domcontentloaded')
+        area = page.locator('[data-testid="tweetTextarea_0"]').first
+
+        for length in lengths:
+            text = ("Budget Famille vous aide à économiser. " * (length // 38 + 1))[:length]
+            area.click()
+            area.fill('')
+            duration = timed(lambda: area.type(text, delay=type_delay))
+            results.add(f"caption.type.{length}", duration)
+    finally:
+        context.close()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+def bench_media_upload(results: BenchResults, playwright, server: MockSocialServer, sizes_mb: List[float]):
+    user_data_dir = Path(tempfile.mkdtemp(prefix='bench-upload-'))
+    media_dir = Path(tempfile.mkdtemp(prefix='bench-media-'))
+    context, page = logged_in_page(playwright, server, 'twitter', user_data_dir)
+    try:
+        page.goto(server.base_url('twitter') + '/home', wait_until='domcontentloaded')
+        file_input = page.locator('input[type="file"]').first
+
+        for size_mb in sizes_mb:
+            media = media_dir / f"media-{size_mb}.jpg"
+            media.write_bytes(os.urandom(int(size_mb * 1024 * 1024)))
+
+            def upload():
+                with page.expect_response(lambda r: r.url.endswith('/upload')):
+                    file_input.set_input_files(str(media))
+
+            results.add(f"upload.{size_mb}mb", timed(upload))
+    finally:
+        context.close()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        shutil.rmtree(media_dir, ignore_errors=True)
+
+
+def bench_end_to_end(results: BenchResults, server: MockSocialServer, posts: int):
+    """Publication complète via les posters (login compris) sur toutes les plateformes."""
+    from platforms import LinkedInPoster, InstagramPoster, FacebookPoster, TwitterPoster
+
+    posters = {
+        'linkedin': LinkedInPoster,
+        'instagram': InstagramPoster,
+        'facebook': FacebookPoster,
+        'twitter': TwitterPoster,
+    }
+
+    media_dir = Path(tempfile.mkdtemp(prefix='bench-e2e-'))
+    image = media_dir / 'image.jpg'
+    image.write_bytes(os.urandom(200 * 1024))
+    text = "🚀 Budget Famille est disponible !\n\nGérez votre budget familial.\n\n#BudgetFamille"
+
+    durations = []
+    failures = 0
+    try:
+        for _ in range(posts):
+            start = time.perf_counter()
+            for platform_name in PLATFORMS:
+                poster = posters[platform_name](headless=True, base_url=server.base_url(platform_name))
+                result = poster.post(text=text, image_path=str(image))
+                if not result['success']:
+                    failures += 1
+            durations.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(media_dir, ignore_errors=True)
+
+    per_post = statistics.median(durations)
+    results.add('e2e.seconds_per_post', per_post)
+    results.add('e2e.posts_per_hour', 3600 / per_post if per_post else 0, unit='posts/h', higher_is_better=True)
+    results.add('e2e.failures', failures, unit='count')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Comparaison à la référence
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare les métriques à la référence.
+
+    Returns:
+        Liste des régressions (vide si aucune)
+    """
+    regressions = []
+
+    for name, metric in current['metrics'].items():
+        reference = baseline.get('metrics', {}).get(name)
+        if not reference:
+            continue
+
+        value, ref_value = metric['value'], reference['value']
+        if metric['unit'] == 'count':
+            worse = value > ref_value
+        elif metric['higher_is_better']:
+            worse = value < ref_value * (1 - tolerance)
+        else:
+            worse = value > ref_value * (1 + tolerance)
+
+        if worse:
+            regressions.append(f"{name}: {value} {metric['unit']} (référence {ref_value})")
+
+    return regressions
+
+
+@click.command()
+@click.option('--only', 'only', multiple=True, type=click.Choice(BENCHMARKS),
+              help='Benchmarks à lancer (répétable)')
+@click.option('--quick', is_flag=True, help='Tailles réduites (CI)')
+@click.option('--repeat', default=3, type=int, help='Répétitions des mesures navigateur')
+@click.option('--posts', 'e2e_posts', default=3, type=int, help='Nombre de posts pour le bout-en-bout')
+@click.option('--delay-scale', default=0.0, type=float,
+              help='Facteur des délais humains pendant le bout-en-bout (0 = aucun)')
+@click.option('--tolerance', default=0.2, type=float, help='Dégradation tolérée (0.2 = 20%)')
+@click.option('--baseline', 'baseline_path', default=str(BASELINE_FILE), type=click.Path(),
+              help='Fichier de référence')
+@click.option('--save-baseline', is_flag=True, help='Enregistrer ces résultats comme référence')
+def main(only, quick, repeat, e2e_posts, delay_scale, tolerance, baseline_path, save_baseline):
+    """Benchmarks du pipeline de publication (hors ligne)."""
+    selected = set(only or BENCHMARKS)
+    results = BenchResults()
+
+    work_dir = Path(tempfile.mkdtemp(prefix='bench-run-'))
+    os.environ.update(MOCK_CREDENTIALS)
+    os.environ.update({
+        'USE_EXISTING_CHROME': 'false',
+        'BROWSER_CHANNEL': os.getenv('BENCH_BROWSER_CHANNEL', ''),
+        'BROWSER_DATA_DIR': str(work_dir / 'browser_data'),
+        'HUMAN_DELAY_SCALE': str(delay_scale),
+    })
+
+    if 'posts' in selected:
+        click.echo("\n📂 get_pending_posts")
+        bench_pending_posts(results, [10, 1000] if quick else [10, 1000, 50000])
+
+    browser_benchmarks = selected & {'browser', 'caption', 'upload', 'e2e'}
+    if browser_benchmarks:
+        server = MockSocialServer(upload_latency_ms=50, upload_ms_per_mb=20).start()
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            for name in browser_benchmarks:
+                results.skip(name, "playwright non installé")
+        else:
+            try:
+                with sync_playwright() as playwright:
+                    if 'browser' in selected:
+                        click.echo("\n🌐 Démarrage navigateur")
+                        bench_browser_start(results, playwright, server, repeat)
+                    if 'caption' in selected:
+                        click.echo("\n⌨️  Saisie de la légende")
+                        bench_caption_entry(results, playwright, server,
+                                            [50, 280] if quick else [50, 280, 1000, 2200], type_delay=15)
+                    if 'upload' in selected:
+                        click.echo("\n📤 Upload des médias")
+                        bench_media_upload(results, playwright, server, [0.1, 1] if quick else [0.1, 1, 5, 20])
+                if 'e2e' in selected:
+                    click.echo("\n🚀 Bout-en-bout")
+                    bench_end_to_end(results, server, 1 if quick else e2e_posts)
+            except Exception as e:
+                for name in browser_benchmarks:
+                    if not any(key.startswith(name) for key in results.metrics):
+                        results.skip(name, f"navigateur indisponible ({str(e).splitlines()[0][:80]})")
+        finally:
+            server.stop()
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    current = results.to_dict()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    result_file = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2, ensure_ascii=False)
+    click.echo(f"\n📝 Résultats: {result_file}")
+
+    baseline_file = Path(baseline_path)
+    if save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        click.echo(f"📌 Référence enregistrée: {baseline_file}")
+        return
+
+    if not baseline_file.exists():
+        click.echo("ℹ️  Pas de référence (lancez avec --save-baseline)")
+        return
+
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(current, baseline, tolerance)
+    if regressions:
+        click.echo(f"\n❌ {len(regressions)} régression(s) (tolérance {tolerance:.0%}):")
+        for regression in regressions:
+            click.echo(f"   • {regression}")
+        sys.exit(1)
+
+    click.echo("\n✅ Aucune régression par rapport à la référence")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+Budget Famille - Pytest
+========================
+Racine du dépôt importable par les tests (python -m pytest ou pytest).
+"""
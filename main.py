@@ -7,9 +7,15 @@ Script principal pour publier automatiquement sur les réseaux sociaux.
 Usage:
     python main.py                      # Publie tous les posts en attente
     python main.py --platform linkedin  # Publie uniquement sur LinkedIn
+    python main.py --account marque     # Publie uniquement pour ce compte
     python main.py --post 2025-01-20    # Publie un post spécifique
     python main.py --visible            # Mode visible (debug)
     python main.py --dry-run            # Simule sans publier
+    python main.py --check              # Matrice de pré-vol (post × plateforme)
+    python main.py --profile            # Trace + HAR si une étape est lente
+    python main.py --tabs               # Toutes les plateformes dans un navigateur
+    python main.py -t astuce-budget --rows astuces.csv  # Crée les posts d'un CSV/JSONL
+    python main.py --import calendrier.csv              # Importe un calendrier dans le catalogue
 """
 
 import os
@@ -17,22 +23,19 @@ import sys
 import json
 import time
 import click
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich import print as rprint
-
-# Import des modules de publication
-from platforms.linkedin import LinkedInPoster
-from platforms.instagram import InstagramPoster
-from platforms.facebook import FacebookPoster
-from platforms.twitter import TwitterPoster
+
+# Les posters (et playwright) ne sont importés qu'au moment de publier; le
+# pré-vol, l'index des doublons et les workers seulement après --list
+from platforms.registry import builtin_platforms, available_platforms, is_platform, get_poster_class
 from utils.logger import setup_logger
-from utils.helpers import load_post, validate_post, get_pending_posts
+from utils.helpers import load_post, get_pending_posts
+from utils.context import RUN_ID, job_id, log_context, submit_in_context
+from utils.accounts import DEFAULT_ACCOUNT, load_accounts, resolve_accounts, job_key
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -40,14 +43,6 @@ load_dotenv()
 # Console Rich pour l'affichage
 console = Console()
 
-# Configuration des plateformes
-PLATFORMS = {
-    'linkedin': LinkedInPoster,
-    'instagram': InstagramPoster,
-    'facebook': FacebookPoster,
-    'twitter': TwitterPoster,
-}
-
 # Emojis pour chaque plateforme
 PLATFORM_EMOJIS = {
     'linkedin': '💼',
@@ -99,6 +94,8 @@ def check_credentials():
 
 def display_posts_table(posts: list):
     """Affiche un tableau des posts à publier."""
+    from rich.table import Table
+    
     table = Table(title="📋 Posts en attente")
     table.add_column("Date", style="cyan")
     table.add_column("Texte (aperçu)", style="white")
@@ -108,72 +105,373 @@ def display_posts_table(posts: list):
     for post in posts:
         text_preview = post['text'][:50] + "..." if len(post['text']) > 50 else post['text']
         media = "📷" if post.get('image') else ("🎬" if post.get('video') else "—")
-        platforms = ", ".join([PLATFORM_EMOJIS.get(p, p) for p in post.get('platforms', PLATFORMS.keys())])
+        platforms = ", ".join([PLATFORM_EMOJIS.get(p, p) for p in post.get('platforms') or builtin_platforms()])
         
         table.add_row(post['date'], text_preview, media, platforms)
     
     console.print(table)
 
 
-def publish_post(post: dict, platforms: list, headless: bool = True, dry_run: bool = False):
+def display_preflight_matrix(report, posts: list):
+    """Affiche la matrice de pré-vol: une ligne par post, une colonne par plateforme."""
+    from rich.table import Table
+    
+    table = Table(title="🛫 Pré-vol")
+    table.add_column("Post", style="cyan")
+    for platform_name in report.platforms:
+        table.add_column(f"{PLATFORM_EMOJIS.get(platform_name, '📱')} {platform_name.capitalize()}", overflow="fold")
+    
+    for post in posts:
+        cells = []
+        for platform_name in report.platforms:
+            reasons = report.reasons(post['date'], platform_name)
+            if reasons is None:
+                cells.append("—")
+            elif reasons:
+                cells.append("[red]❌ " + "; ".join(reasons) + "[/red]")
+            else:
+                cells.append("[green]✅[/green]")
+        table.add_row(post['date'], *cells)
+    
+    console.print(table)
+    console.print(
+        f"   {report.publishable_count} publication(s) prête(s), "
+        f"{len(report.failures())} bloquée(s)\n"
+    )
+
+
+def display_profile_summary(platform_name: str, summary: dict):
+    """Affiche le résumé d'un profil de publication lente."""
+    from rich.table import Table
+    
+    console.print(f"\n📈 [bold]Profil {platform_name.capitalize()}[/bold] → {summary['path']}")
+    
+    table = Table(show_header=True)
+    table.add_column("Étape / Requête", style="cyan", overflow="fold")
+    table.add_column("Durée", style="white", justify="right")
+    table.add_column("Attente serveur", style="yellow", justify="right")
+    
+    for step in summary['steps'][:5]:
+        marker = " ⚠️" if step['slow'] else ""
+        table.add_row(f"{step['step']}{marker}", f"{step['duration']:.1f}s", "—")
+    
+    for request in summary.get('slowest_requests', [])[:5]:
+        table.add_row(
+            f"{request['method']} {request['url']}",
+            f"{request['time_ms'] / 1000:.1f}s",
+            f"{request['wait_ms'] / 1000:.1f}s",
+        )
+    
+    console.print(table)
+    
+    if summary.get('trace'):
+        console.print(f"   🔍 playwright show-trace {summary['trace']}")
+
+
+def job_context(post: dict, platform_name: str, account: str):
+    """Contexte de log d'un job (repris dans les logs, captures et profils)."""
+    return log_context(job_id=job_id(post['date'], platform_name, account), post=post['date'],
+                       platform=platform_name, account=account)
+
+
+def publish_post(post: dict, platform_name: str, headless: bool = True, dry_run: bool = False,
+                 profile: bool = False, account: str = DEFAULT_ACCOUNT, show_progress: bool = True,
+                 session=None, poster=None) -> dict:
     """
-    Publie un post sur les plateformes spécifiées.
+    Publie un post sur une plateforme, pour un compte.
     
     Args:
         post: Dictionnaire contenant le contenu du post
-        platforms: Liste des plateformes cibles
+        platform_name: Plateforme cible
         headless: Si False, affiche le navigateur
         dry_run: Si True, simule sans publier
+        profile: Si True, enregistre trace et HAR (conservés si une étape est lente)
+        account: Compte du registre (accounts.json)
+        show_progress: Afficher le spinner (désactivé quand des comptes publient en parallèle)
+        session: BrowserSession à réutiliser (contexte gardé ouvert entre les posts)
+        poster: Poster déjà préchauffé pour ce post (voir BasePoster.prewarm)
     """
-    results = {}
-    delay = int(os.getenv('DELAY_BETWEEN_POSTS', 300))
+    label = platform_name.capitalize()
+    if account != DEFAULT_ACCOUNT:
+        label += f" ({account})"
     
-    for i, platform_name in enumerate(platforms):
-        if platform_name not in PLATFORMS:
-            console.print(f"❌ Plateforme inconnue: {platform_name}", style="red")
-            results[platform_name] = {'success': False, 'error': 'Unknown platform'}
-            continue
-        
-        emoji = PLATFORM_EMOJIS.get(platform_name, '📱')
-        
-        if dry_run:
-            console.print(f"{emoji} [yellow][DRY RUN][/yellow] {platform_name.capitalize()}: Publication simulée")
-            results[platform_name] = {'success': True, 'dry_run': True}
-            continue
-        
-        with Progress(
+    if not is_platform(platform_name):
+        console.print(f"❌ Plateforme inconnue: {platform_name}", style="red")
+        return {'success': False, 'error': 'Unknown platform'}
+    
+    emoji = PLATFORM_EMOJIS.get(platform_name, '📱')
+    
+    if dry_run:
+        console.print(f"{emoji} [yellow][DRY RUN][/yellow] {label}: Publication simulée")
+        return {'success': True, 'dry_run': True}
+    
+    session_attempts = max(1, int(os.getenv('RETRY_SESSION_ATTEMPTS', 2)))
+    
+    if show_progress:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        progress = Progress(
             SpinnerColumn(),
-            TextColumn(f"{emoji} Publication sur {platform_name.capitalize()}..."),
+            TextColumn(f"{emoji} Publication sur {label}..."),
             console=console
-        ) as progress:
-            task = progress.add_task("posting", total=None)
+        )
+    else:
+        console.print(f"{emoji} Publication sur {label}...")
+        progress = nullcontext()
+    
+    with progress:
+        if show_progress:
+            progress.add_task("posting", total=None)
+        
+        try:
+            poster_class = get_poster_class(platform_name)
             
-            try:
-                poster_class = PLATFORMS[platform_name]
-                poster = poster_class(headless=headless)
-                
+            # Les étapes sont relancées dans la session; une nouvelle session
+            # n'est ouverte que pour une erreur transitoire avant envoi
+            for attempt in range(1, session_attempts + 1):
+                if poster is None or attempt > 1:
+                    poster = poster_class(headless=headless, profile=profile, account=account, session=session)
                 result = poster.post(
                     text=post['text'],
                     image_path=post.get('image'),
                     video_path=post.get('video')
                 )
                 
+                if result['success'] or result.get('error_type') != 'transient' or result.get('submitted'):
+                    break
+                if attempt < session_attempts:
+                    console.print(f"{emoji} 🔁 {label}: nouvelle session ({attempt + 1}/{session_attempts})", style="yellow")
+            
+            if result['success']:
+                console.print(f"{emoji} ✅ {label}: Publié avec succès!", style="green")
+            else:
+                console.print(f"{emoji} ❌ {label}: {result.get('error', 'Erreur inconnue')}", style="red")
+            
+            if result.get('profile'):
+                display_profile_summary(platform_name, result['profile'])
+            
+            return result
+            
+        except Exception as e:
+            error_msg = str(e)
+            console.print(f"{emoji} ❌ {label}: {error_msg}", style="red")
+            return {'success': False, 'error': error_msg}
+
+
+def run_account_jobs(jobs: list, start, finish, headless: bool = True, profile: bool = False,
+                     show_progress: bool = True):
+    """
+    Publie les jobs d'un compte aussi vite que ses buckets le permettent.
+    
+    Un job part dès qu'un jeton est disponible dans le bucket (plateforme,
+    compte); les autres plateformes n'attendent pas. Si aucun job n'est prêt,
+    le prochain est préchauffé (navigateur, connexion, composeur, médias)
+    puis on dort jusqu'à son créneau: l'attente masque la mise en place.
+    """
+    from platforms.session import SessionPool, session_reuse_enabled
+    from utils.ratelimit import TokenBucketLimiter
+    
+    # Une connexion SQLite et des contextes navigateur par thread
+    limiter = TokenBucketLimiter()
+    sessions = SessionPool() if session_reuse_enabled() else None
+    prewarm_enabled = os.getenv('PREWARM', 'true').lower() == 'true'
+    idle_timeout = float(os.getenv('BROWSER_IDLE_TIMEOUT', 300))
+    pending = list(jobs)
+    prewarmed = {}  # id du job -> poster prêt à envoyer
+    
+    try:
+        while pending:
+            ready, waits = None, []
+            for job in pending:
+                _, platform_name, account = job
+                wait = limiter.try_acquire(platform_name, account) if is_platform(platform_name) else 0
+                if wait == 0:
+                    ready = job
+                    break
+                waits.append(wait)
+            
+            if ready is None:
+                next_slot = min(waits)
+                if next_slot == float('inf'):
+                    for post, platform_name, account in pending:
+                        finish(post, platform_name, account, {'success': False, 'error': 'Rythme de publication nul (RATE_PER_HOUR=0)'})
+                    break
+                # Attente longue: inutile de garder les navigateurs ouverts
+                if next_slot > idle_timeout:
+                    for poster in prewarmed.values():
+                        poster.discard()
+                    prewarmed.clear()
+                    if sessions:
+                        sessions.close()
+                
+                console.print(f"\n⏳ Prochain créneau de publication dans {next_slot:.0f} secondes...\n")
+                waited = time.time()
+                
+                # Préparer le job suivant pendant l'attente
+                upcoming = pending[waits.index(next_slot)]
+                if (prewarm_enabled and next_slot <= idle_timeout and id(upcoming) not in prewarmed
+                        and is_platform(upcoming[1])):
+                    post, platform_name, account = upcoming
+                    with job_context(post, platform_name, account):
+                        poster = get_poster_class(platform_name)(
+                            headless=headless, profile=profile, account=account,
+                            session=sessions.get(account, platform_name) if sessions else None
+                        )
+                        if poster.prewarm(post['text'], post.get('image'), post.get('video')):
+                            prewarmed[id(upcoming)] = poster
+                        else:
+                            poster.discard()
+                
+                time.sleep(max(0.0, next_slot - (time.time() - waited)))
+                continue
+            
+            pending.remove(ready)
+            post, platform_name, account = ready
+            start(post)
+            with job_context(post, platform_name, account):
+                result = publish_post(post, platform_name, headless=headless, profile=profile,
+                                      account=account, show_progress=show_progress,
+                                      session=sessions.get(account, platform_name) if sessions else None,
+                                      poster=prewarmed.pop(id(ready), None))
+            
+            # Rien n'est parti: le jeton est rendu
+            if not result.get('success') and not result.get('submitted') and is_platform(platform_name):
+                limiter.refund(platform_name, account)
+            
+            finish(post, platform_name, account, result)
+    finally:
+        for poster in prewarmed.values():
+            poster.discard()
+        limiter.close()
+        if sessions:
+            sessions.close()
+
+
+def run_account_tabs(jobs: list, start, finish, headless: bool = True):
+    """
+    Mode onglets: chaque post d'un compte est publié sur toutes ses
+    plateformes dans un seul contexte navigateur. Navigation, connexion et
+    préparation se chevauchent; seuls les envois attendent le rythme.
+    """
+    from platforms.tabs import TabOrchestrator
+    from utils.ratelimit import TokenBucketLimiter
+    
+    limiter = TokenBucketLimiter()
+    by_post = {}
+    for job in jobs:
+        by_post.setdefault(job[0]['date'], []).append(job)
+    
+    try:
+        for post_jobs in by_post.values():
+            post, _, account = post_jobs[0]
+            platform_names = [platform_name for _, platform_name, _ in post_jobs]
+            start(post)
+            console.print(f"🗂️  {len(platform_names)} onglet(s): {', '.join(p.capitalize() for p in platform_names)}")
+            
+            try:
+                with log_context(post=post['date'], account=account):
+                    posters = [
+                        get_poster_class(platform_name)(headless=headless, account=account)
+                        for platform_name in platform_names
+                    ]
+                    results = TabOrchestrator(posters, limiter=limiter).run(
+                        text=post['text'],
+                        image_path=post.get('image'),
+                        video_path=post.get('video')
+                    )
+            except Exception as e:
+                results = {platform_name: {'success': False, 'error': str(e)} for platform_name in platform_names}
+            
+            for platform_name in platform_names:
+                result = results[platform_name]
+                emoji = PLATFORM_EMOJIS.get(platform_name, '📱')
                 if result['success']:
                     console.print(f"{emoji} ✅ {platform_name.capitalize()}: Publié avec succès!", style="green")
                 else:
                     console.print(f"{emoji} ❌ {platform_name.capitalize()}: {result.get('error', 'Erreur inconnue')}", style="red")
-                
-                results[platform_name] = result
-                
-            except Exception as e:
-                error_msg = str(e)
-                console.print(f"{emoji} ❌ {platform_name.capitalize()}: {error_msg}", style="red")
-                results[platform_name] = {'success': False, 'error': error_msg}
-        
-        # Attendre entre les publications (sauf pour le dernier)
-        if i < len(platforms) - 1 and not dry_run:
-            console.print(f"\n⏳ Pause de {delay} secondes avant la prochaine publication...\n")
-            time.sleep(delay)
+                finish(post, platform_name, account, result)
+    finally:
+        limiter.close()
+
+
+def run_schedule(jobs: list, headless: bool = True, dry_run: bool = False, profile: bool = False,
+                 on_post_done=None, max_workers: int = None, tabs: bool = False,
+                 on_job_done=None) -> dict:
+    """
+    Publie les jobs (post, plateforme, compte).
+    
+    Chaque compte a sa propre file, traitée par un worker: les comptes
+    publient en parallèle (contextes navigateur distincts), chacun à son
+    propre rythme.
+    
+    Args:
+        jobs: Liste de tuples (post, plateforme, compte), dans l'ordre de priorité
+        on_post_done: Appelé avec (post, résultats) quand tous ses jobs sont terminés
+        on_job_done: Appelé avec (post, plateforme, compte, résultat) après chaque job
+        max_workers: Comptes publiés en parallèle (défaut: MAX_PARALLEL_ACCOUNTS)
+        tabs: Mode onglets (toutes les plateformes d'un post dans un contexte)
+    
+    Returns:
+        Résultats indexés par date de post puis par job ("linkedin" ou "linkedin@compte")
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from rich.panel import Panel
+    
+    lock = threading.Lock()
+    results = {}
+    remaining = {}
+    for post, _, _ in jobs:
+        remaining[post['date']] = remaining.get(post['date'], 0) + 1
+    
+    def start(post):
+        with lock:
+            if post['date'] not in results:
+                results[post['date']] = {}
+                console.print(Panel(f"📝 Post {len(results)}/{len(remaining)}: {post['date']}", style="cyan"))
+    
+    def finish(post, platform_name, account, result):
+        start(post)
+        with lock:
+            results[post['date']][job_key(platform_name, account)] = result
+            if on_job_done:
+                on_job_done(post, platform_name, account, result)
+            remaining[post['date']] -= 1
+            if remaining[post['date']] == 0 and on_post_done:
+                on_post_done(post, results[post['date']])
+    
+    # Le dry-run ne consomme pas de jetons
+    if dry_run:
+        for post, platform_name, account in jobs:
+            start(post)
+            finish(post, platform_name, account, publish_post(post, platform_name, dry_run=True, account=account))
+        return results
+    
+    queues = {}
+    for job in jobs:
+        queues.setdefault(job[2], []).append(job)
+    
+    max_workers = max_workers or int(os.getenv('MAX_PARALLEL_ACCOUNTS', 4))
+    workers = max(1, min(len(queues), max_workers))
+    
+    def run_account(account_jobs, show_progress):
+        if tabs:
+            run_account_tabs(account_jobs, start, finish, headless=headless)
+        else:
+            run_account_jobs(account_jobs, start, finish, headless=headless, profile=profile,
+                             show_progress=show_progress)
+    
+    if workers == 1:
+        for account_jobs in queues.values():
+            run_account(account_jobs, True)
+    else:
+        console.print(f"👥 {len(queues)} comptes, {workers} en parallèle\n")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                submit_in_context(executor, run_account, account_jobs, False)
+                for account_jobs in queues.values()
+            ]
+            for future in futures:
+                future.result()
     
     return results
 
@@ -187,6 +485,7 @@ def save_results(post_date: str, results: dict):
     
     log_entry = {
         'timestamp': datetime.now().isoformat(),
+        'run_id': RUN_ID,
         'post_date': post_date,
         'results': results
     }
@@ -206,9 +505,90 @@ def save_results(post_date: str, results: dict):
     console.print(f"\n📝 Résultats sauvegardés dans {log_file}")
 
 
+def render_template_rows(template_name: str, rows: str, posts_folder: Path):
+    """Crée les dossiers de posts d'un CSV/JSONL et affiche le bilan."""
+    from utils.templates import render_batch
+    
+    try:
+        report = render_batch(template_name, Path(rows), posts_folder)
+    except FileNotFoundError as e:
+        console.print(f"❌ {e}", style="red")
+        sys.exit(1)
+    
+    console.print(f"\n📝 {len(report['created'])} post(s) créé(s) depuis {template_name}", style="green")
+    if report['skipped']:
+        console.print(f"⏭️  {len(report['skipped'])} dossier(s) déjà existant(s): {', '.join(report['skipped'])}", style="yellow")
+    for number, message in report['errors']:
+        console.print(f"❌ Ligne {number}: {message}", style="red")
+    
+    if report['errors']:
+        sys.exit(1)
+
+
+def import_calendar_file(calendar: str, posts_folder: Path):
+    """Importe un calendrier dans le catalogue et affiche le bilan."""
+    from utils.catalog import import_calendar, catalog_path
+    
+    report = import_calendar(Path(calendar), posts_folder)
+    
+    console.print(f"\n📥 {len(report['imported'])} post(s) importé(s) dans {catalog_path(posts_folder)}", style="green")
+    if report['duplicates']:
+        console.print(f"⏭️  {len(report['duplicates'])} doublon(s) ignoré(s)", style="yellow")
+    for number, message in report['errors']:
+        console.print(f"❌ Ligne {number}: {message}", style="red")
+    
+    if report['errors']:
+        sys.exit(1)
+
+
+def check_selectors(path: str):
+    """Rejoue les sélecteurs des posters sur des instantanés DOM et affiche le bilan."""
+    from rich.table import Table
+    from utils.snapshots import find_snapshots, evaluate_snapshots
+    
+    paths = find_snapshots(Path(path))
+    if not paths:
+        console.print(f"📭 Aucun instantané dans {path}", style="yellow")
+        sys.exit(0)
+    
+    started = time.perf_counter()
+    reports = evaluate_snapshots(paths)
+    elapsed = time.perf_counter() - started
+    
+    for report in reports:
+        table = Table(title=f"🧩 {report['platform'].capitalize()} / {report['name']} — {report['url']}",
+                      title_justify="left")
+        table.add_column("Élément", style="cyan")
+        table.add_column("Sélecteur retenu", overflow="fold")
+        table.add_column("Trouvés / visibles", overflow="fold")
+        
+        for group, result in report['groups'].items():
+            winner = f"[green]{result['winner']}[/green]" if result['winner'] else "[red]aucun[/red]"
+            counts = []
+            for selector, found, visible, error in result['selectors']:
+                if error:
+                    counts.append(f"[red]{selector}: {error}[/red]")
+                elif found:
+                    counts.append(f"{selector}: {found}/{visible}")
+            table.add_row(group, winner, "\n".join(counts) or "—")
+        
+        console.print(table)
+    
+    console.print(f"\n⏱️  {len(reports)} instantané(s) évalué(s) en {elapsed:.2f}s")
+
+
+def validate_platform_option(ctx, param, value):
+    """Valide --platform sans importer les posters."""
+    if value is not None and not is_platform(value):
+        raise click.BadParameter(f"choisir parmi: {', '.join(available_platforms())}")
+    return value
+
+
 @click.command()
-@click.option('--platform', '-p', type=click.Choice(list(PLATFORMS.keys())), 
-              help='Publier uniquement sur cette plateforme')
+@click.option('--platform', '-p', callback=validate_platform_option, 
+              help=f"Publier uniquement sur cette plateforme ({', '.join(builtin_platforms())})")
+@click.option('--account', '-a', type=str, 
+              help='Publier uniquement pour ce compte (accounts.json)')
 @click.option('--post', '-o', 'post_name', type=str, 
               help='Publier uniquement ce post (nom du dossier)')
 @click.option('--visible', '-v', is_flag=True, 
@@ -217,7 +597,22 @@ def save_results(post_date: str, results: dict):
               help='Simuler sans publier')
 @click.option('--list', '-l', 'list_posts', is_flag=True, 
               help='Lister les posts en attente')
-def main(platform, post_name, visible, dry_run, list_posts):
+@click.option('--profile', is_flag=True, 
+              help='Profiler les publications (trace Playwright + HAR si une étape est lente)')
+@click.option('--check', is_flag=True, 
+              help='Afficher la matrice de pré-vol sans publier')
+@click.option('--tabs', is_flag=True, 
+              help='Publier un post sur toutes ses plateformes dans les onglets d\'un seul navigateur')
+@click.option('--template', '-t', 'template_name', type=str, 
+              help='Créer des posts depuis ce template (avec --rows)')
+@click.option('--rows', type=click.Path(exists=True, dir_okay=False), 
+              help='CSV ou JSONL des variables du template (une ligne = un post)')
+@click.option('--import', 'calendar', type=click.Path(exists=True, dir_okay=False), 
+              help='Importer un calendrier CSV/JSONL dans le catalogue des posts')
+@click.option('--selectors', 'snapshots', type=click.Path(exists=True), 
+              help='Rejouer les sélecteurs sur des instantanés DOM (fichier ou dossier)')
+def main(platform, account, post_name, visible, dry_run, list_posts, profile, check, tabs,
+         template_name, rows, calendar, snapshots):
     """
     Budget Famille - Bot de publication sur les réseaux sociaux.
     
@@ -225,25 +620,44 @@ def main(platform, post_name, visible, dry_run, list_posts):
     """
     print_banner()
     
-    # Setup logger
-    logger = setup_logger()
+    # Setup logger (pas de fichiers de log pour les commandes en lecture seule)
+    logger = setup_logger(file_logging=not (list_posts or dry_run or check or snapshots))
     logger.info("Démarrage du bot")
     
-    # Vérifier les identifiants
-    if not dry_run and not list_posts:
-        if not check_credentials():
-            sys.exit(1)
-    
     # Récupérer les posts
     posts_folder = Path(os.getenv('POSTS_FOLDER', 'posts'))
     
+    # Génération de posts depuis un template
+    if template_name or rows:
+        if not (template_name and rows):
+            console.print("❌ --template et --rows vont ensemble", style="red")
+            sys.exit(1)
+        render_template_rows(template_name, rows, posts_folder)
+        sys.exit(0)
+    
+    # Sélecteurs rejoués hors ligne sur les instantanés DOM
+    if snapshots:
+        check_selectors(snapshots)
+        sys.exit(0)
+    
+    # Import d'un calendrier dans le catalogue
+    if calendar:
+        import_calendar_file(calendar, posts_folder)
+        sys.exit(0)
+    
     if post_name:
         # Un seul post spécifié
         post_path = posts_folder / post_name
-        if not post_path.exists():
-            console.print(f"❌ Post non trouvé: {post_path}", style="red")
-            sys.exit(1)
-        posts = [load_post(post_path)]
+        if post_path.exists():
+            posts = [load_post(post_path)]
+        else:
+            # Sinon dans le catalogue (posts importés)
+            from utils.catalog import find_catalog_post
+            post = find_catalog_post(posts_folder, post_name)
+            if post is None:
+                console.print(f"❌ Post non trouvé: {post_path}", style="red")
+                sys.exit(1)
+            posts = [post]
     else:
         # Tous les posts en attente
         posts = get_pending_posts(posts_folder)
@@ -261,6 +675,52 @@ def main(platform, post_name, visible, dry_run, list_posts):
     # Afficher le récapitulatif
     display_posts_table(posts)
     
+    from utils.preflight import run_preflight, resolve_platforms
+    from utils.dedup import DedupIndex, dedup_enabled
+    
+    # Pré-vol: tous les couples (post, plateforme) avant d'ouvrir un navigateur
+    report = run_preflight(posts, platform)
+    display_preflight_matrix(report, posts)
+    
+    if check:
+        sys.exit(1 if report.failures() else 0)
+    
+    if report.publishable_count == 0:
+        console.print("❌ Aucune publication ne passe le pré-vol.", style="red")
+        sys.exit(1)
+    
+    # Seuls les couples validés par le pré-vol atteignent le navigateur
+    accounts = load_accounts()
+    dedup = DedupIndex(read_only=dry_run) if dedup_enabled() else None
+    jobs = []
+    blocked = {}
+    for post in posts:
+        for platform_name in resolve_platforms(post, platform):
+            for account_name in resolve_accounts(post, account):
+                reasons = report.reasons(post['date'], platform_name)
+                if account_name not in accounts:
+                    reasons = [f"compte inconnu: {account_name}"]
+                elif not accounts[account_name].has_platform(platform_name):
+                    reasons = [f"pas d'identifiants {platform_name} pour {account_name}"]
+                elif not reasons and dedup:
+                    # Doublon d'une publication passée ou d'un autre post du lancement
+                    duplicate = dedup.plan(post, platform_name, account_name)
+                    if duplicate:
+                        reasons = [duplicate]
+                        console.print(f"♻️  {post['date']} → {job_key(platform_name, account_name)}: {duplicate}", style="yellow")
+                
+                if reasons:
+                    blocked.setdefault(post['date'], {})[job_key(platform_name, account_name)] = {
+                        'success': False, 'error': "; ".join(reasons), 'preflight': True
+                    }
+                else:
+                    jobs.append((post, platform_name, account_name))
+    
+    # Vérifier les identifiants du compte par défaut (variables d'environnement)
+    if not dry_run and any(job[2] == DEFAULT_ACCOUNT for job in jobs):
+        if not check_credentials():
+            sys.exit(1)
+    
     # Demander confirmation
     if not dry_run:
         if not click.confirm('\n🚀 Voulez-vous lancer la publication?', default=True):
@@ -271,34 +731,33 @@ def main(platform, post_name, visible, dry_run, list_posts):
     console.print("🚀 DÉMARRAGE DE LA PUBLICATION", style="bold cyan")
     console.print("═" * 60 + "\n")
     
-    # Déterminer les plateformes cibles
-    target_platforms = [platform] if platform else list(PLATFORMS.keys())
-    
-    # Publier chaque post
-    all_results = {}
-    
-    for i, post in enumerate(posts):
-        console.print(Panel(f"📝 Post {i+1}/{len(posts)}: {post['date']}", style="cyan"))
-        
-        # Utiliser les plateformes du config.json si disponible
-        post_platforms = post.get('platforms', target_platforms)
-        if platform:
-            post_platforms = [platform]
-        
-        results = publish_post(
-            post=post,
-            platforms=post_platforms,
-            headless=not visible,
-            dry_run=dry_run
-        )
-        
-        all_results[post['date']] = results
+    def on_post_done(post, results):
+        results.update(blocked.pop(post['date'], {}))
         save_results(post['date'], results)
-        
-        # Pause entre les posts
-        if i < len(posts) - 1 and not dry_run:
-            console.print(f"\n⏳ Pause de 60 secondes avant le prochain post...\n")
-            time.sleep(60)
+    
+    if tabs and profile:
+        console.print("⚠️  --profile est ignoré en mode onglets (un seul contexte partagé)", style="yellow")
+    
+    def on_job_done(post, platform_name, account_name, result):
+        if dedup and result.get('success') and not result.get('dry_run'):
+            dedup.record(post, platform_name, account_name)
+    
+    all_results = run_schedule(
+        jobs,
+        headless=not visible,
+        dry_run=dry_run,
+        profile=profile and not tabs,
+        on_post_done=on_post_done,
+        on_job_done=on_job_done,
+        tabs=tabs
+    )
+    if dedup:
+        dedup.close()
+    
+    # Posts entièrement bloqués par le pré-vol
+    for post_date, results in blocked.items():
+        all_results[post_date] = results
+        save_results(post_date, results)
     
     # Résumé final
     console.print("\n" + "═" * 60)
@@ -315,6 +774,8 @@ def main(platform, post_name, visible, dry_run, list_posts):
             else:
                 fail_count += 1
     
+    from rich.table import Table
+    
     summary_table = Table()
     summary_table.add_column("Métrique", style="cyan")
     summary_table.add_column("Valeur", style="white")
@@ -2,16 +2,31 @@
 Budget Famille - Social Media Platforms
 ========================================
 Modules pour publier sur différentes plateformes.
+
+Les posters sont importés à la demande (voir platforms.registry).
 """
 
-from .linkedin import LinkedInPoster
-from .instagram import InstagramPoster
-from .facebook import FacebookPoster
-from .twitter import TwitterPoster
+from .registry import available_platforms, get_poster_class, get_capabilities
+
+_LAZY_EXPORTS = {
+    'LinkedInPoster': 'linkedin',
+    'InstagramPoster': 'instagram',
+    'FacebookPoster': 'facebook',
+    'TwitterPoster': 'twitter',
+}
 
 __all__ = [
     'LinkedInPoster',
     'InstagramPoster',
     'FacebookPoster',
     'TwitterPoster',
+    'available_platforms',
+    'get_poster_class',
+    'get_capabilities',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return get_poster_class(_LAZY_EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
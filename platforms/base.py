@@ -5,15 +5,32 @@ Utilise le profil Chrome existant de l'utilisateur pour éviter les blocages de
 """
 
 import os
+import json
 import time
 import random
 from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from playwright.sync_api import sync_playwright, Page, Browser
-from utils.logger import get_logger
+from typing import Dict, Tuple
+from platforms.capabilities import PlatformCapabilities
+from platforms.flows import load_flows
+from platforms.watchdog import install_watchdog, watchdog_enabled
+from utils.accounts import Account, get_account
+from utils.context import log_context
+from utils.logger import get_logger, LogCapture
+from utils.profiler import RunProfiler
+from utils.proxies import get_proxy_pool
+from utils.text import fit_text
+from utils.retry import RetryPolicy, AuthError, TransientError, classify_error, retry_call
+from utils.screenshots import ScreenshotPipeline
+from utils.snapshots import save_snapshot, snapshots_enabled
 
 logger = get_logger(__name__)
 
+# Sélecteur gagnant de chaque liste de candidats, par plateforme (voir BasePoster._race)
+_flow_winners: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
 
 def get_chrome_path():
     """Trouve le chemin de Chrome selon l'OS."""
@@ -66,38 +83,353 @@ class BasePoster(ABC):
     PLATFORM_NAME = "base"
     LOGIN_URL = ""
     
-    def __init__(self, headless: bool = True):
+    # Limites et capacités de la plateforme (texte, médias, rythme...)
+    CAPABILITIES = PlatformCapabilities()
+    
+    # Sélecteurs par élément ({'publish': (...)}), rejoués hors ligne sur les
+    # instantanés DOM (utils.snapshots)
+    SELECTORS: Dict[str, Tuple[str, ...]] = {}
+    
+    # Groupes de SELECTORS fermés en arrière-plan dès leur apparition
+    # (platforms.watchdog): boutons sans risque uniquement
+    WATCHDOG: Tuple[str, ...] = ()
+    
+    # Attributs d'URL réécrits quand une URL de base est surchargée
+    URL_ATTRIBUTES = ('LOGIN_URL', 'HOME_URL', 'FEED_URL')
+    
+    def __init__(self, headless: bool = True, profile: bool = False, base_url: str = None,
+                 account=None, session=None):
         self.headless = headless
         self.browser = None
         self.page = None
         self.playwright = None
         self.context = None
+        self.proxy = None
+        self._user_data_dir = None  # Dossier de profil du contexte lancé
+        
+        # Contexte réutilisé entre publications (sauf en profilage: le HAR
+        # est attaché à la création du contexte)
+        self.session = session if not profile else None
+        
+        # Mode onglets: profil commun à toutes les plateformes du compte,
+        # ou onglet ouvert dans le contexte d'un autre poster
+        self.shared_profile = False
+        self.tab_owner = None
+        # Mode onglets: l'attente d'upload des médias est reportée (_settle_media)
+        self.defer_media_wait = False
+        self._media_ready_at = 0.0
+        
+        # Compte publié (identifiants, profil navigateur, proxy)
+        self.account = account if isinstance(account, Account) else get_account(account)
+        label = self.PLATFORM_NAME if self.account.is_default else f"{self.PLATFORM_NAME}_{self.account.name}"
         
-        # Dossier pour les screenshots
+        # Profilage (trace Playwright + HAR) si demandé
+        self.profiler = RunProfiler(label) if profile else None
+        
+        # Dossier pour les screenshots (écrits en arrière-plan)
         self.screenshots_dir = Path('screenshots')
-        self.screenshots_dir.mkdir(exist_ok=True)
+        self.screenshots = ScreenshotPipeline(self.screenshots_dir, label)
+        
+        # Utiliser le profil Chrome existant ? (compte par défaut uniquement:
+        # les autres comptes ont toujours un profil isolé)
+        self.use_existing_chrome = (
+            self.account.is_default
+            and os.getenv('USE_EXISTING_CHROME', 'true').lower() == 'true'
+        )
+        
+        # Relances des étapes en échec (erreurs transitoires uniquement)
+        self.retry_policy = RetryPolicy.from_env(self.PLATFORM_NAME)
+        self.attempts = {}
+        self._submitted = False
+        self._prewarmed = None  # (texte, image, vidéo) déjà préparés par prewarm()
+        self._capture = None  # Logs du job, écrits sur disque seulement en cas d'échec
+        self._watchdog = None  # Mode de surveillance des popups de la page ('handlers', 'observer')
+        self.store = {}  # État du contexte navigateur (partagé avec la session réutilisée)
+        
+        # Facteur appliqué aux délais "humains" (0 = aucun délai, benchmarks uniquement)
+        self.delay_scale = float(os.getenv('HUMAN_DELAY_SCALE', 1.0))
+        
+        # URL de base surchargée (ex: serveur de test local)
+        base_url = base_url or os.getenv(f'{self.PLATFORM_NAME.upper()}_BASE_URL')
+        if base_url:
+            self._override_base_url(base_url)
+    
+    def _override_base_url(self, base_url: str):
+        """Remplace l'origine des URLs de la plateforme par base_url."""
+        base_url = base_url.rstrip('/')
+        
+        for attr in self.URL_ATTRIBUTES:
+            url = getattr(self, attr, None)
+            if not url:
+                continue
+            parts = urlsplit(url)
+            new_url = base_url + parts.path
+            if parts.query:
+                new_url += f"?{parts.query}"
+            setattr(self, attr, new_url)
         
-        # Utiliser le profil Chrome existant ?
-        self.use_existing_chrome = os.getenv('USE_EXISTING_CHROME', 'true').lower() == 'true'
+        logger.info(f"URL de base {self.PLATFORM_NAME}: {base_url}")
+    
+    def _credential(self, key: str, env_var: str = None, default: str = None):
+        """Identifiant du compte pour cette plateforme (variables d'env pour le compte par défaut)."""
+        return self.account.credential(self.PLATFORM_NAME, key, env_var, default)
     
     def _random_delay(self, min_sec: float = 1.0, max_sec: float = 3.0):
         """Délai aléatoire pour simuler un comportement humain."""
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
+        delay = random.uniform(min_sec, max_sec) * self.delay_scale
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _wait_for_media(self, min_sec: float = 3.0, max_sec: float = 5.0):
+        """
+        Laisse l'upload d'un média se terminer. Avec defer_media_wait, rend
+        la main aussitôt: l'upload continue dans l'onglet et _settle_media
+        attendra ce qui reste.
+        """
+        if not self.defer_media_wait:
+            self._random_delay(min_sec, max_sec)
+            return
+        ready_at = time.time() + random.uniform(min_sec, max_sec) * self.delay_scale
+        self._media_ready_at = max(self._media_ready_at, ready_at)
+    
+    def _settle_media(self):
+        """Attend la fin des uploads reportés par _wait_for_media."""
+        remaining = self._media_ready_at - time.time()
+        self._media_ready_at = 0.0
+        if remaining > 0:
+            time.sleep(remaining)
+    
+    def _goto(self, url: str, wait_until: str = 'domcontentloaded', timeout: int = 60000):
+        """Navigue vers url (page courante, relue à chaque tentative)."""
+        try:
+            return self.page.goto(url, wait_until=wait_until, timeout=timeout)
+        except Exception as e:
+            # Proxy en panne: écarté pour la prochaine session
+            if self.proxy and ('ERR_PROXY' in str(e) or 'ERR_TUNNEL' in str(e)):
+                get_proxy_pool().mark_unhealthy(self.proxy['server'])
+                raise TransientError(f"Proxy {self.proxy['server']} en échec: {e}")
+            raise
     
     def _take_screenshot(self, name: str):
-        """Capture d'écran pour debug."""
+        """Capture d'écran pour debug (encodage et écriture en arrière-plan)."""
         if self.page:
-            timestamp = time.strftime("%Y%m%d-%H%M%S")
-            filename = self.screenshots_dir / f"{self.PLATFORM_NAME}_{name}_{timestamp}.png"
+            self.screenshots.capture(self.page, name)
+    
+    def _job_context(self):
+        """Contexte de log de la publication (plateforme, compte)."""
+        return log_context(platform=self.PLATFORM_NAME, account=self.account.name)
+    
+    @contextmanager
+    def _step(self, name: str):
+        """Étape nommée dans le contexte de log, chronométrée en mode profilage."""
+        with log_context(step=name), (self.profiler.step(name) if self.profiler else nullcontext()):
+            yield
+    
+    def _run_step(self, name: str, func, *args):
+        """
+        Exécute une étape chronométrée, relancée seule en cas d'erreur transitoire.
+        
+        Une fois la publication envoyée, plus aucune étape n'est rejouée.
+        """
+        def attempt():
+            self.attempts[name] = self.attempts.get(name, 0) + 1
+            return func(*args)
+        
+        with self._step(name):
+            return retry_call(
+                attempt,
+                policy=self.retry_policy,
+                step=f"{self.PLATFORM_NAME}/{name}",
+                can_retry=lambda: not self._submitted,
+            )
+    
+    # ─── Flows déclaratifs (platforms/flows/<plateforme>.yaml) ──────────────
+    
+    def _candidates(self, spec) -> Tuple[str, ...]:
+        """Sélecteurs d'une étape: groupe de SELECTORS ou liste explicite."""
+        if isinstance(spec, str):
+            if spec not in self.SELECTORS:
+                raise ValueError(f"Groupe de sélecteurs inconnu pour {self.PLATFORM_NAME}: {spec}")
+            return self.SELECTORS[spec]
+        return tuple(spec)
+    
+    def _race(self, selectors: Tuple[str, ...], timeout: int, enabled: bool = False):
+        """
+        Attend le premier candidat visible, tous en même temps (locator.or_):
+        une seule attente au lieu d'un timeout par sélecteur. Avec un timeout
+        nul, simple vérification immédiate.
+        
+        Le sélecteur gagnant est mis en cache (par plateforme) et essayé en
+        premier aux appels suivants.
+        
+        Returns:
+            (sélecteur, locator) du candidat visible le plus prioritaire, (None, None) sinon
+        """
+        key = (self.PLATFORM_NAME, selectors)
+        cached = _flow_winners.get(key)
+        ordered = (cached,) + tuple(s for s in selectors if s != cached) if cached else selectors
+        
+        try:
+            combined = None
+            for selector in ordered:
+                locator = self.page.locator(f"{selector} >> visible=true")
+                combined = locator if combined is None else combined.or_(locator)
+            if timeout > 0:
+                combined.first.wait_for(state='attached', timeout=timeout)
+            elif combined.count() == 0:
+                return None, None
+        except Exception:
+            return None, None
+        
+        # Plusieurs candidats peuvent être visibles: l'ordre de priorité décide
+        for selector in ordered:
             try:
-                self.page.screenshot(path=str(filename))
-                logger.debug(f"Screenshot: {filename}")
-            except:
-                pass
+                locator = self.page.locator(selector).first
+                if locator.is_visible() and (not enabled or locator.is_enabled()):
+                    _flow_winners[key] = selector
+                    return selector, locator
+            except Exception:
+                continue
+        return None, None
+    
+    def _act(self, locator, method: str):
+        if method == 'dispatch':
+            locator.dispatch_event('click')
+        else:
+            locator.click(force=method == 'force')
+    
+    def _run_flow_step(self, flow: str, step: dict, instant: bool = False):
+        """Exécute une étape; retourne l'élément trouvé (ou True), None si absent."""
+        timeout = 0 if instant else step.get('timeout', 3000)
+        found = None
+        
+        for _ in range(1 + step.get('retries', 0)):
+            if 'flow' in step:
+                found = self._run_flow(step['flow'], instant=instant)
+            elif 'wait_for_load' in step:
+                if instant:
+                    break
+                try:
+                    self.page.wait_for_load_state(step['wait_for_load'], timeout=timeout)
+                    found = True
+                except Exception:
+                    found = None
+            elif 'js' in step:
+                try:
+                    found = self.page.evaluate(step['js']) or None
+                except Exception as e:
+                    logger.debug(f"Flow {flow}: script en échec: {e}")
+            elif 'click_all' in step:
+                selectors = self._candidates(step['click_all'])
+                if self._race(selectors, timeout)[0]:
+                    for selector in selectors:
+                        try:
+                            locator = self.page.locator(selector).first
+                            if locator.is_visible():
+                                self._act(locator, step.get('method', 'click'))
+                                found = True
+                        except Exception:
+                            continue
+            else:
+                action = 'click' if 'click' in step else 'find'
+                selector, found = self._race(self._candidates(step[action]), timeout,
+                                             enabled=step.get('enabled', False))
+                if found is not None:
+                    if step.get('target') == 'parent':
+                        found = found.locator('xpath=..')
+                    if action == 'click':
+                        self._act(found, step.get('method', 'click'))
+                    logger.debug(f"Flow {flow}: {action} {selector}")
+            if found is not None:
+                break
+        
+        if found is None and 'fallback' in step:
+            found = self._run_steps(flow, step['fallback'], instant)
+        
+        if found is None:
+            if not step.get('optional', False):
+                raise TransientError(step.get('error', f"{self.PLATFORM_NAME}/{flow}: élément non trouvé"))
+            return None
+        
+        if step.get('log'):
+            logger.info(step['log'])
+        if step.get('delay'):
+            self._random_delay(*step['delay'])
+        if step.get('screenshot'):
+            self._take_screenshot(step['screenshot'])
+        return found
+    
+    def _run_steps(self, flow: str, steps: list, instant: bool = False):
+        found = None
+        for step in steps:
+            result = self._run_flow_step(flow, step, instant)
+            if result is not None:
+                found = result
+                if step.get('stop'):
+                    break
+        return found
+    
+    def _run_flow(self, name: str, instant: bool = False):
+        """
+        Exécute un flow de platforms/flows/<plateforme>.yaml, chronométré
+        comme une étape.
+        
+        Args:
+            name: Nom du flow
+            instant: Vérifier sans attendre (aucun timeout, pas d'attente de chargement)
+        
+        Returns:
+            Dernier élément trouvé (locator), True pour une action sans élément,
+            None si rien n'a été trouvé
+        
+        Raises:
+            TransientError: Si une étape obligatoire ne trouve pas son élément
+        """
+        with self._step(f"flow_{name}"):
+            return self._run_steps(name, load_flows(self.PLATFORM_NAME)[name], instant)
+    
+    def _context_options(self) -> dict:
+        """Options supplémentaires pour la création du contexte navigateur."""
+        options = {}
+        if self.profiler:
+            options.update(self.profiler.context_options())
+        if self.proxy:
+            options['proxy'] = self.proxy
+        return options
+    
+    def _restore_storage_state(self):
+        """Injecte les cookies d'un storage state Playwright exporté pour le compte."""
+        path = self.account.storage_state
+        if not path or not Path(path).exists():
+            return
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cookies = json.load(f).get('cookies', [])
+            if cookies:
+                self.context.add_cookies(cookies)
+                logger.info(f"🍪 Session restaurée pour {self.account.name} ({len(cookies)} cookies)")
+        except Exception as e:
+            logger.warning(f"⚠️ Storage state illisible ({path}): {e}")
     
     def _start_browser(self):
         """Démarre le navigateur en utilisant le profil Chrome existant."""
+        # Contexte déjà ouvert par une publication précédente de ce thread
+        if self.session and self.session.alive:
+            self.playwright = self.session.playwright
+            self.context = self.session.context
+            self.page = self.session.page
+            self.proxy = self.session.proxy
+            self._watchdog = self.session.watchdog
+            self.store = self.session.store
+            self.session.uses += 1
+            logger.info(f"♻️ Contexte navigateur réutilisé ({self.session.label})")
+            return
+        
+        # Import différé: playwright est lourd et inutile pour --list / --dry-run
+        from playwright.sync_api import sync_playwright
+        
+        self.proxy = get_proxy_pool().proxy_for(self.account, self.PLATFORM_NAME)
         self.playwright = sync_playwright().start()
         
         chrome_path = get_chrome_path()
@@ -111,6 +443,7 @@ class BasePoster(ABC):
             
             try:
                 # Lancer Chrome avec le profil utilisateur existant
+                self._claim_profile(user_data_dir)
                 self.context = self.playwright.chromium.launch_persistent_context(
                     user_data_dir=user_data_dir,
                     channel="chrome",  # Utilise Chrome installé, pas Chromium
@@ -123,6 +456,7 @@ class BasePoster(ABC):
                     viewport={'width': 1920, 'height': 1080},
                     locale='fr-FR',
                     timezone_id='Europe/Paris',
+                    **self._context_options(),
                 )
                 
                 # Utiliser la première page ou en créer une
@@ -141,20 +475,41 @@ class BasePoster(ABC):
             logger.info("Utilisation d'un navigateur isolé")
             self._start_isolated_browser()
         
+        self._restore_storage_state()
+        
+        if self.profiler:
+            self.profiler.start_tracing(self.context)
+        
         self.page.set_default_timeout(60000)  # 60 secondes timeout
+        self._install_watchdog()
+        
+        if self.session:
+            self.session.attach(self.playwright, self.context, self.page, self.proxy, self._user_data_dir)
+            self.session.watchdog = self._watchdog
+            self.store = self.session.store
+    
+    def _claim_profile(self, user_data_dir):
+        """Libère le dossier de profil avant de lancer un contexte dessus."""
+        self._user_data_dir = user_data_dir
+        if self.session and self.session.pool:
+            self.session.pool.release(user_data_dir, keep=self.session)
     
     def _start_isolated_browser(self):
         """Démarre un navigateur avec un profil dédié au bot (cookies sauvegardés)."""
         # Créer le dossier pour le profil du bot s'il n'existe pas
-        user_data_dir = Path('browser_data')
-        user_data_dir.mkdir(exist_ok=True)
+        user_data_dir = self.account.data_dir(None if self.shared_profile else self.PLATFORM_NAME)
+        user_data_dir.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"📂 Utilisation du profil dédié : {user_data_dir.absolute()}")
+        
+        # "chrome" = votre vrai Chrome, vide = Chromium fourni par Playwright
+        channel = os.getenv('BROWSER_CHANNEL', 'chrome') or None
+        self._claim_profile(user_data_dir)
 
         # Lancement en mode persistant (sauvegarde les cookies ici)
         self.context = self.playwright.chromium.launch_persistent_context(
             user_data_dir=user_data_dir,
-            channel="chrome",  # Utilise votre vrai Chrome
+            channel=channel,
             headless=self.headless,
             args=[
                 '--disable-blink-features=AutomationControlled',
@@ -164,6 +519,7 @@ class BasePoster(ABC):
             viewport={'width': 1280, 'height': 720},
             locale='fr-FR',
             timezone_id='Europe/Paris',
+            **self._context_options(),
         )
         
         # Récupérer la première page
@@ -173,9 +529,41 @@ class BasePoster(ABC):
             self.page = self.context.new_page()
 
 
-    def _close_browser(self):
-        """Ferme proprement le navigateur."""
+    def _open_tab(self, owner: 'BasePoster'):
+        """Ouvre un onglet dans le contexte déjà lancé par un autre poster."""
+        self.tab_owner = owner
+        self.playwright = owner.playwright
+        self.context = owner.context
+        self.proxy = owner.proxy
+        self.page = owner.context.new_page()
+        self.page.set_default_timeout(60000)
+        self._install_watchdog()
+    
+    def _close_browser(self, failed: bool = False):
+        """Ferme proprement le navigateur (ou le rend à la session si tout va bien)."""
+        # Onglet d'un contexte partagé: seul l'onglet est fermé
+        if self.tab_owner is not None:
+            try:
+                if self.page and not self.page.is_closed():
+                    self.page.close()
+            except Exception as e:
+                logger.debug(f"Fermeture onglet: {e}")
+            self.page = self.context = self.browser = self.playwright = None
+            self.tab_owner = None
+            return
+        
+        if self.session and self.context is not None and self.session.context is self.context:
+            if not failed:
+                self.page = self.context = self.browser = self.playwright = None
+                return
+            # Contexte dans un état inconnu: pas de réutilisation
+            self.session.close()
+            self.page = self.context = self.browser = self.playwright = None
+            return
+        
         try:
+            if self.context and self.profiler:
+                self.profiler.stop_tracing(self.context, failed=failed)
             if self.context:
                 self.context.close()
             if self.browser:
@@ -184,6 +572,52 @@ class BasePoster(ABC):
                 self.playwright.stop()
         except Exception as e:
             logger.error(f"Erreur fermeture: {e}")
+        finally:
+            self.page = self.context = self.browser = self.playwright = None
+    
+    def _restart_browser(self):
+        """(Re)démarre le navigateur en nettoyant une tentative précédente."""
+        if self.playwright:
+            self._close_browser(failed=True)
+        self._start_browser()
+    
+    def _install_watchdog(self):
+        """Installe la surveillance des popups sur la nouvelle page."""
+        self._watchdog = None
+        if self.WATCHDOG and watchdog_enabled():
+            groups = {name: self.SELECTORS[name] for name in self.WATCHDOG}
+            self._watchdog = install_watchdog(self.page, groups, self.PLATFORM_NAME)
+            if self._watchdog:
+                logger.debug(f"Surveillance des popups {self.PLATFORM_NAME}: {self._watchdog}")
+    
+    def _handle_cookie_popup(self) -> bool:
+        """
+        Ferme la bannière de cookies (flow 'cookie'). Le consentement est
+        retenu pour le contexte, qu'il vienne d'être donné ou que la
+        bannière soit absente à l'issue de l'attente: les navigations
+        suivantes sautent la vérification. Avec le watchdog, simple passage
+        sans attente (une absence n'y prouve rien).
+        
+        Returns:
+            True si la bannière a été fermée
+        """
+        if self.store.get('cookie_consent'):
+            return False
+        
+        instant = bool(self._watchdog)
+        closed = self._run_flow('cookie', instant=instant) is not None
+        if closed or not instant:
+            self.store['cookie_consent'] = True
+        return closed
+    
+    def _dismiss_popups(self):
+        """
+        Ferme les popups courants (cookies puis flow 'dismiss'). Avec le
+        watchdog, un simple passage sans attente suffit pour ceux qu'il ne
+        gère pas.
+        """
+        self._handle_cookie_popup()
+        self._run_flow('dismiss', instant=bool(self._watchdog))
     
     def _check_logged_in(self) -> bool:
         """Vérifie si connecté. À implémenter."""
@@ -195,52 +629,174 @@ class BasePoster(ABC):
         pass
     
     @abstractmethod
-    def _publish(self, text: str, image_path: str = None, video_path: str = None) -> bool:
-        """Publie. À implémenter."""
+    def _prepare_post(self, text: str, image_path: str = None, video_path: str = None):
+        """Ouvre le composeur, saisit le texte et ajoute les médias. À implémenter."""
         pass
     
-    def post(self, text: str, image_path: str = None, video_path: str = None) -> dict:
-        """Méthode principale pour publier."""
-        result = {
+    @abstractmethod
+    def _submit_post(self):
+        """Envoie la publication préparée. À implémenter (appeler _mark_submitted au clic)."""
+        pass
+    
+    def _mark_submitted(self):
+        """Signale que la publication est partie: l'envoi ne sera plus rejoué."""
+        self._submitted = True
+    
+    def _publish(self, text: str, image_path: str = None, video_path: str = None,
+                 prepared: bool = False) -> bool:
+        """
+        Publie: préparation puis envoi, chacun relancé indépendamment.
+        
+        Args:
+            prepared: Composeur déjà rempli (prewarm, mode onglets): envoi seul
+        """
+        if not prepared:
+            self._run_step('prepare', self._prepare_post, text, image_path, video_path)
+        self._run_step('submit', self._submit_post)
+        return True
+    
+    def _new_result(self) -> dict:
+        """Prépare le dictionnaire de résultat d'une publication."""
+        self.attempts = {}
+        self._submitted = False
+        return {
             'success': False,
             'platform': self.PLATFORM_NAME,
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'error': None
         }
+    
+    def _ensure_logged_in(self):
+        """Vérifie la session et se connecte si nécessaire."""
+        # Vérifier si déjà connecté (grâce au profil Chrome)
+        with self._step('check_logged_in'):
+            logged_in = self._check_logged_in()
         
-        try:
-            logger.info(f"Démarrage publication sur {self.PLATFORM_NAME}")
-            
-            self._start_browser()
-            
-            # Aller sur la page
-            self.page.goto(self.LOGIN_URL, wait_until='domcontentloaded', timeout=60000)
-            self._random_delay(2, 4)
-            
-            # Vérifier si déjà connecté (grâce au profil Chrome)
-            if not self._check_logged_in():
-                logger.info("Connexion requise...")
+        if not logged_in:
+            logger.info("Connexion requise...")
+            with self._step('login'):
                 if not self._login():
-                    raise Exception("Échec de la connexion")
-            else:
-                logger.info("✅ Déjà connecté (session Chrome existante)")
-            
-            # Publier
-            self._random_delay(2, 4)
-            
-            if not self._publish(text, image_path, video_path):
-                raise Exception("Échec de la publication")
-            
-            result['success'] = True
-            logger.info(f"✅ Publication réussie sur {self.PLATFORM_NAME}")
-            
-        except Exception as e:
-            result['error'] = str(e)
-            logger.error(f"❌ Erreur sur {self.PLATFORM_NAME}: {e}")
-            self._take_screenshot("error")
-            
-        finally:
-            self._close_browser()
+                    raise AuthError("Échec de la connexion")
+        else:
+            logger.info("✅ Déjà connecté (session Chrome existante)")
+    
+    def _record_error(self, result: dict, error: Exception):
+        """Renseigne l'erreur (et sa classe) dans le résultat."""
+        result['error'] = str(error)
+        result['error_type'] = classify_error(error)
+        logger.error(f"❌ Erreur sur {self.PLATFORM_NAME} ({result['error_type']}): {error}")
+        self._take_screenshot("error")
+        if self.page and snapshots_enabled():
+            result['snapshot'] = save_snapshot(self.page, self.PLATFORM_NAME, "error")
+    
+    def _finalize(self, result: dict) -> dict:
+        """Ferme le navigateur et complète le résultat."""
+        result['submitted'] = self._submitted
+        retries = {step: n - 1 for step, n in self.attempts.items() if n > 1}
+        if retries:
+            result['retries'] = retries
+        self._close_browser(failed=not result['success'])
+        self.screenshots.close(failed=not result['success'])
+        if self.profiler:
+            result['profile'] = self.profiler.finalize(failed=not result['success'])
+        return result
+    
+    def _open_and_login(self):
+        """Démarre le navigateur, ouvre la plateforme et vérifie la session."""
+        self._run_step('start_browser', self._restart_browser)
+        if self._session_ready():
+            logger.info(f"♻️ Session {self.PLATFORM_NAME} déjà prête, ni navigation ni vérification")
+            return
+        
+        # Aller sur la page
+        self._run_step('open_login_url', self._goto, self.LOGIN_URL)
+        self._random_delay(2, 4)
+        
+        self._ensure_logged_in()
+        
+        # Publier
+        self._random_delay(2, 4)
+    
+    def _session_ready(self) -> bool:
+        """Contexte réutilisé resté connecté là où la publication commence. À surcharger."""
+        return False
+    
+    def prewarm(self, text: str, image_path: str = None, video_path: str = None) -> bool:
+        """
+        Prépare la publication à l'avance, sans l'envoyer: navigateur, session,
+        composeur rempli et médias uploadés. Appelé pendant l'attente d'un
+        créneau, post() n'a ensuite plus qu'à cliquer sur Publier.
+        
+        Doit être appelé depuis le thread qui appellera post().
+        
+        Returns:
+            True si la publication est prête à être envoyée
+        """
+        self._new_result()
+        self._prewarmed = None
+        self._capture = LogCapture()
+        
+        with self._job_context(), self._capture:
+            try:
+                logger.info(f"🔥 Préchauffage {self.PLATFORM_NAME}")
+                self._open_and_login()
+                self._run_step('prepare', self._prepare_post, text, image_path, video_path)
+                self._prewarmed = (text, image_path, video_path)
+                return True
+            except Exception as e:
+                # post() repartira de zéro
+                logger.warning(f"⚠️ Préchauffage {self.PLATFORM_NAME} abandonné: {e}")
+                return False
+    
+    def discard(self):
+        """Abandonne une publication préchauffée qui ne sera pas envoyée."""
+        self._prewarmed = None
+        self._capture = None
+        self._close_browser(failed=True)
+        self.screenshots.close(failed=False)
+        if self.profiler:
+            self.profiler.finalize(failed=False)
+    
+    def post(self, text: str, image_path: str = None, video_path: str = None) -> dict:
+        """Méthode principale pour publier."""
+        # Le contexte préchauffé a pu être fermé depuis (profil repris par une autre session)
+        prewarmed = (self._prewarmed == (text, image_path, video_path)
+                     and self.page is not None and not self.page.is_closed())
+        self._prewarmed = None
+        
+        attempts = self.attempts if prewarmed else {}
+        result = self._new_result()
+        self.attempts = attempts
+        
+        # Une publication préchauffée garde les logs de sa préparation
+        capture = self._capture if prewarmed and self._capture else LogCapture()
+        self._capture = None
+        
+        with self._job_context(), capture:
+            try:
+                logger.info(f"Démarrage publication sur {self.PLATFORM_NAME}")
+                
+                if prewarmed:
+                    # Composeur déjà prêt: seul l'envoi reste à faire
+                    logger.info(f"🔥 Publication préchauffée sur {self.PLATFORM_NAME}")
+                    self._publish(text, image_path, video_path, prepared=True)
+                else:
+                    self._open_and_login()
+                    if not self._publish(text, image_path, video_path):
+                        raise TransientError("Échec de la publication")
+                
+                result['success'] = True
+                logger.info(f"✅ Publication réussie sur {self.PLATFORM_NAME}")
+                
+            except Exception as e:
+                self._record_error(result, e)
+                
+            finally:
+                self._finalize(result)
+                if not result['success']:
+                    result['log_file'] = capture.dump()
+                    if result['log_file']:
+                        logger.info(f"📝 Logs du job: {result['log_file']}")
         
         return result
 
@@ -249,7 +805,8 @@ class PostContent:
     """Utilitaire pour formater le contenu."""
     
     @staticmethod
-    def truncate_for_twitter(text: str, max_length: int = 280) -> str:
-        if len(text) <= max_length:
-            return text
-        return text[:max_length-3] + "..."
+    def truncate_for_twitter(text: str, max_length: int = None) -> str:
+        if max_length is None:
+            from platforms.registry import get_capabilities
+            max_length = get_capabilities('twitter').max_text_length
+        return fit_text(text, max_length, weighted=True)
@@ -0,0 +1,121 @@
+"""
+Budget Famille - Platform Capabilities
+=======================================
+Déclaration des capacités et limites de chaque plateforme.
+
+Les capacités des plateformes intégrées sont de simples données
+(BUILTIN_CAPABILITIES), lues par la validation, le formatage du texte et la
+planification sans importer les posters. Chaque poster les expose aussi en
+attribut CAPABILITIES (les plugins ne déclarent que celui-ci).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+MB = 1024 * 1024
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.webm')
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Rythme de publication sûr: rafale autorisée et recharge par heure."""
+
+    burst: int = 1
+    per_hour: float = 4
+
+
+@dataclass(frozen=True)
+class PlatformCapabilities:
+    """Capacités et limites d'une plateforme."""
+
+    max_text_length: int = 2000
+    weighted_length: bool = False        # Longueur comptée à la manière de X (URL = 23, emoji = 2)
+    max_thread_parts: int = 1            # > 1: texte trop long publié en thread
+    requires_media: bool = False
+    image_extensions: Tuple[str, ...] = IMAGE_EXTENSIONS
+    video_extensions: Tuple[str, ...] = VIDEO_EXTENSIONS
+    max_image_size: int = 5 * MB
+    max_video_size: int = 200 * MB
+    min_image_dimension: int = 0         # Plus petit côté minimum (px), 0 = pas de limite
+    max_image_dimension: int = 0         # Plus grand côté maximum (px), 0 = pas de limite
+    aspect_ratio_range: Tuple[float, ...] = ()  # (min, max) largeur/hauteur, vide = tout
+    max_video_duration: float = 0        # En secondes, 0 = pas de limite
+    video_codecs: Tuple[str, ...] = ()   # Codecs acceptés, vide = tous
+    carousel: bool = False
+    max_media_count: int = 1
+    rate_limit: RateLimit = field(default_factory=RateLimit)
+    compose_url: str = ""
+    best_time: str = "10:00"
+
+    def accepts_image(self, path: str) -> bool:
+        return str(path).lower().endswith(self.image_extensions)
+
+    def accepts_video(self, path: str) -> bool:
+        return str(path).lower().endswith(self.video_extensions)
+
+
+# Plateformes intégrées (reprises par l'attribut CAPABILITIES de chaque poster)
+BUILTIN_CAPABILITIES: Dict[str, PlatformCapabilities] = {
+    'linkedin': PlatformCapabilities(
+        max_text_length=3000,
+        image_extensions=('.jpg', '.jpeg', '.png', '.gif'),
+        max_image_size=8 * MB,
+        max_video_size=200 * MB,
+        max_image_dimension=7680,
+        max_video_duration=15 * 60,
+        video_codecs=('h264', 'hevc', 'vp8', 'vp9', 'mpeg4'),
+        carousel=True,
+        max_media_count=9,
+        rate_limit=RateLimit(burst=2, per_hour=4),
+        compose_url="https://www.linkedin.com/feed/",
+        best_time="10:00",  # Mardi-Jeudi, 10h-12h
+    ),
+    'instagram': PlatformCapabilities(
+        max_text_length=2200,
+        requires_media=True,
+        image_extensions=('.jpg', '.jpeg', '.png'),
+        video_extensions=('.mp4', '.mov'),
+        max_image_size=8 * MB,
+        max_video_size=650 * MB,
+        min_image_dimension=320,
+        aspect_ratio_range=(0.8, 1.91),
+        max_video_duration=60 * 60,
+        video_codecs=('h264', 'hevc'),
+        carousel=True,
+        max_media_count=10,
+        rate_limit=RateLimit(burst=1, per_hour=3),
+        compose_url="https://www.instagram.com/",
+        best_time="11:00",  # Lundi, Mercredi, 11h
+    ),
+    'facebook': PlatformCapabilities(
+        max_text_length=63206,
+        max_image_size=10 * MB,
+        max_video_size=4096 * MB,
+        max_video_duration=240 * 60,
+        carousel=True,
+        max_media_count=10,
+        rate_limit=RateLimit(burst=2, per_hour=6),
+        compose_url="https://www.facebook.com/",
+        best_time="13:00",  # Mercredi, 13h-16h
+    ),
+    'twitter': PlatformCapabilities(
+        max_text_length=280,
+        weighted_length=True,
+        max_thread_parts=25,
+        image_extensions=('.jpg', '.jpeg', '.png', '.gif', '.webp'),
+        video_extensions=('.mp4', '.mov'),
+        max_image_size=5 * MB,
+        max_video_size=512 * MB,
+        min_image_dimension=4,
+        max_image_dimension=8192,
+        max_video_duration=140,
+        video_codecs=('h264',),
+        carousel=True,
+        max_media_count=4,
+        rate_limit=RateLimit(burst=3, per_hour=10),
+        compose_url="https://x.com/home",
+        best_time="09:00",  # Mercredi, 9h-12h
+    ),
+}
@@ -2,14 +2,24 @@
 Budget Famille - Facebook Poster (Fixed v2)
 ============================================
 Module pour publier automatiquement sur Facebook.
-Gestion robuste des popups de cookies avec attente de l'overlay.
+Dialogue de cookies détecté par une attente ciblée, une fois par contexte.
+
+Publication en tant que page (FACEBOOK_PAGE_NAME, ou plusieurs pages gérées
+avec FACEBOOK_PAGE_NAMES): l'identifiant de chaque page et le profil actif
+sont résolus une fois puis gardés dans le store de la session. Tant que le
+profil de la page est actif, le composeur de l'accueil publie directement
+en son nom, sans navigation ni changement de profil; une session réutilisée
+restée sur la page cible reprend son composeur sans repasser par l'accueil.
 """
 
-import os
 import time
 from pathlib import Path
 from .base import BasePoster
+from .capabilities import BUILTIN_CAPABILITIES
+from utils.context import current_context
+from utils.dedup import DedupIndex, dedup_enabled, text_hash
 from utils.logger import get_logger
+from utils.retry import TransientError, PermanentError
 
 logger = get_logger(__name__)
 
@@ -21,83 +31,19 @@ class FacebookPoster(BasePoster):
     LOGIN_URL = "https://www.facebook.com/login"
     HOME_URL = "https://www.facebook.com/"
     
-    def __init__(self, headless: bool = True):
-        super().__init__(headless)
-        self.email = os.getenv('FACEBOOK_EMAIL')
-        self.password = os.getenv('FACEBOOK_PASS')
-        self.page_name = os.getenv('FACEBOOK_PAGE_NAME')
+    CAPABILITIES = BUILTIN_CAPABILITIES['facebook']
     
-    def _handle_cookie_popup(self) -> bool:
-        """
-        Gère le popup de cookies Facebook - DOIT être appelé en premier.
-        Utilise une stratégie multi-niveaux pour gérer l'overlay.
-        """
-        logger.info("Recherche du popup de cookies...")
-        
-        try:
-            # Attendre que la page soit complètement chargée
-            self.page.wait_for_load_state('networkidle', timeout=10000)
-        except:
-            pass
-        
-        self._random_delay(1, 2)
-        
-        # Stratégie 1: Clic direct avec JavaScript sur le bouton du cookie dialog
-        try:
-            result = self.page.evaluate("""
-                () => {
-                    // Chercher le dialogue de cookies par data-testid
-                    const dialog = document.querySelector('[data-testid="cookie-policy-manage-dialog"]');
-                    if (dialog) {
-                        // Chercher le bouton "Autoriser" ou "Allow" dans le dialogue
-                        const buttons = dialog.querySelectorAll('div[role="button"]');
-                        for (const btn of buttons) {
-                            const text = btn.textContent.toLowerCase();
-                            // Premier bouton est généralement "Autoriser tous les cookies"
-                            if (text.includes('autoriser') || text.includes('allow') || 
-                                text.includes('accepter') || text.includes('accept') ||
-                                text.includes('essential') || text.includes('essentiel')) {
-                                btn.click();
-                                return 'clicked_dialog_button';
-                            }
-                        }
-                        // Si pas de texte trouvé, cliquer sur le premier bouton principal
-                        const primaryBtn = dialog.querySelector('div[aria-label*="cookies"], div[role="button"]');
-                        if (primaryBtn) {
-                            primaryBtn.click();
-                            return 'clicked_primary';
-                        }
-                    }
-                    
-                    // Chercher les boutons génériques
-                    const allButtons = document.querySelectorAll('button, div[role="button"]');
-                    for (const btn of allButtons) {
-                        const text = btn.textContent.toLowerCase();
-                        if ((text.includes('autoriser') && text.includes('cookie')) ||
-                            (text.includes('allow') && text.includes('cookie')) ||
-                            text.includes('tout accepter') ||
-                            text.includes('accept all') ||
-                            text === 'autoriser les cookies essentiels et optionnels' ||
-                            text === 'allow all cookies') {
-                            btn.click();
-                            return 'clicked_generic';
-                        }
-                    }
-                    
-                    return 'no_popup_found';
-                }
-            """)
-            
-            if result and result != 'no_popup_found':
-                logger.info(f"Popup cookies fermé via JavaScript: {result}")
-                self._random_delay(2, 3)
-                return True
-                
-        except Exception as e:
-            logger.debug(f"Stratégie JS échouée: {e}")
-        
-        # Stratégie 2: Utiliser les sélecteurs Playwright avec force click
-        cookie_selectors = [
+    # Sélecteurs par élément, du plus fiable au plus large (évalués hors ligne
+    # sur les instantanés DOM: python main.py --selectors snapshots/)
+    SELECTORS = {
+        # Dialogue de consentement (ou son overlay): présent = cookies à accepter
+        'cookie_dialog': (
+            '[data-testid="cookie-policy-manage-dialog"]',
+            'div[role="dialog"]:has([data-cookiebanner="accept_button"])',
+            'div[role="dialog"]:has-text("Autoriser l\'utilisation des cookies")',
+            'div[role="dialog"]:has-text("Allow the use of cookies")',
+        ),
+        'cookie': (
             # Sélecteurs spécifiques Facebook 2024/2025
             '[data-testid="cookie-policy-manage-dialog"] div[role="button"]:first-of-type',
             '[data-cookiebanner="accept_button"]',
@@ -114,49 +60,8 @@ class FacebookPoster(BasePoster):
             '[aria-label*="Allow"][aria-label*="cookies"]',
             '[aria-label="Tout accepter"]',
             '[aria-label="Allow all cookies"]',
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=1500):
-                    # Utiliser dispatch_event pour contourner l'overlay
-                    btn.dispatch_event('click')
-                    logger.info(f"Popup cookies fermé avec: {selector}")
-                    self._random_delay(2, 3)
-                    return True
-            except Exception as e:
-                continue
-        
-        # Stratégie 3: Attendre et fermer tout dialogue visible
-        try:
-            self.page.evaluate("""
-                () => {
-                    // Supprimer les overlays de cookies
-                    const overlays = document.querySelectorAll('[data-testid="cookie-policy-manage-dialog"]');
-                    overlays.forEach(el => el.remove());
-                    
-                    // Supprimer les backdrops
-                    const backdrops = document.querySelectorAll('.__fb-light-mode div[style*="position: fixed"]');
-                    backdrops.forEach(el => {
-                        if (el.style.zIndex > 100) el.remove();
-                    });
-                }
-            """)
-            logger.info("Overlays de cookies supprimés via JS")
-            self._random_delay(1, 2)
-        except:
-            pass
-        
-        logger.info("Pas de popup de cookies détecté ou déjà fermé")
-        return False
-    
-    def _dismiss_popups(self):
-        """Ferme les popups Facebook courants."""
-        # D'abord gérer les cookies
-        self._handle_cookie_popup()
-        
-        popups = [
+        ),
+        'popup': (
             '[aria-label="Close"]',
             '[aria-label="Fermer"]',
             'div[aria-label="Close"]',
@@ -164,16 +69,118 @@ class FacebookPoster(BasePoster):
             'button:has-text("Pas maintenant")',
             'div[role="button"]:has-text("Not Now")',
             'div[role="button"]:has-text("Pas maintenant")',
-        ]
+        ),
+        'logged_in': (
+            '[aria-label="Create a post"]',
+            '[aria-label="Créer une publication"]',
+            '[aria-label="Your profile"]',
+            '[aria-label="Votre profil"]',
+            '[aria-label="Account"]',
+            '[aria-label="Compte"]',
+            '[aria-label="Menu"]',
+            'div[role="navigation"]',
+            '[data-pagelet="LeftRail"]',
+        ),
+        'create_post': (
+            '[aria-label="Create a post"]',
+            '[aria-label="Créer une publication"]',
+            'div[role="button"]:has-text("What\'s on your mind")',
+            'div[role="button"]:has-text("Exprimez-vous")',
+            'div[role="button"]:has-text("Quoi de neuf")',
+            '[data-pagelet="ProfileComposer"] div[role="button"]',
+        ),
+        'text_area': (
+            '[aria-label="What\'s on your mind?"]',
+            '[aria-label="Exprimez-vous..."]',
+            '[contenteditable="true"][role="textbox"]',
+            'div[role="textbox"]',
+        ),
+        'publish': (
+            '[aria-label="Post"]',
+            '[aria-label="Publier"]',
+            'div[role="button"]:has-text("Post")',
+            'div[role="button"]:has-text("Publier")',
+        ),
+        # Bouton d'acceptation du dialogue de consentement seul, pour le
+        # watchdog (pas de "Accept all"/"Allow" partiel ailleurs sur la page)
+        'cookie_banner': (
+            '[data-cookiebanner="accept_button"]',
+            'button[data-testid="cookie-policy-manage-dialog-accept-button"]',
+            '[data-testid="cookie-policy-manage-dialog"] div[role="button"]:has-text("Autoriser tous les cookies")',
+            '[data-testid="cookie-policy-manage-dialog"] div[role="button"]:has-text("Allow all cookies")',
+            'div[role="button"]:text-is("Autoriser tous les cookies")',
+            'div[role="button"]:text-is("Allow all cookies")',
+            '[aria-label="Autoriser tous les cookies"]',
+            '[aria-label="Allow all cookies"]',
+        ),
+        # Passage au profil de la page (nouvelle expérience des Pages)
+        'switch_profile': (
+            '[aria-label="Switch now"]',
+            '[aria-label="Passer maintenant"]',
+            'div[role="button"]:has-text("Switch now")',
+            'div[role="button"]:has-text("Passer maintenant")',
+            'div[role="button"]:has-text("Basculer maintenant")',
+        ),
+        'switch_confirm': (
+            'div[role="dialog"] div[role="button"]:has-text("Switch")',
+            'div[role="dialog"] div[role="button"]:has-text("Passer")',
+            'div[role="dialog"] div[role="button"]:has-text("Basculer")',
+        ),
+        'page_unavailable': (
+            'span:has-text("This content isn\'t available")',
+            'span:has-text("Ce contenu n’est pas disponible")',
+            'span:has-text("This Page Isn\'t Available")',
+            'span:has-text("Cette Page n’est pas disponible")',
+        ),
+        # Interruptions sans risque (enregistrer la connexion, notifications...)
+        'interruptions': (
+            'div[role="button"]:has-text("Not Now")',
+            'div[role="button"]:has-text("Pas maintenant")',
+            'button:has-text("Not Now")',
+            'button:has-text("Pas maintenant")',
+        ),
+    }
+    
+    # Fermés en arrière-plan dès leur apparition (platforms.watchdog)
+    WATCHDOG = ('cookie_banner', 'interruptions')
+    
+    def __init__(self, headless: bool = True, **kwargs):
+        super().__init__(headless, **kwargs)
+        self.email = self._credential('email', 'FACEBOOK_EMAIL')
+        self.password = self._credential('password', 'FACEBOOK_PASS')
         
-        for popup_selector in popups:
-            try:
-                popup = self.page.locator(popup_selector).first
-                if popup.is_visible(timeout=1000):
-                    popup.dispatch_event('click')
-                    self._random_delay(0.5, 1)
-            except:
-                continue
+        # Pages cibles (une publication par page, dans la même session);
+        # aucune = profil personnel
+        names = self._credential('page_names', 'FACEBOOK_PAGE_NAMES') or self._credential('page_name', 'FACEBOOK_PAGE_NAME') or ''
+        if isinstance(names, str):
+            names = names.split(',')
+        self.page_names = [name.strip() for name in names if name.strip()]
+        self.target_page = None
+        self.published_pages = []
+        self.skipped_pages = []
+    
+    def _handle_cookie_popup(self) -> bool:
+        """
+        Accepte les cookies si le dialogue de consentement est affiché.
+        
+        Une seule attente ciblée sur le dialogue (flow 'cookie_dialog'), au
+        lieu d'attendre networkidle puis de sonder chaque sélecteur. Sans
+        dialogue, le consentement est déjà acquis pour ce contexte: les
+        navigations suivantes ne vérifient plus rien.
+        """
+        if self.store.get('cookie_consent'):
+            return False
+        
+        instant = bool(self._watchdog)
+        if self._run_flow('cookie_dialog', instant=instant) is None:
+            # Passage sans attente: l'absence du dialogue ne prouve rien
+            if not instant:
+                self.store['cookie_consent'] = True
+            return False
+        
+        self._run_flow('cookie')
+        self.store['cookie_consent'] = True
+        return True
     
     def _check_logged_in(self) -> bool:
         """Vérifie si on est connecté à Facebook."""
@@ -183,7 +190,6 @@ class FacebookPoster(BasePoster):
             
             # Gérer les cookies d'abord - CRITIQUE
             self._handle_cookie_popup()
-            self._random_delay(1, 2)
             
             # Vérifier si on est sur la page de login
             current_url = self.page.url.lower()
@@ -191,19 +197,7 @@ class FacebookPoster(BasePoster):
                 return False
             
             # Chercher des éléments qui indiquent une connexion
-            indicators = [
-                '[aria-label="Create a post"]',
-                '[aria-label="Créer une publication"]',
-                '[aria-label="Your profile"]',
-                '[aria-label="Votre profil"]',
-                '[aria-label="Account"]',
-                '[aria-label="Compte"]',
-                '[aria-label="Menu"]',
-                'div[role="navigation"]',
-                '[data-pagelet="LeftRail"]',
-            ]
-            
-            for indicator in indicators:
+            for indicator in self.SELECTORS['logged_in']:
                 try:
                     if self.page.locator(indicator).count() > 0:
                         return True
@@ -227,13 +221,13 @@ class FacebookPoster(BasePoster):
             
             # CRITIQUE: Gérer les cookies AVANT toute interaction
             self._handle_cookie_popup()
-            self._random_delay(1, 2)
             
             # Attendre que le formulaire soit prêt
             try:
                 self.page.wait_for_selector('input#email', state='visible', timeout=15000)
             except:
-                # Peut-être déjà connecté ou cookies non gérés
+                # Peut-être déjà connecté ou cookies non gérés: nouvelle vérification
+                self.store.pop('cookie_consent', None)
                 self._handle_cookie_popup()
                 self.page.wait_for_selector('input#email', state='visible', timeout=10000)
             
@@ -282,83 +276,142 @@ class FacebookPoster(BasePoster):
             self._take_screenshot("login_error")
             return False
     
-    def _switch_to_page(self) -> bool:
-        """Passe en mode page pour publier."""
-        if not self.page_name:
+    def _resolve_page(self, page_name: str) -> dict:
+        """
+        Ouvre la page une première fois: identifiant, URL directe et bascule
+        de profil proposée ou non. Le résultat est gardé dans le store de la
+        session; la page reste ouverte.
+        
+        Returns:
+            {'id', 'url', 'landed', 'switch'} (landed: URL atteinte après
+            redirection; switch: la page se publie depuis son profil)
+        
+        Raises:
+            PermanentError: Si la page n'existe pas (ou n'est pas accessible)
+        """
+        logger.info(f"Résolution de la page: {page_name}")
+        self._goto(f"{self.HOME_URL}{page_name.replace(' ', '')}", timeout=30000)
+        self._random_delay(2, 3)
+        self._dismiss_popups()
+        
+        if self._race(self.SELECTORS['page_unavailable'], 0)[0]:
+            raise PermanentError(f"Page Facebook introuvable: {page_name}")
+        
+        page_id = self._run_flow('page_id')
+        entry = {
+            'id': page_id,
+            'url': f"{self.HOME_URL}profile.php?id={page_id}" if page_id else self.page.url,
+            'landed': self.page.url,
+            'switch': self._race(self.SELECTORS['switch_profile'], 3000)[0] is not None,
+        }
+        
+        self.store.setdefault('pages', {})[page_name] = entry
+        logger.info(f"Page {page_name}: id {page_id or 'inconnu'}, "
+                    f"{'profil de la page' if entry['switch'] else 'composeur de la page'}")
+        return entry
+    
+    def _on_page(self, entry: dict) -> bool:
+        """Indique si l'onglet est déjà sur la page (URL directe ou après redirection)."""
+        current = self.page.url.rstrip('/')
+        return current in (entry['url'].rstrip('/'), entry.get('landed', '').rstrip('/'))
+    
+    def _session_ready(self) -> bool:
+        """
+        Session réutilisée restée sur la page cible (post précédent) et
+        toujours connectée: le composeur de la page est repris tel quel.
+        """
+        entry = self.store.get('pages', {}).get(self.target_page) if self.target_page else None
+        return bool(entry and self.session and self.session.uses and self._on_page(entry)
+                    and self._race(self.SELECTORS['logged_in'], 0)[0])
+    
+    def _switch_profile(self, page_name: str) -> bool:
+        """
+        Bascule sur le profil de la page ouverte, puis vérifie que la bascule
+        n'est plus proposée. Le profil actif (store['acting_as']) n'est
+        renseigné qu'après cette confirmation.
+        
+        Returns:
+            True si le profil de la page est actif
+        """
+        self.store.pop('acting_as', None)
+        if self._run_flow('switch_profile') is None:
+            logger.warning(f"Bascule vers la page {page_name} non proposée")
+            return False
+        
+        self._run_flow('switch_confirm')
+        self.page.wait_for_load_state('domcontentloaded')
+        self._random_delay(1, 2)
+        if self._race(self.SELECTORS['switch_profile'], 0)[0]:
+            logger.warning(f"Bascule vers la page {page_name} non confirmée")
+            return False
+        
+        self.store['acting_as'] = page_name
+        return True
+    
+    def _switch_to_page(self, page_name: str = None) -> bool:
+        """
+        Passe en mode page pour publier.
+        
+        Profil de la page déjà actif: rien à faire, le composeur courant
+        publie en son nom. Sinon la page est ouverte par son URL directe
+        (résolue une fois par session), sauf si l'onglet y est déjà, et le
+        profil basculé si nécessaire.
+        
+        Returns:
+            True si la publication partira au nom de la page
+        
+        Raises:
+            PermanentError: Si la page n'existe pas, ou si le profil d'une
+                autre page est actif (la page ne se publie pas depuis son profil)
+        """
+        if not page_name:
             logger.info("Pas de nom de page configuré, publication sur profil personnel")
             return True
         
         try:
-            logger.info(f"Passage à la page: {self.page_name}")
+            if self.store.get('acting_as') == page_name:
+                logger.info(f"Profil de la page déjà actif: {page_name}")
+                return True
             
-            # Aller sur la page
-            page_url = f"https://www.facebook.com/{self.page_name.replace(' ', '')}"
-            self.page.goto(page_url, wait_until='domcontentloaded', timeout=30000)
-            self._random_delay(2, 3)
+            entry = self.store.get('pages', {}).get(page_name)
+            if entry is None:
+                entry = self._resolve_page(page_name)
+            elif self._on_page(entry):
+                logger.info(f"Déjà sur la page: {page_name}")
+            else:
+                logger.info(f"Passage à la page: {page_name}")
+                self._goto(entry['url'], timeout=30000)
+                entry['landed'] = self.page.url
+                self._random_delay(2, 3)
+                self._dismiss_popups()
             
-            self._dismiss_popups()
+            if entry['switch']:
+                return self._switch_profile(page_name)
             
-            # Vérifier si on est sur la page
+            # Composeur de la page: publié au nom du profil personnel, pas
+            # depuis le profil d'une autre page (rien ne changera en relançant)
+            if self.store.get('acting_as'):
+                raise PermanentError(f"Profil de la page {self.store['acting_as']} actif, "
+                                     f"impossible de publier sur {page_name}")
             return True
             
+        except PermanentError:
+            raise
         except Exception as e:
             logger.error(f"Erreur changement de page: {e}")
             return False
     
-    def _publish(self, text: str, image_path: str = None, video_path: str = None) -> bool:
-        """Publie sur Facebook."""
+    def _prepare_post(self, text: str, image_path: str = None, video_path: str = None):
+        """Ouvre le composeur, saisit le texte et ajoute l'image."""
         try:
             logger.info("Publication sur Facebook...")
             
-            # Passer à la page si configurée
-            self._switch_to_page()
-            
-            # Chercher et cliquer sur la zone de création de post
-            create_post_selectors = [
-                '[aria-label="Create a post"]',
-                '[aria-label="Créer une publication"]',
-                'div[role="button"]:has-text("What\'s on your mind")',
-                'div[role="button"]:has-text("Exprimez-vous")',
-                'div[role="button"]:has-text("Quoi de neuf")',
-                '[data-pagelet="ProfileComposer"] div[role="button"]',
-            ]
-            
-            create_btn = None
-            for selector in create_post_selectors:
-                try:
-                    btn = self.page.locator(selector).first
-                    if btn.is_visible(timeout=3000):
-                        create_btn = btn
-                        break
-                except:
-                    continue
-            
-            if not create_btn:
-                raise Exception("Bouton de création de post non trouvé")
-            
-            create_btn.click()
-            self._random_delay(2, 3)
-            
-            # Attendre le modal de composition
-            text_area_selectors = [
-                '[aria-label="What\'s on your mind?"]',
-                '[aria-label="Exprimez-vous..."]',
-                '[contenteditable="true"][role="textbox"]',
-                'div[role="textbox"]',
-            ]
-            
-            text_area = None
-            for selector in text_area_selectors:
-                try:
-                    area = self.page.locator(selector).first
-                    if area.is_visible(timeout=5000):
-                        text_area = area
-                        break
-                except:
-                    continue
+            # Passer à la page si configurée: jamais de publication sous un autre profil
+            if not self._switch_to_page(self.target_page):
+                raise TransientError(f"Passage à la page {self.target_page} impossible")
             
-            if not text_area:
-                raise Exception("Zone de texte non trouvée")
+            # Ouvrir le composeur et attendre la zone de texte
+            text_area = self._run_flow('open_composer')
             
             # Entrer le texte
             text_area.click()
@@ -379,35 +432,84 @@ class FacebookPoster(BasePoster):
                     # Upload le fichier
                     file_input = self.page.locator('input[type="file"][accept*="image"]').first
                     file_input.set_input_files(image_path)
-                    self._random_delay(3, 5)
+                    self._wait_for_media(3, 5)
                     logger.info("Image ajoutée")
                 except Exception as e:
                     logger.warning(f"Impossible d'ajouter l'image: {e}")
             
-            # Cliquer sur Publier
-            publish_selectors = [
-                '[aria-label="Post"]',
-                '[aria-label="Publier"]',
-                'div[role="button"]:has-text("Post")',
-                'div[role="button"]:has-text("Publier")',
-            ]
-            
-            for selector in publish_selectors:
-                try:
-                    btn = self.page.locator(selector).first
-                    if btn.is_visible() and btn.is_enabled():
-                        btn.click()
-                        break
-                except:
-                    continue
-            
-            self._random_delay(5, 8)
-            
-            self._take_screenshot("published")
-            logger.info("✅ Publication Facebook terminée")
-            return True
-            
         except Exception as e:
-            logger.error(f"Erreur publication Facebook: {e}")
+            logger.error(f"Erreur préparation Facebook: {e}")
             self._take_screenshot("publish_error")
-            return False
\ No newline at end of file
+            raise
+    
+    def _submit_post(self):
+        """Clique sur Publier."""
+        try:
+            self._run_flow('publish')
+        except TransientError:
+            self._take_screenshot("publish_error")
+            raise
+        
+        self._mark_submitted()
+        self._random_delay(5, 8)
+        
+        self._take_screenshot("published")
+        logger.info("✅ Publication Facebook terminée")
+    
+    def _publish(self, text: str, image_path: str = None, video_path: str = None,
+                 prepared: bool = False) -> bool:
+        """
+        Publie sur chaque page cible, l'une après l'autre dans la même
+        session. Les étapes de chaque page sont relancées indépendamment;
+        dès qu'une page est publiée, le job n'est plus rejoué en entier.
+        
+        Avec plusieurs pages, chaque page publiée est enregistrée aussitôt
+        dans l'index des doublons (compte "<compte>#<page>"): un nouveau
+        lancement après un échec saute les pages déjà publiées.
+        """
+        pages = self.page_names or [None]
+        dedup = DedupIndex() if len(pages) > 1 and dedup_enabled() else None
+        post = {'date': current_context().get('post') or text_hash(text)[:12],
+                'text': text, 'image': image_path, 'video': video_path}
+        try:
+            for index, page_name in enumerate(pages):
+                self.target_page = page_name
+                if dedup:
+                    duplicate = dedup.find_duplicate(post, self.PLATFORM_NAME, self._page_account(page_name))
+                    if duplicate:
+                        logger.info(f"⏭️ Page {page_name} ignorée: {duplicate}")
+                        self.skipped_pages.append(page_name)
+                        continue
+                
+                self._submitted = False
+                if self.published_pages:
+                    self._random_delay(5, 10)
+                if page_name and len(pages) > 1:
+                    logger.info(f"📄 Page {index + 1}/{len(pages)}: {page_name}")
+                super()._publish(text, image_path, video_path, prepared=prepared and index == 0)
+                self.published_pages.append(page_name)
+                if dedup:
+                    dedup.record(post, self.PLATFORM_NAME, self._page_account(page_name))
+        finally:
+            self._submitted = self._submitted or bool(self.published_pages)
+            if dedup:
+                dedup.close()
+        return True
+    
+    def _page_account(self, page_name: str) -> str:
+        """Compte d'une page dans l'index des doublons."""
+        return f"{self.account.name}#{page_name}"
+    
+    def _new_result(self) -> dict:
+        # Préparation (prewarm, mode onglets) et envoi commencent par la première page
+        self.target_page = self.page_names[0] if self.page_names else None
+        self.published_pages = []
+        self.skipped_pages = []
+        return super()._new_result()
+    
+    def _finalize(self, result: dict) -> dict:
+        if len(self.page_names) > 1:
+            result['pages'] = self.published_pages
+            if self.skipped_pages:
+                result['skipped_pages'] = self.skipped_pages
+        return super()._finalize(result)
@@ -0,0 +1,74 @@
+"""
+Budget Famille - Flows
+=======================
+Parcours de navigation déclaratifs (platforms/flows/<plateforme>.yaml).
+
+Un flow est une liste d'étapes exécutées par BasePoster._run_flow:
+
+    cookie:
+      - click: cookie          # groupe de SELECTORS du poster (ou liste de sélecteurs)
+        method: force          # click (défaut), force ou dispatch
+        timeout: 2000          # attente unique, partagée par tous les candidats
+        optional: true         # absent = pas une erreur
+        delay: [1, 2]          # pause "humaine" après l'action
+        log: Popup cookies fermé
+
+Actions: click, find (retourne l'élément), click_all (tous les candidats
+visibles), js (script évalué, résultat vrai = trouvé), wait_for_load et
+flow (sous-flow). Options: timeout, optional, method, target: parent,
+enabled, retries, delay, stop, log, screenshot, error (message si
+l'élément manque) et fallback (étapes exécutées si rien n'est trouvé).
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any
+
+FLOWS_DIR = Path(__file__).resolve().parent
+
+ACTIONS = ('click', 'find', 'click_all', 'js', 'wait_for_load', 'flow')
+OPTIONS = ('timeout', 'optional', 'method', 'target', 'enabled', 'retries', 'delay',
+           'stop', 'log', 'screenshot', 'error', 'fallback')
+
+
+def _validate(steps: Any, where: str) -> List[Dict[str, Any]]:
+    if not isinstance(steps, list):
+        raise ValueError(f"{where}: liste d'étapes attendue")
+
+    for index, step in enumerate(steps):
+        label = f"{where}[{index}]"
+        if not isinstance(step, dict):
+            raise ValueError(f"{label}: étape invalide")
+        actions = [key for key in step if key in ACTIONS]
+        if len(actions) != 1:
+            raise ValueError(f"{label}: une action parmi {', '.join(ACTIONS)} attendue")
+        unknown = [key for key in step if key not in ACTIONS and key not in OPTIONS]
+        if unknown:
+            raise ValueError(f"{label}: option inconnue {', '.join(unknown)}")
+        if step.get('method', 'click') not in ('click', 'force', 'dispatch'):
+            raise ValueError(f"{label}: method invalide ({step['method']})")
+        if 'fallback' in step:
+            _validate(step['fallback'], f"{label}.fallback")
+    return steps
+
+
+@lru_cache(maxsize=None)
+def load_flows(platform: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Flows d'une plateforme, lus et validés une fois par processus.
+
+    Raises:
+        FileNotFoundError: Si la plateforme n'a pas de fichier de flows
+        ValueError: Si le fichier est invalide
+    """
+    import yaml
+
+    path = FLOWS_DIR / f'{platform}.yaml'
+    with open(path, 'r', encoding='utf-8') as f:
+        flows = yaml.safe_load(f) or {}
+
+    if not isinstance(flows, dict):
+        raise ValueError(f"{path.name}: dictionnaire de flows attendu")
+    for name, steps in flows.items():
+        _validate(steps, f"{path.name}:{name}")
+    return flows
@@ -5,11 +5,12 @@ Module pour publier automatiquement sur Instagram.
 Gestion complète du flow multi-étapes (crop, filter, caption, share).
 """
 
-import os
 import time
 from pathlib import Path
 from .base import BasePoster
+from .capabilities import BUILTIN_CAPABILITIES
 from utils.logger import get_logger
+from utils.retry import PermanentError, TransientError
 
 logger = get_logger(__name__)
 
@@ -21,39 +22,20 @@ class InstagramPoster(BasePoster):
     LOGIN_URL = "https://www.instagram.com/accounts/login/"
     HOME_URL = "https://www.instagram.com/"
     
-    def __init__(self, headless: bool = True):
-        super().__init__(headless)
-        self.username = os.getenv('INSTAGRAM_USER')
-        self.password = os.getenv('INSTAGRAM_PASS')
+    CAPABILITIES = BUILTIN_CAPABILITIES['instagram']
     
-    def _handle_cookie_popup(self) -> bool:
-        """Gère les popups de cookies Instagram."""
-        cookie_selectors = [
+    # Sélecteurs par élément, du plus fiable au plus large (évalués hors ligne
+    # sur les instantanés DOM: python main.py --selectors snapshots/)
+    SELECTORS = {
+        'cookie': (
             'button:has-text("Allow all cookies")',
             'button:has-text("Autoriser tous les cookies")',
             'button:has-text("Accept All")',
             'button:has-text("Tout accepter")',
             'button:has-text("Accept")',
             'button:has-text("Accepter")',
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=2000):
-                    btn.click(force=True)
-                    self._random_delay(1, 2)
-                    logger.info("Popup cookies Instagram fermé")
-                    return True
-            except:
-                continue
-        return False
-    
-    def _dismiss_popups(self):
-        """Ferme les popups Instagram courants."""
-        self._handle_cookie_popup()
-        
-        popup_selectors = [
+        ),
+        'popup': (
             'button:has-text("Not Now")',
             'button:has-text("Pas maintenant")',
             'button:has-text("Cancel")',
@@ -61,16 +43,87 @@ class InstagramPoster(BasePoster):
             '[aria-label="Close"]',
             '[aria-label="Fermer"]',
             'svg[aria-label="Close"]',
-        ]
-        
-        for selector in popup_selectors:
-            try:
-                popup = self.page.locator(selector).first
-                if popup.is_visible(timeout=1500):
-                    popup.click(force=True)
-                    self._random_delay(0.5, 1)
-            except:
-                continue
+        ),
+        'logged_in': (
+            'svg[aria-label="New post"]',
+            'svg[aria-label="Nouvelle publication"]',
+            '[aria-label="Create"]',
+            '[aria-label="Créer"]',
+            'svg[aria-label="Home"]',
+        ),
+        'create': (
+            'svg[aria-label="New post"]',
+            'svg[aria-label="Nouvelle publication"]',
+            '[aria-label="Create"]',
+            '[aria-label="Créer"]',
+            'a[href="/create/style/"]',
+        ),
+        'caption': (
+            'textarea[aria-label*="caption"]',
+            'textarea[aria-label*="légende"]',
+            'textarea[aria-label*="Write a caption"]',
+            'textarea[aria-label*="Écrivez une légende"]',
+            'div[role="dialog"] textarea',
+            'div[contenteditable="true"][role="textbox"]',
+            'div[aria-label*="caption"]',
+        ),
+        'next': (
+            # Boutons textuels
+            'button:has-text("Next")',
+            'button:has-text("Suivant")',
+            'div[role="button"]:has-text("Next")',
+            'div[role="button"]:has-text("Suivant")',
+
+            # Sélecteurs spécifiques Instagram
+            'div[role="dialog"] button:has-text("Next")',
+            'div[role="dialog"] button:has-text("Suivant")',
+
+            # Par position (dernier bouton dans le header du dialog)
+            'div[role="dialog"] header button:last-child',
+        ),
+        'share': (
+            # Boutons textuels
+            'button:has-text("Share")',
+            'button:has-text("Partager")',
+            'div[role="button"]:has-text("Share")',
+            'div[role="button"]:has-text("Partager")',
+
+            # Sélecteurs spécifiques Instagram
+            'div[role="dialog"] button:has-text("Share")',
+            'div[role="dialog"] button:has-text("Partager")',
+        ),
+        'menu_create': (
+            'span:has-text("Create")',
+            'span:has-text("Créer")',
+        ),
+        'shared': (
+            'text=Your post has been shared',
+            'text=Votre publication a été partagée',
+            'text=Post shared',
+            'text=Publication partagée',
+        ),
+        # Bannière de cookies seule (sans "Accept" générique, qui pourrait
+        # accepter autre chose qu'un consentement)
+        'cookie_banner': (
+            'button:has-text("Allow all cookies")',
+            'button:has-text("Autoriser tous les cookies")',
+            'button:has-text("Accept All")',
+            'button:has-text("Tout accepter")',
+        ),
+        # Interruptions sans risque (enregistrer la connexion, notifications...)
+        'interruptions': (
+            'button:has-text("Not Now")',
+            'button:has-text("Pas maintenant")',
+        ),
+    }
+    
+    # Fermés en arrière-plan dès leur apparition (platforms.watchdog)
+    WATCHDOG = ('cookie_banner', 'interruptions')
+    
+    def __init__(self, headless: bool = True, **kwargs):
+        super().__init__(headless, **kwargs)
+        self.username = self._credential('username', 'INSTAGRAM_USER')
+        self.password = self._credential('password', 'INSTAGRAM_PASS')
     
     def _check_logged_in(self) -> bool:
         """Vérifie si on est connecté à Instagram."""
@@ -84,15 +137,7 @@ class InstagramPoster(BasePoster):
             if 'login' in current_url or 'accounts' in current_url:
                 return False
             
-            indicators = [
-                'svg[aria-label="New post"]',
-                'svg[aria-label="Nouvelle publication"]',
-                '[aria-label="Create"]',
-                '[aria-label="Créer"]',
-                'svg[aria-label="Home"]',
-            ]
-            
-            for indicator in indicators:
+            for indicator in self.SELECTORS['logged_in']:
                 try:
                     if self.page.locator(indicator).count() > 0:
                         return True
@@ -146,134 +191,26 @@ class InstagramPoster(BasePoster):
             return False
     
     def _click_next_button(self) -> bool:
-        """Clique sur le bouton Next/Suivant avec plusieurs stratégies."""
-        next_selectors = [
-            # Boutons textuels
-            'button:has-text("Next")',
-            'button:has-text("Suivant")',
-            'div[role="button"]:has-text("Next")',
-            'div[role="button"]:has-text("Suivant")',
-            
-            # Sélecteurs spécifiques Instagram
-            'div[role="dialog"] button:has-text("Next")',
-            'div[role="dialog"] button:has-text("Suivant")',
-            
-            # Par position (dernier bouton dans le header du dialog)
-            'div[role="dialog"] header button:last-child',
-        ]
-        
-        for selector in next_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=3000) and btn.is_enabled():
-                    btn.click(force=True)
-                    logger.info(f"Bouton Next cliqué: {selector}")
-                    return True
-            except:
-                continue
-        
-        # Fallback JavaScript
-        try:
-            clicked = self.page.evaluate("""
-                () => {
-                    const dialog = document.querySelector('div[role="dialog"]');
-                    if (!dialog) return false;
-                    
-                    const buttons = dialog.querySelectorAll('button, div[role="button"]');
-                    for (const btn of buttons) {
-                        const text = btn.textContent.toLowerCase().trim();
-                        if (text === 'next' || text === 'suivant') {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                    
-                    // Dernier bouton du header
-                    const header = dialog.querySelector('header, [role="heading"]');
-                    if (header) {
-                        const headerBtns = header.parentElement.querySelectorAll('button');
-                        if (headerBtns.length > 0) {
-                            headerBtns[headerBtns.length - 1].click();
-                            return true;
-                        }
-                    }
-                    
-                    return false;
-                }
-            """)
-            if clicked:
-                logger.info("Bouton Next cliqué via JavaScript")
-                return True
-        except:
-            pass
-        
-        return False
+        """Clique sur le bouton Next/Suivant (flow 'next', repli JavaScript)."""
+        return self._run_flow('next') is not None
     
     def _click_share_button(self) -> bool:
-        """Clique sur le bouton Share/Partager avec plusieurs stratégies."""
-        share_selectors = [
-            # Boutons textuels
-            'button:has-text("Share")',
-            'button:has-text("Partager")',
-            'div[role="button"]:has-text("Share")',
-            'div[role="button"]:has-text("Partager")',
-            
-            # Sélecteurs spécifiques Instagram
-            'div[role="dialog"] button:has-text("Share")',
-            'div[role="dialog"] button:has-text("Partager")',
-        ]
-        
-        for selector in share_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=3000) and btn.is_enabled():
-                    btn.click(force=True)
-                    logger.info(f"Bouton Share cliqué: {selector}")
-                    return True
-            except:
-                continue
-        
-        # Fallback JavaScript
-        try:
-            clicked = self.page.evaluate("""
-                () => {
-                    const dialog = document.querySelector('div[role="dialog"]');
-                    if (!dialog) return false;
-                    
-                    const buttons = dialog.querySelectorAll('button, div[role="button"]');
-                    for (const btn of buttons) {
-                        const text = btn.textContent.toLowerCase().trim();
-                        if (text === 'share' || text === 'partager') {
-                            btn.click();
-                            return true;
-                        }
-                    }
-                    return false;
-                }
-            """)
-            if clicked:
-                logger.info("Bouton Share cliqué via JavaScript")
-                return True
-        except:
-            pass
-        
-        return False
+        """Clique sur le bouton Share/Partager (flow 'share', repli JavaScript)."""
+        return self._run_flow('share') is not None
     
-    def _publish(self, text: str, image_path: str = None, video_path: str = None) -> bool:
+    def _prepare_post(self, text: str, image_path: str = None, video_path: str = None):
         """
-        Publie un post sur Instagram.
-        Flow complet: Upload → Crop → Filter → Caption → Share
+        Prépare un post Instagram.
+        Flow complet: Upload → Crop → Filter → Caption (→ Share dans _submit_post)
         """
         try:
             media_path = image_path or video_path
             
             if not media_path:
-                logger.error("Instagram requiert une image ou une vidéo!")
-                return False
+                raise PermanentError("Instagram requiert une image ou une vidéo!")
             
             if not Path(media_path).exists():
-                logger.error(f"Fichier média non trouvé: {media_path}")
-                return False
+                raise PermanentError(f"Fichier média non trouvé: {media_path}")
             
             logger.info("Publication sur Instagram...")
             
@@ -284,41 +221,7 @@ class InstagramPoster(BasePoster):
             # ===== ÉTAPE 1: Cliquer sur "Créer" =====
             logger.info("Étape 1: Ouverture du dialog de création...")
             
-            create_selectors = [
-                'svg[aria-label="New post"]',
-                'svg[aria-label="Nouvelle publication"]',
-                '[aria-label="Create"]',
-                '[aria-label="Créer"]',
-                'a[href="/create/style/"]',
-            ]
-            
-            clicked = False
-            for selector in create_selectors:
-                try:
-                    element = self.page.locator(selector).first
-                    if element.is_visible(timeout=3000):
-                        # Cliquer sur le parent (le lien/bouton)
-                        parent = element.locator('xpath=..')
-                        parent.click(force=True)
-                        clicked = True
-                        logger.info(f"Bouton Créer cliqué: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not clicked:
-                # Essayer via le menu latéral
-                try:
-                    menu_create = self.page.locator('span:has-text("Create"), span:has-text("Créer")').first
-                    if menu_create.is_visible(timeout=3000):
-                        menu_create.click(force=True)
-                        clicked = True
-                        logger.info("Bouton Créer cliqué via menu")
-                except:
-                    pass
-            
-            if not clicked:
-                raise Exception("Bouton Créer non trouvé")
+            self._run_flow('open_create')
             
             self._random_delay(2, 3)
             self._take_screenshot("create_dialog_opened")
@@ -326,8 +229,9 @@ class InstagramPoster(BasePoster):
             # ===== ÉTAPE 2: Upload du fichier =====
             logger.info("Étape 2: Upload du média...")
             
-            file_input = self.page.locator('input[type="file"]').first
-            file_input.set_input_files(media_path)
+            with self._step('upload'):
+                file_input = self.page.locator('input[type="file"]').first
+                file_input.set_input_files(media_path)
             
             self._random_delay(3, 5)
             self._take_screenshot("media_uploaded")
@@ -353,26 +257,7 @@ class InstagramPoster(BasePoster):
             # ===== ÉTAPE 5: Ajouter la légende =====
             logger.info("Étape 5: Ajout de la légende...")
             
-            caption_selectors = [
-                'textarea[aria-label*="caption"]',
-                'textarea[aria-label*="légende"]',
-                'textarea[aria-label*="Write a caption"]',
-                'textarea[aria-label*="Écrivez une légende"]',
-                'div[role="dialog"] textarea',
-                'div[contenteditable="true"][role="textbox"]',
-                'div[aria-label*="caption"]',
-            ]
-            
-            caption_field = None
-            for selector in caption_selectors:
-                try:
-                    field = self.page.locator(selector).first
-                    if field.is_visible(timeout=3000):
-                        caption_field = field
-                        logger.info(f"Champ légende trouvé: {selector}")
-                        break
-                except:
-                    continue
+            caption_field = self._run_flow('caption')
             
             if caption_field:
                 caption_field.click(force=True)
@@ -383,49 +268,44 @@ class InstagramPoster(BasePoster):
             else:
                 logger.warning("Champ de légende non trouvé")
             
-            # ===== ÉTAPE 6: Partager =====
-            logger.info("Étape 6: Publication (Share)...")
-            
-            if self._click_share_button():
-                self._random_delay(5, 10)
-                self._take_screenshot("after_share")
-            else:
-                # Dernière tentative
-                logger.info("Tentative alternative pour le bouton Share...")
-                try:
-                    # Chercher n'importe quel bouton bleu/primaire
-                    primary_btn = self.page.locator('div[role="dialog"] button[type="button"]').last
-                    if primary_btn.is_visible() and primary_btn.is_enabled():
-                        btn_text = primary_btn.text_content()
-                        logger.info(f"Clic sur bouton: {btn_text}")
-                        primary_btn.click(force=True)
-                        self._random_delay(5, 10)
-                except:
-                    raise Exception("Bouton Share/Partager non trouvé")
-            
-            # Vérifier le succès (message "Post shared" ou fermeture du dialog)
+        except Exception as e:
+            logger.error(f"Erreur préparation Instagram: {e}")
+            self._take_screenshot("publish_error")
+            raise
+    
+    def _submit_post(self):
+        """Clique sur Share/Partager (le dialog préparé reste ouvert entre les tentatives)."""
+        # ===== ÉTAPE 6: Partager =====
+        logger.info("Étape 6: Publication (Share)...")
+        
+        with self._step('share'):
+            shared = self._click_share_button()
+        
+        if shared:
+            self._mark_submitted()
+            self._random_delay(5, 10)
+            self._take_screenshot("after_share")
+        else:
+            # Dernière tentative
+            logger.info("Tentative alternative pour le bouton Share...")
             try:
-                success_indicators = [
-                    'text=Your post has been shared',
-                    'text=Votre publication a été partagée',
-                    'text=Post shared',
-                    'text=Publication partagée',
-                ]
-                
-                for indicator in success_indicators:
-                    try:
-                        if self.page.locator(indicator).is_visible(timeout=3000):
-                            logger.info("✅ Confirmation de publication détectée")
-                            break
-                    except:
-                        continue
+                # Chercher n'importe quel bouton bleu/primaire
+                primary_btn = self.page.locator('div[role="dialog"] button[type="button"]').last
+                if primary_btn.is_visible() and primary_btn.is_enabled():
+                    btn_text = primary_btn.text_content()
+                    logger.info(f"Clic sur bouton: {btn_text}")
+                    primary_btn.click(force=True)
+                    shared = True
             except:
                 pass
             
-            logger.info("✅ Publication Instagram terminée!")
-            return True
+            if not shared:
+                raise TransientError("Bouton Share/Partager non trouvé")
             
-        except Exception as e:
-            logger.error(f"Erreur publication Instagram: {e}")
-            self._take_screenshot("publish_error")
-            return False
\ No newline at end of file
+            self._mark_submitted()
+            self._random_delay(5, 10)
+        
+        # Vérifier le succès (message "Post shared" ou fermeture du dialog)
+        self._run_flow('shared')
+        
+        logger.info("✅ Publication Instagram terminée!")
\ No newline at end of file
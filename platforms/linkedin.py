@@ -5,11 +5,12 @@ Module pour publier automatiquement sur LinkedIn.
 Détection robuste du bouton de publication (FR/EN).
 """
 
-import os
 import time
 from pathlib import Path
 from .base import BasePoster
+from .capabilities import BUILTIN_CAPABILITIES
 from utils.logger import get_logger
+from utils.retry import PermanentError, TransientError
 
 logger = get_logger(__name__)
 
@@ -21,54 +22,109 @@ class LinkedInPoster(BasePoster):
     LOGIN_URL = "https://www.linkedin.com/login"
     FEED_URL = "https://www.linkedin.com/feed/"
     
-    def __init__(self, headless: bool = True):
-        super().__init__(headless)
-        self.email = os.getenv('LINKEDIN_EMAIL')
-        self.password = os.getenv('LINKEDIN_PASS')
-        self.google_email = os.getenv('GOOGLE_EMAIL')
-        self.google_password = os.getenv('GOOGLE_PASS')
+    CAPABILITIES = BUILTIN_CAPABILITIES['linkedin']
     
-    def _handle_cookie_popup(self) -> bool:
-        """Gère le popup de cookies LinkedIn."""
-        cookie_selectors = [
+    # Sélecteurs par élément, du plus fiable au plus large (évalués hors ligne
+    # sur les instantanés DOM: python main.py --selectors snapshots/)
+    SELECTORS = {
+        'cookie': (
             'button[action-type="ACCEPT"]',
             'button:has-text("Accept")',
             'button:has-text("Accepter")',
             '.artdeco-global-alert__action button',
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=2000):
-                    btn.click(force=True)
-                    self._random_delay(1, 2)
-                    logger.info(f"Popup cookies fermé: {selector}")
-                    return True
-            except:
-                continue
-        return False
-    
-    def _dismiss_popups(self):
-        """Ferme les popups LinkedIn."""
-        self._handle_cookie_popup()
-        
-        popup_selectors = [
+        ),
+        'popup': (
             'button[aria-label="Dismiss"]',
             'button[aria-label="Fermer"]',
             'button:has-text("Not now")',
             'button:has-text("Pas maintenant")',
             '.msg-overlay-bubble-header__control--close',
-        ]
-        
-        for selector in popup_selectors:
-            try:
-                popup = self.page.locator(selector).first
-                if popup.is_visible(timeout=1000):
-                    popup.click(force=True)
-                    self._random_delay(0.5, 1)
-            except:
-                continue
+        ),
+        'logged_in': (
+            'button[aria-label*="Start a post"]',
+            'button[aria-label*="Commencer un post"]',
+            '.share-box-feed-entry__trigger',
+            '.global-nav__me-photo',
+        ),
+        'start_post': (
+            'button[aria-label*="Start a post"]',
+            'button[aria-label*="Commencer un post"]',
+            '.share-box-feed-entry__trigger',
+            'button:has-text("Start a post")',
+            'button:has-text("Commencer un post")',
+        ),
+        'editor': (
+            '.ql-editor[data-placeholder]',
+            '.ql-editor',
+            'div[contenteditable="true"][role="textbox"]',
+            '[aria-label="Text editor for creating content"]',
+            '[aria-label="Éditeur de texte pour créer du contenu"]',
+        ),
+        'publish': (
+            # Par data-control-name (le plus fiable)
+            'button[data-control-name="share.post"]',
+
+            # Par classe LinkedIn
+            'button.share-actions__primary-action',
+            '.share-box-footer__primary-btn',
+            '.share-creation-state__footer button.artdeco-button--primary',
+
+            # Par texte exact (EN)
+            'button:text-is("Post")',
+            'button:text-is("Share")',
+            'button:text-is("Send")',
+            'button:text-is("Publish")',
+
+            # Par texte exact (FR)
+            'button:text-is("Publier")',
+            'button:text-is("Poster")',
+            'button:text-is("Partager")',
+            'button:text-is("Envoyer")',
+
+            # Par has-text (moins précis mais plus flexible)
+            'button:has-text("Post")',
+            'button:has-text("Publier")',
+            'button:has-text("Poster")',
+            'button:has-text("Share")',
+            'button:has-text("Partager")',
+
+            # Par aria-label
+            'button[aria-label="Post"]',
+            'button[aria-label="Publier"]',
+            'button[aria-label="Share"]',
+            'button[aria-label="Partager"]',
+
+            # Boutons primaires dans le modal
+            '.share-box-footer button.artdeco-button--primary',
+            'footer button.artdeco-button--primary',
+            'div[role="dialog"] button.artdeco-button--primary',
+        ),
+        'google_button': (
+            '.alternate-signin__btn--google',
+            'button:has-text("Sign in with Google")',
+        ),
+        # Bannière de cookies seule (sans "Accept" générique, qui pourrait
+        # accepter autre chose qu'un consentement)
+        'cookie_banner': (
+            'button[action-type="ACCEPT"]',
+            '.artdeco-global-alert__action button',
+        ),
+        # Interruptions sans risque (enregistrer la connexion, notifications...)
+        'interruptions': (
+            'button:has-text("Not now")',
+            'button:has-text("Pas maintenant")',
+        ),
+    }
+    
+    # Fermés en arrière-plan dès leur apparition (platforms.watchdog)
+    WATCHDOG = ('cookie_banner', 'interruptions')
+    
+    def __init__(self, headless: bool = True, **kwargs):
+        super().__init__(headless, **kwargs)
+        self.email = self._credential('email', 'LINKEDIN_EMAIL')
+        self.password = self._credential('password', 'LINKEDIN_PASS')
+        self.google_email = self._credential('google_email', 'GOOGLE_EMAIL')
+        self.google_password = self._credential('google_password', 'GOOGLE_PASS')
     
     def _check_logged_in(self) -> bool:
         """Vérifie si connecté à LinkedIn."""
@@ -80,14 +136,7 @@ class LinkedInPoster(BasePoster):
             if 'login' in self.page.url.lower() or 'authwall' in self.page.url.lower():
                 return False
             
-            indicators = [
-                'button[aria-label*="Start a post"]',
-                'button[aria-label*="Commencer un post"]',
-                '.share-box-feed-entry__trigger',
-                '.global-nav__me-photo',
-            ]
-            
-            for indicator in indicators:
+            for indicator in self.SELECTORS['logged_in']:
                 try:
                     if self.page.locator(indicator).count() > 0:
                         return True
@@ -117,16 +166,7 @@ class LinkedInPoster(BasePoster):
         try:
             logger.info("🔍 Recherche du bouton Google...")
             
-            google_btn = None
-            for selector in ['.alternate-signin__btn--google', 'button:has-text("Sign in with Google")']:
-                try:
-                    btn = self.page.locator(selector).first
-                    if btn.is_visible(timeout=2000):
-                        google_btn = btn
-                        break
-                except:
-                    continue
-            
+            google_btn = self._run_flow('google_button')
             if not google_btn:
                 return False
             
@@ -254,131 +294,8 @@ class LinkedInPoster(BasePoster):
         """
         logger.info("Recherche du bouton de publication...")
         
-        # Liste exhaustive des sélecteurs
-        publish_selectors = [
-            # Par data-control-name (le plus fiable)
-            'button[data-control-name="share.post"]',
-            
-            # Par classe LinkedIn
-            'button.share-actions__primary-action',
-            '.share-box-footer__primary-btn',
-            '.share-creation-state__footer button.artdeco-button--primary',
-            
-            # Par texte exact (EN)
-            'button:text-is("Post")',
-            'button:text-is("Share")',
-            'button:text-is("Send")',
-            'button:text-is("Publish")',
-            
-            # Par texte exact (FR)
-            'button:text-is("Publier")',
-            'button:text-is("Poster")',
-            'button:text-is("Partager")',
-            'button:text-is("Envoyer")',
-            
-            # Par has-text (moins précis mais plus flexible)
-            'button:has-text("Post")',
-            'button:has-text("Publier")',
-            'button:has-text("Poster")',
-            'button:has-text("Share")',
-            'button:has-text("Partager")',
-            
-            # Par aria-label
-            'button[aria-label="Post"]',
-            'button[aria-label="Publier"]',
-            'button[aria-label="Share"]',
-            'button[aria-label="Partager"]',
-            
-            # Boutons primaires dans le modal
-            '.share-box-footer button.artdeco-button--primary',
-            'footer button.artdeco-button--primary',
-            'div[role="dialog"] button.artdeco-button--primary',
-        ]
-        
-        for selector in publish_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=1500):
-                    # Vérifier que le bouton est activé
-                    if btn.is_enabled():
-                        btn_text = btn.text_content().strip()
-                        logger.info(f"✅ Bouton trouvé: '{btn_text}' ({selector})")
-                        btn.click(force=True)
-                        return True
-            except:
-                continue
-        
-        # Fallback JavaScript - recherche intelligente
-        logger.info("Recherche via JavaScript...")
-        try:
-            clicked = self.page.evaluate("""
-                () => {
-                    // Mots-clés pour le bouton de publication
-                    const publishKeywords = ['post', 'publier', 'poster', 'share', 'partager', 'send', 'envoyer', 'publish'];
-                    
-                    // Chercher dans le modal de partage
-                    const modal = document.querySelector('.share-box, .artdeco-modal, div[role="dialog"]');
-                    const searchContainer = modal || document;
-                    
-                    // Chercher tous les boutons
-                    const buttons = searchContainer.querySelectorAll('button');
-                    
-                    // Premier passage: boutons primaires avec le bon texte
-                    for (const btn of buttons) {
-                        if (btn.disabled) continue;
-                        
-                        const text = btn.textContent.trim().toLowerCase();
-                        const ariaLabel = (btn.getAttribute('aria-label') || '').toLowerCase();
-                        const classes = btn.className.toLowerCase();
-                        
-                        const isPrimary = classes.includes('primary') || 
-                                         classes.includes('share-actions') ||
-                                         btn.closest('.share-box-footer, .share-actions, footer');
-                        
-                        const isPublishButton = publishKeywords.some(keyword => 
-                            text === keyword || ariaLabel === keyword
-                        );
-                        
-                        if (isPrimary && isPublishButton) {
-                            console.log('Clicking publish button:', btn.textContent);
-                            btn.click();
-                            return { success: true, text: btn.textContent.trim() };
-                        }
-                    }
-                    
-                    // Deuxième passage: n'importe quel bouton avec le bon texte
-                    for (const btn of buttons) {
-                        if (btn.disabled) continue;
-                        
-                        const text = btn.textContent.trim().toLowerCase();
-                        
-                        if (publishKeywords.some(keyword => text === keyword)) {
-                            console.log('Clicking button by text:', btn.textContent);
-                            btn.click();
-                            return { success: true, text: btn.textContent.trim() };
-                        }
-                    }
-                    
-                    // Troisième passage: bouton primaire dans le footer
-                    const footers = searchContainer.querySelectorAll('.share-box-footer, .share-actions, footer, [class*="footer"]');
-                    for (const footer of footers) {
-                        const primaryBtn = footer.querySelector('button.artdeco-button--primary, button[class*="primary"]');
-                        if (primaryBtn && !primaryBtn.disabled) {
-                            console.log('Clicking primary button in footer:', primaryBtn.textContent);
-                            primaryBtn.click();
-                            return { success: true, text: primaryBtn.textContent.trim() };
-                        }
-                    }
-                    
-                    return { success: false };
-                }
-            """)
-            
-            if clicked and clicked.get('success'):
-                logger.info(f"✅ Bouton cliqué via JS: '{clicked.get('text')}'")
-                return True
-        except Exception as e:
-            logger.debug(f"JavaScript fallback failed: {e}")
+        if self._run_flow('publish') is not None:
+            return True
         
         # Dernier recours: cliquer sur le dernier bouton primaire visible
         logger.info("Dernier recours: bouton primaire le plus récent...")
@@ -399,8 +316,8 @@ class LinkedInPoster(BasePoster):
         logger.error("❌ Bouton de publication non trouvé!")
         return False
     
-    def _publish(self, text: str, image_path: str = None, video_path: str = None) -> bool:
-        """Publie sur LinkedIn."""
+    def _prepare_post(self, text: str, image_path: str = None, video_path: str = None):
+        """Ouvre le modal, saisit le texte et ajoute l'image."""
         try:
             logger.info("Publication sur LinkedIn...")
             
@@ -408,59 +325,11 @@ class LinkedInPoster(BasePoster):
             self._random_delay(2, 3)
             self._dismiss_popups()
             
-            # ===== ÉTAPE 1: Ouvrir le modal =====
-            logger.info("Étape 1: Ouverture du modal...")
-            
-            start_selectors = [
-                'button[aria-label*="Start a post"]',
-                'button[aria-label*="Commencer un post"]',
-                '.share-box-feed-entry__trigger',
-                'button:has-text("Start a post")',
-                'button:has-text("Commencer un post")',
-            ]
-            
-            clicked = False
-            for selector in start_selectors:
-                try:
-                    btn = self.page.locator(selector).first
-                    if btn.is_visible(timeout=3000):
-                        btn.click(force=True)
-                        clicked = True
-                        logger.info(f"Modal ouvert: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not clicked:
-                raise Exception("Bouton 'Start a post' non trouvé")
-            
-            self._random_delay(2, 3)
-            self._take_screenshot("modal_opened")
-            
-            # ===== ÉTAPE 2: Saisir le texte =====
-            logger.info("Étape 2: Saisie du texte...")
-            
-            editor_selectors = [
-                '.ql-editor[data-placeholder]',
-                '.ql-editor',
-                'div[contenteditable="true"][role="textbox"]',
-                '[aria-label="Text editor for creating content"]',
-                '[aria-label="Éditeur de texte pour créer du contenu"]',
-            ]
-            
-            editor = None
-            for selector in editor_selectors:
-                try:
-                    field = self.page.locator(selector).first
-                    if field.is_visible(timeout=5000):
-                        editor = field
-                        break
-                except:
-                    continue
-            
-            if not editor:
-                raise Exception("Éditeur de texte non trouvé")
+            # ===== ÉTAPES 1-2: Ouvrir le modal, trouver l'éditeur =====
+            logger.info("Étapes 1-2: Ouverture du modal et de l'éditeur...")
+            editor = self._run_flow('open_composer')
             
+            logger.info("Saisie du texte...")
             editor.click(force=True)
             self._random_delay(0.5, 1)
             editor.type(text, delay=25)
@@ -474,39 +343,48 @@ class LinkedInPoster(BasePoster):
                 try:
                     file_input = self.page.locator('input[type="file"][accept*="image"]').first
                     file_input.set_input_files(image_path)
-                    self._random_delay(3, 5)
+                    self._wait_for_media(3, 5)
                     logger.info("✅ Image ajoutée")
                     self._take_screenshot("image_added")
                 except Exception as e:
                     logger.warning(f"Impossible d'ajouter l'image: {e}")
             
-            # ===== ÉTAPE 4: Publier =====
-            logger.info("Étape 4: Publication...")
-            self._take_screenshot("before_publish")
-            
-            if self._click_publish_button():
-                self._random_delay(3, 5)
-                self._take_screenshot("after_publish")
-                
-                # Vérifier si le modal s'est fermé
-                try:
-                    modal_still_visible = self.page.locator('.share-box, .artdeco-modal').first.is_visible(timeout=3000)
-                    if modal_still_visible:
-                        # Peut-être un message d'erreur
-                        error = self.page.locator('.artdeco-inline-feedback--error').first
-                        if error.is_visible(timeout=1000):
-                            logger.error(f"Erreur: {error.text_content()}")
-                            return False
-                except:
-                    pass  # Modal fermé = succès
-                
-                logger.info("✅ Publication LinkedIn terminée!")
-                return True
-            else:
-                self._take_screenshot("publish_button_not_found")
-                raise Exception("Impossible de publier: bouton non trouvé")
-            
         except Exception as e:
-            logger.error(f"Erreur publication LinkedIn: {e}")
+            logger.error(f"Erreur préparation LinkedIn: {e}")
             self._take_screenshot("publish_error")
-            return False
\ No newline at end of file
+            raise
+    
+    def _submit_post(self):
+        """Clique sur Publier (le modal préparé reste ouvert entre les tentatives)."""
+        # ===== ÉTAPE 4: Publier =====
+        logger.info("Étape 4: Publication...")
+        self._take_screenshot("before_publish")
+        
+        with self._step('publish_button'):
+            published = self._click_publish_button()
+        
+        if not published:
+            self._take_screenshot("publish_button_not_found")
+            raise TransientError("Impossible de publier: bouton non trouvé")
+        
+        self._mark_submitted()
+        self._random_delay(3, 5)
+        self._take_screenshot("after_publish")
+        
+        # Vérifier si le modal s'est fermé
+        error_message = None
+        try:
+            modal_still_visible = self.page.locator('.share-box, .artdeco-modal').first.is_visible(timeout=3000)
+            if modal_still_visible:
+                # Peut-être un message d'erreur
+                error = self.page.locator('.artdeco-inline-feedback--error').first
+                if error.is_visible(timeout=1000):
+                    error_message = error.text_content()
+        except:
+            pass  # Modal fermé = succès
+        
+        if error_message:
+            logger.error(f"Erreur: {error_message}")
+            raise PermanentError(f"LinkedIn a refusé la publication: {error_message}")
+        
+        logger.info("✅ Publication LinkedIn terminée!")
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Budget Famille - Platform Registry
+===================================
+Registre des plateformes résolu à la demande.
+
+Les modules des posters ne sont importés qu'au premier usage, ce qui garde
+les commandes en lecture seule (--list, --dry-run) rapides. Des plateformes
+supplémentaires peuvent être fournies par des paquets externes via le groupe
+d'entry points "budgetfamille.platforms".
+"""
+
+import importlib
+from typing import Dict, List, Type
+
+from .capabilities import BUILTIN_CAPABILITIES
+
+# Plateformes intégrées: nom -> "module:Classe"
+BUILTIN_PLATFORMS = {
+    'linkedin': 'platforms.linkedin:LinkedInPoster',
+    'instagram': 'platforms.instagram:InstagramPoster',
+    'facebook': 'platforms.facebook:FacebookPoster',
+    'twitter': 'platforms.twitter:TwitterPoster',
+}
+
+ENTRY_POINT_GROUP = 'budgetfamille.platforms'
+
+_plugins: Dict[str, str] = None
+_classes: Dict[str, Type] = {}
+
+
+def _discover_plugins() -> Dict[str, str]:
+    """Découvre (une seule fois) les plateformes déclarées en entry points."""
+    global _plugins
+
+    if _plugins is None:
+        _plugins = {}
+        try:
+            from importlib.metadata import entry_points
+            for ep in entry_points(group=ENTRY_POINT_GROUP):
+                _plugins.setdefault(ep.name, ep.value)
+        except Exception:
+            pass
+
+    return _plugins
+
+
+def builtin_platforms() -> List[str]:
+    """Noms des plateformes intégrées (sans découverte des plugins)."""
+    return list(BUILTIN_PLATFORMS)
+
+
+def available_platforms() -> List[str]:
+    """Noms de toutes les plateformes disponibles (intégrées + plugins)."""
+    names = list(BUILTIN_PLATFORMS)
+    names += [name for name in _discover_plugins() if name not in BUILTIN_PLATFORMS]
+    return names
+
+
+def is_platform(name: str) -> bool:
+    """Indique si la plateforme est connue, sans importer son module."""
+    return name in BUILTIN_PLATFORMS or name in _discover_plugins()
+
+
+def get_poster_class(name: str) -> Type:
+    """
+    Retourne la classe du poster, en important son module au premier appel.
+
+    Args:
+        name: Nom de la plateforme
+
+    Returns:
+        Classe du poster
+
+    Raises:
+        KeyError: Si la plateforme est inconnue
+    """
+    if name in _classes:
+        return _classes[name]
+
+    target = BUILTIN_PLATFORMS.get(name) or _discover_plugins().get(name)
+    if not target:
+        raise KeyError(f"Plateforme inconnue: {name}")
+
+    module_name, _, class_name = target.partition(':')
+    poster_class = getattr(importlib.import_module(module_name), class_name)
+    _classes[name] = poster_class
+    return poster_class
+
+
+def get_capabilities(name: str):
+    """
+    Retourne les capacités de la plateforme, sans importer le poster pour
+    les plateformes intégrées (sans lancer de navigateur).
+
+    Args:
+        name: Nom de la plateforme
+
+    Returns:
+        PlatformCapabilities de la plateforme
+    """
+    if name in BUILTIN_CAPABILITIES:
+        return BUILTIN_CAPABILITIES[name]
+    return get_poster_class(name).CAPABILITIES
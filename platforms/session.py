@@ -0,0 +1,106 @@
+"""
+Budget Famille - Browser Session
+=================================
+Contexte navigateur réutilisé entre plusieurs publications.
+
+Une session appartient à un (compte, plateforme) et au thread qui l'a
+ouverte (l'API synchrone de Playwright n'est pas partageable entre
+threads). Garder le contexte ouvert entre deux posts évite de relancer
+Chrome et conserve les connexions TLS (et le proxy) déjà établies.
+
+Chromium n'ouvre pas deux fois le même dossier de profil: avant de lancer
+un contexte, le pool ferme ses autres sessions ouvertes sur ce dossier.
+"""
+
+import os
+import threading
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def session_reuse_enabled() -> bool:
+    """Réutilisation des contextes activée (BROWSER_REUSE, défaut: true)."""
+    return os.getenv('BROWSER_REUSE', 'true').lower() == 'true'
+
+
+class BrowserSession:
+    """Playwright, contexte et page conservés entre les publications."""
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.playwright = None
+        self.context = None
+        self.page = None
+        self.proxy = None
+        self.thread_id = None
+        self.uses = 0
+        self.watchdog = None  # Surveillance des popups installée sur la page
+        self.pool = None  # Pool propriétaire (SessionPool.get)
+        self.user_data_dir = None  # Dossier de profil du contexte ouvert
+        # État découvert pendant la vie du contexte (consentement cookies...)
+        self.store = {}
+
+    @property
+    def alive(self) -> bool:
+        """Indique si le contexte est réutilisable depuis le thread courant."""
+        if self.context is None or self.thread_id != threading.get_ident():
+            return False
+        try:
+            return not self.page.is_closed()
+        except Exception:
+            return False
+
+    def attach(self, playwright, context, page, proxy=None, user_data_dir=None):
+        """Enregistre un contexte fraîchement lancé."""
+        self.playwright = playwright
+        self.context = context
+        self.page = page
+        self.proxy = proxy
+        self.user_data_dir = str(user_data_dir) if user_data_dir else None
+        self.thread_id = threading.get_ident()
+        self.uses = 0
+        self.store = {}
+
+    def close(self):
+        """Ferme le contexte et Playwright."""
+        try:
+            if self.context:
+                self.context.close()
+            if self.playwright:
+                self.playwright.stop()
+        except Exception as e:
+            logger.debug(f"Fermeture session {self.label}: {e}")
+        finally:
+            self.playwright = self.context = self.page = self.proxy = None
+            self.thread_id = None
+            self.user_data_dir = None
+            self.watchdog = None
+            self.store = {}
+
+
+class SessionPool:
+    """Sessions d'un worker, indexées par (compte, plateforme)."""
+
+    def __init__(self):
+        self.sessions = {}
+
+    def get(self, account: str, platform: str) -> BrowserSession:
+        key = (account, platform)
+        if key not in self.sessions:
+            self.sessions[key] = BrowserSession(f"{platform}@{account}")
+            self.sessions[key].pool = self
+        return self.sessions[key]
+
+    def release(self, user_data_dir, keep: BrowserSession = None):
+        """Ferme les sessions ouvertes sur un dossier de profil (sauf keep)."""
+        for session in self.sessions.values():
+            if (session is not keep and session.context is not None
+                    and session.user_data_dir == str(user_data_dir)):
+                logger.info(f"♻️ Session {session.label} fermée: profil {user_data_dir} requis")
+                session.close()
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
@@ -0,0 +1,144 @@
+"""
+Budget Famille - Tab Orchestrator
+==================================
+Publication d'un post sur plusieurs plateformes dans les onglets d'un
+même contexte navigateur.
+
+Les parties lentes sont pipelinées: toutes les navigations sont lancées
+d'abord (wait_until='commit'), puis chaque onglet vérifie sa session une
+fois les pages chargées. La préparation (saisie, choix des médias) passe
+d'un onglet à l'autre sans attendre la fin des uploads, qui continuent en
+arrière-plan; une seule attente couvre ensuite tous les uploads. Seuls les
+clics d'envoi sont sérialisés et espacés, chacun après avoir obtenu un
+jeton du rate limiter.
+
+L'API synchrone de Playwright ne pilote qu'un onglet à la fois: les saisies
+elles-mêmes restent séquentielles, et Instagram (légende saisie après
+l'upload) attend son upload avant de passer à l'onglet suivant.
+"""
+
+import os
+import time
+import random
+from typing import List, Dict, Any
+from platforms.base import BasePoster
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TabOrchestrator:
+    """Pilote plusieurs posters d'un même compte dans un seul contexte."""
+
+    def __init__(self, posters: List[BasePoster], limiter=None, submit_interval: float = None):
+        """
+        Args:
+            posters: Posters du même compte (le premier lance le navigateur)
+            limiter: TokenBucketLimiter consulté avant chaque envoi (optionnel)
+            submit_interval: Pause minimale entre deux envois (TAB_SUBMIT_INTERVAL)
+        """
+        self.posters = posters
+        self.limiter = limiter
+        if submit_interval is None:
+            submit_interval = float(os.getenv('TAB_SUBMIT_INTERVAL', 5))
+        self.submit_interval = submit_interval
+
+    def _wait_for_token(self, poster: BasePoster):
+        if not self.limiter:
+            return
+        while True:
+            wait = self.limiter.try_acquire(poster.PLATFORM_NAME, poster.account.name)
+            if wait == 0:
+                return
+            logger.info(f"⏳ {poster.PLATFORM_NAME}: envoi dans {wait:.0f}s (rythme)")
+            time.sleep(wait)
+
+    def run(self, text: str, image_path: str = None, video_path: str = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Publie le post sur toutes les plateformes.
+
+        Returns:
+            Résultats indexés par plateforme
+        """
+        results = {poster.PLATFORM_NAME: poster._new_result() for poster in self.posters}
+        owner = self.posters[0]
+        owner.shared_profile = True
+        active = []
+
+        try:
+            owner._run_step('start_browser', owner._restart_browser)
+        except Exception as e:
+            for poster in self.posters:
+                poster._record_error(results[poster.PLATFORM_NAME], e)
+            owner._finalize(results[owner.PLATFORM_NAME])
+            return results
+
+        try:
+            # ===== Phase 1: toutes les navigations en parallèle =====
+            for poster in self.posters:
+                with poster._job_context():
+                    try:
+                        if poster is not owner:
+                            poster._open_tab(owner)
+                        poster.page.goto(poster.LOGIN_URL, wait_until='commit', timeout=60000)
+                        active.append(poster)
+                    except Exception as e:
+                        poster._record_error(results[poster.PLATFORM_NAME], e)
+
+            # ===== Phase 2: sessions, une fois toutes les pages chargées =====
+            logged_in = []
+            for poster in active:
+                with poster._job_context():
+                    try:
+                        with poster._step('open_login_url'):
+                            poster.page.wait_for_load_state('domcontentloaded', timeout=60000)
+                        poster._ensure_logged_in()
+                        logged_in.append(poster)
+                    except Exception as e:
+                        poster._record_error(results[poster.PLATFORM_NAME], e)
+
+            # ===== Phase 3: préparation, uploads lancés sans les attendre =====
+            # L'API synchrone pilote un onglet à la fois: la saisie reste
+            # séquentielle, mais chaque upload continue dans son onglet
+            # pendant que les suivants se préparent.
+            prepared = []
+            for poster in logged_in:
+                with poster._job_context():
+                    poster.defer_media_wait = True
+                    try:
+                        poster._run_step('prepare', poster._prepare_post, text, image_path, video_path)
+                        prepared.append(poster)
+                    except Exception as e:
+                        poster._record_error(results[poster.PLATFORM_NAME], e)
+                    finally:
+                        poster.defer_media_wait = False
+
+            # Fin des uploads: une seule attente, celle de l'upload le plus long
+            for poster in prepared:
+                with poster._job_context(), poster._step('upload_wait'):
+                    poster._settle_media()
+
+            # ===== Phase 4: envois sérialisés et espacés =====
+            for i, poster in enumerate(prepared):
+                result = results[poster.PLATFORM_NAME]
+                if i:
+                    time.sleep(self.submit_interval * random.uniform(1, 1.5) * poster.delay_scale)
+                with poster._job_context():
+                    try:
+                        self._wait_for_token(poster)
+                        poster.page.bring_to_front()
+                        poster._publish(text, image_path, video_path, prepared=True)
+                        result['success'] = True
+                        logger.info(f"✅ Publication réussie sur {poster.PLATFORM_NAME}")
+                    except Exception as e:
+                        poster._record_error(result, e)
+                        if self.limiter and not poster._submitted:
+                            self.limiter.refund(poster.PLATFORM_NAME, poster.account.name)
+        finally:
+            # Les onglets d'abord, puis le contexte (propriétaire)
+            for poster in self.posters:
+                if poster is not owner:
+                    poster._finalize(results[poster.PLATFORM_NAME])
+            owner._finalize(results[owner.PLATFORM_NAME])
+
+        return results
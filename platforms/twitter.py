@@ -5,11 +5,13 @@ Module pour publier automatiquement sur X (Twitter).
 Gestion améliorée du flow Google OAuth avec sélection de compte.
 """
 
-import os
 import time
 from pathlib import Path
 from .base import BasePoster, PostContent
+from .capabilities import BUILTIN_CAPABILITIES
+from utils.helpers import split_text_for_platform
 from utils.logger import get_logger
+from utils.retry import TransientError
 
 logger = get_logger(__name__)
 
@@ -21,59 +23,81 @@ class TwitterPoster(BasePoster):
     LOGIN_URL = "https://x.com/i/flow/login"
     HOME_URL = "https://x.com/home"
     
-    def __init__(self, headless: bool = True):
-        super().__init__(headless)
-        self.username = os.getenv('TWITTER_USER')
-        self.password = os.getenv('TWITTER_PASS')
-        self.email = os.getenv('TWITTER_EMAIL', self.username)
-        # Google credentials for OAuth login
-        self.google_email = os.getenv('GOOGLE_EMAIL')
-        self.google_password = os.getenv('GOOGLE_PASS')
+    CAPABILITIES = BUILTIN_CAPABILITIES['twitter']
     
-    def _handle_cookie_popup(self) -> bool:
-        """Gère les popups de cookies X."""
-        cookie_selectors = [
+    # Sélecteurs par élément, du plus fiable au plus large (évalués hors ligne
+    # sur les instantanés DOM: python main.py --selectors snapshots/)
+    SELECTORS = {
+        'cookie': (
             '[data-testid="cookie-banner-accept"]',
             'button:has-text("Accept all cookies")',
             'button:has-text("Accepter tous les cookies")',
             'button:has-text("Accept")',
             'button:has-text("Accepter")',
             '[aria-label="Accept all cookies"]',
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                btn = self.page.locator(selector).first
-                if btn.is_visible(timeout=2000):
-                    btn.click(force=True)
-                    self._random_delay(1, 2)
-                    logger.info("Popup cookies X fermé")
-                    return True
-            except:
-                continue
-        return False
-    
-    def _dismiss_popups(self):
-        """Ferme les popups X courants."""
-        self._handle_cookie_popup()
-        
-        popups = [
+        ),
+        'popup': (
             'div[data-testid="confirmationSheetConfirm"]',
             '[aria-label="Close"]',
             '[aria-label="Fermer"]',
             'button:has-text("Not now")',
             'button:has-text("Pas maintenant")',
             '[data-testid="app-bar-close"]',
-        ]
-        
-        for popup_selector in popups:
-            try:
-                popup = self.page.locator(popup_selector).first
-                if popup.is_visible(timeout=1000):
-                    popup.click(force=True)
-                    self._random_delay(0.5, 1)
-            except:
-                continue
+        ),
+        'logged_in': (
+            '[data-testid="SideNav_NewTweet_Button"]',
+            '[aria-label="Post"]',
+            '[data-testid="tweetTextarea_0"]',
+            '[data-testid="primaryColumn"]',
+        ),
+        'google_button': (
+            'button:has-text("Sign in with Google")',
+            'button:has-text("Sign up with Google")',
+            'button:has-text("Continue with Google")',
+            '[data-provider="google"]',
+            'button[aria-label*="Google"]',
+            'div[role="button"]:has-text("Google")',
+        ),
+        'text_area': (
+            '[data-testid="tweetTextarea_0"]',
+            'div[contenteditable="true"][role="textbox"]',
+        ),
+        'new_tweet': (
+            '[data-testid="SideNav_NewTweet_Button"]',
+        ),
+        'first_tweet': (
+            '[data-testid="tweetTextarea_0"]',
+        ),
+        'publish': (
+            '[data-testid="tweetButton"]',
+            '[data-testid="tweetButtonInline"]',
+        ),
+        # Bannière de cookies seule (sans "Accept" générique, qui pourrait
+        # accepter autre chose qu'un consentement)
+        'cookie_banner': (
+            '[data-testid="cookie-banner-accept"]',
+            'button:has-text("Accept all cookies")',
+            'button:has-text("Accepter tous les cookies")',
+            '[aria-label="Accept all cookies"]',
+        ),
+        # Interruptions sans risque (enregistrer la connexion, notifications...)
+        'interruptions': (
+            'button:has-text("Not now")',
+            'button:has-text("Pas maintenant")',
+        ),
+    }
+    
+    # Fermés en arrière-plan dès leur apparition (platforms.watchdog)
+    WATCHDOG = ('cookie_banner', 'interruptions')
+    
+    def __init__(self, headless: bool = True, **kwargs):
+        super().__init__(headless, **kwargs)
+        self.username = self._credential('username', 'TWITTER_USER')
+        self.password = self._credential('password', 'TWITTER_PASS')
+        self.email = self._credential('email', 'TWITTER_EMAIL', self.username)
+        # Google credentials for OAuth login
+        self.google_email = self._credential('google_email', 'GOOGLE_EMAIL')
+        self.google_password = self._credential('google_password', 'GOOGLE_PASS')
     
     def _check_logged_in(self) -> bool:
         """Vérifie si on est connecté à X."""
@@ -87,14 +111,7 @@ class TwitterPoster(BasePoster):
             if 'login' in current_url or 'flow' in current_url:
                 return False
             
-            indicators = [
-                '[data-testid="SideNav_NewTweet_Button"]',
-                '[aria-label="Post"]',
-                '[data-testid="tweetTextarea_0"]',
-                '[data-testid="primaryColumn"]',
-            ]
-            
-            for indicator in indicators:
+            for indicator in self.SELECTORS['logged_in']:
                 try:
                     if self.page.locator(indicator).count() > 0:
                         return True
@@ -131,26 +148,7 @@ class TwitterPoster(BasePoster):
         try:
             logger.info("🔍 Recherche du bouton 'Sign in with Google'...")
             
-            google_btn_selectors = [
-                'button:has-text("Sign in with Google")',
-                'button:has-text("Sign up with Google")',
-                'button:has-text("Continue with Google")',
-                '[data-provider="google"]',
-                'button[aria-label*="Google"]',
-                'div[role="button"]:has-text("Google")',
-            ]
-            
-            google_btn = None
-            for selector in google_btn_selectors:
-                try:
-                    btn = self.page.locator(selector).first
-                    if btn.is_visible(timeout=3000):
-                        google_btn = btn
-                        logger.info(f"✅ Bouton Google trouvé: {selector}")
-                        break
-                except:
-                    continue
-            
+            google_btn = self._run_flow('google_button')
             if not google_btn:
                 logger.info("❌ Bouton Google non trouvé")
                 return False
@@ -352,49 +350,62 @@ class TwitterPoster(BasePoster):
             logger.error(f"Erreur connexion X: {e}")
             return False
     
-    def _publish(self, text: str, image_path: str = None, video_path: str = None) -> bool:
-        """Publie un tweet."""
+    def _add_thread_part(self, index: int, text: str):
+        """Ajoute un tweet au thread en cours de composition."""
+        self.page.locator('[data-testid="addButton"]').first.click()
+        self._random_delay(1, 2)
+        
+        text_area = self.page.locator(f'[data-testid="tweetTextarea_{index}"]').first
+        text_area.wait_for(state='visible', timeout=10000)
+        text_area.click()
+        self._random_delay(0.5, 1)
+        text_area.type(text, delay=15)
+        self._random_delay(1, 2)
+    
+    def _prepare_post(self, text: str, image_path: str = None, video_path: str = None):
+        """Ouvre le composeur, saisit le tweet (ou le thread) et ajoute l'image."""
+        # Texte long: thread numéroté, composé en une seule fois
+        parts = split_text_for_platform(text, self.PLATFORM_NAME)
+        
         try:
-            logger.info("Publication sur X...")
+            logger.info("Publication sur X..." if len(parts) == 1 else f"Publication d'un thread de {len(parts)} tweets sur X...")
             
             self.page.goto(self.HOME_URL, wait_until='domcontentloaded', timeout=30000)
             self._random_delay(2, 3)
             self._dismiss_popups()
             
-            text_area = None
-            for selector in ['[data-testid="tweetTextarea_0"]', 'div[contenteditable="true"][role="textbox"]']:
-                try:
-                    area = self.page.locator(selector).first
-                    if area.is_visible(timeout=5000):
-                        text_area = area
-                        break
-                except:
-                    continue
-            
-            if not text_area:
-                self.page.locator('[data-testid="SideNav_NewTweet_Button"]').first.click()
-                self._random_delay(2, 3)
-                text_area = self.page.locator('[data-testid="tweetTextarea_0"]').first
+            text_area = self._run_flow('open_composer')
             
             text_area.click()
             self._random_delay(0.5, 1)
-            text_area.type(text, delay=15)
+            text_area.type(parts[0], delay=15)
             self._random_delay(2, 3)
             
+            # L'image accompagne le premier tweet
             if image_path and Path(image_path).exists():
                 try:
                     self.page.locator('input[type="file"][accept*="image"]').first.set_input_files(image_path)
-                    self._random_delay(3, 5)
+                    self._wait_for_media(3, 5)
                     logger.info("Image ajoutée")
                 except:
                     pass
             
-            self.page.locator('[data-testid="tweetButton"], [data-testid="tweetButtonInline"]').first.click()
-            self._random_delay(3, 5)
-            
-            logger.info("✅ Tweet publié")
-            return True
+            for index, part in enumerate(parts[1:], 1):
+                self._add_thread_part(index, part)
             
         except Exception as e:
-            logger.error(f"Erreur publication X: {e}")
-            return False
\ No newline at end of file
+            logger.error(f"Erreur préparation X: {e}")
+            raise
+    
+    def _submit_post(self):
+        """Clique sur Poster."""
+        button = self.page.locator(', '.join(self.SELECTORS['publish'])).first
+        try:
+            button.click()
+        except Exception as e:
+            raise TransientError(f"Bouton Poster non cliquable: {e}")
+        
+        self._mark_submitted()
+        self._random_delay(3, 5)
+        
+        logger.info("✅ Tweet publié")
\ No newline at end of file
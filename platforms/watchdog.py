@@ -0,0 +1,168 @@
+"""
+Budget Famille - Popup Watchdog
+================================
+Fermeture en arrière-plan des bannières de cookies et des interruptions
+("Pas maintenant", activation des notifications...).
+
+Au lieu de sonder 5 à 15 sélecteurs avec 1 à 2 s d'attente à chaque étape,
+le poster installe une fois par page:
+- des locator handlers Playwright (page.add_locator_handler, Playwright
+  1.42+): le popup est fermé dès qu'il bloque une action;
+- sinon un MutationObserver injecté dans la page (add_init_script), qui
+  clique le bouton dès qu'il apparaît dans le DOM.
+
+Seuls les groupes de SELECTORS listés dans WATCHDOG du poster sont
+surveillés: des boutons sans risque (cookies, "Pas maintenant"), jamais un
+"Fermer" générique qui pourrait fermer le composeur.
+"""
+
+import os
+import re
+import json
+from typing import Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_HAS_TEXT = re.compile(r'^(.*?):has-text\("([^"]+)"\)$')
+_TEXT_IS = re.compile(r'^(.*?):text-is\("([^"]+)"\)$')
+
+# Observateur installé à chaque navigation; règles: [{css, text, exact}]
+OBSERVER_SCRIPT = """
+(() => {
+    const rules = %(rules)s;
+    if (window.__bfWatchdog) return;
+    window.__bfWatchdog = {clicks: 0};
+    const clicked = new WeakSet();
+
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (!rect.width || !rect.height) return false;
+        return el.checkVisibility ? el.checkVisibility({opacityProperty: true, visibilityProperty: true}) : true;
+    };
+    const textMatches = (el, rule) => {
+        if (!rule.text) return true;
+        const text = (el.textContent || '').trim().toLowerCase();
+        return rule.exact ? text === rule.text : text.includes(rule.text);
+    };
+
+    const sweep = () => {
+        for (const rule of rules) {
+            let matches;
+            try {
+                matches = [...document.querySelectorAll(rule.css)].filter(el => textMatches(el, rule));
+            } catch (e) {
+                continue;
+            }
+            // Élément le plus profond (pas un conteneur du vrai bouton)
+            const target = matches.find(el => !clicked.has(el) && visible(el)
+                && !matches.some(other => other !== el && el.contains(other)));
+            if (target) {
+                clicked.add(target);
+                target.click();
+                window.__bfWatchdog.clicks += 1;
+                if (window.__bfWatchdogClicked) window.__bfWatchdogClicked(rule.source);
+            }
+        }
+    };
+
+    let pending = false;
+    const schedule = () => {
+        if (pending) return;
+        pending = true;
+        setTimeout(() => { pending = false; sweep(); }, 50);
+    };
+
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement,
+            {childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class', 'hidden']});
+        schedule();
+    };
+    if (document.documentElement) start();
+    else document.addEventListener('DOMContentLoaded', start);
+})()
+"""
+
+
+def watchdog_enabled() -> bool:
+    """Surveillance des popups en arrière-plan (POPUP_WATCHDOG, défaut: true)."""
+    return os.getenv('POPUP_WATCHDOG', 'true').lower() == 'true'
+
+
+def observer_rule(selector: str) -> Optional[Dict[str, object]]:
+    """
+    Traduit un sélecteur Playwright en règle pour l'observateur (CSS + texte).
+
+    Returns:
+        {'css', 'text', 'exact', 'source'}, None si le sélecteur n'a pas
+        d'équivalent CSS (text=..., xpath, chaînes >>)
+    """
+    if selector.startswith(('text=', 'xpath=', '//')) or '>>' in selector:
+        return None
+
+    for pattern, exact in ((_TEXT_IS, True), (_HAS_TEXT, False)):
+        match = pattern.match(selector)
+        if match:
+            css, text = match.groups()
+            if ':has-text(' in css or ':text-is(' in css:
+                return None
+            return {'css': css or '*', 'text': text.lower(), 'exact': exact, 'source': selector}
+
+    if ':has-text(' in selector or ':text-is(' in selector:
+        return None
+    return {'css': selector, 'text': '', 'exact': False, 'source': selector}
+
+
+def observer_rules(groups: Dict[str, Tuple[str, ...]]) -> List[Dict[str, object]]:
+    return [rule for selectors in groups.values() for rule in map(observer_rule, selectors) if rule]
+
+
+def install_watchdog(page, groups: Dict[str, Tuple[str, ...]], label: str = '') -> Optional[str]:
+    """
+    Installe la surveillance des popups sur une page.
+
+    Args:
+        page: Page Playwright (à appeler une seule fois par page)
+        groups: Groupes de sélecteurs à fermer ({'cookie': (...)})
+        label: Plateforme, pour les logs
+
+    Returns:
+        'handlers', 'observer', ou None si rien n'a pu être installé
+    """
+    if not groups:
+        return None
+
+    try:
+        if hasattr(page, 'add_locator_handler'):
+            for name, selectors in groups.items():
+                combined = None
+                for selector in selectors:
+                    locator = page.locator(f"{selector} >> visible=true")
+                    combined = locator if combined is None else combined.or_(locator)
+
+                def dismiss(*args, name=name, combined=combined):
+                    try:
+                        combined.first.dispatch_event('click')
+                        logger.info(f"🐕 Popup fermé ({label}/{name})")
+                    except Exception as e:
+                        logger.debug(f"Watchdog {label}/{name}: {e}")
+
+                page.add_locator_handler(combined, dismiss)
+            return 'handlers'
+
+        rules = observer_rules(groups)
+        if not rules:
+            return None
+        page.expose_function(
+            '__bfWatchdogClicked',
+            lambda source: logger.info(f"🐕 Popup fermé ({label}: {source})"),
+        )
+        script = OBSERVER_SCRIPT % {'rules': json.dumps(rules, ensure_ascii=False)}
+        page.add_init_script(script)
+        # Page déjà chargée (contexte persistant): installation immédiate
+        page.evaluate(script)
+        return 'observer'
+    except Exception as e:
+        logger.warning(f"⚠️ Surveillance des popups indisponible ({label}): {e}")
+        return None
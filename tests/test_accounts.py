@@ -0,0 +1,115 @@
+"""
+Tests - Comptes
+================
+Registre des comptes, variables d'environnement et dossiers de profil.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import utils.accounts as accounts
+from utils.accounts import (
+    DEFAULT_ACCOUNT, Account, _expand, get_account, job_key, load_accounts, resolve_accounts,
+)
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    # Chaque test repart d'un registre vide
+    monkeypatch.setattr(accounts, '_registry', None)
+
+
+def write_accounts(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path
+
+
+def test_expand_reads_environment(monkeypatch):
+    monkeypatch.setenv('BF_PASS', 'secret')
+    monkeypatch.delenv('BF_ABSENT', raising=False)
+    value = {'password': '${BF_PASS}', 'list': ['a-${BF_PASS}', '${BF_ABSENT}'], 'port': 8080}
+    assert _expand(value) == {'password': 'secret', 'list': ['a-secret', ''], 'port': 8080}
+
+
+def test_load_accounts_parses_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv('BF_LINKEDIN_PASS', 'secret')
+    path = write_accounts(tmp_path / 'accounts.json', {
+        'budgetfamille': {
+            'linkedin': {'email': 'contact@budgetfamille.com', 'password': '${BF_LINKEDIN_PASS}'},
+            'proxy': {'server': 'http://proxy-1:8080'},
+            'rate_limits': {'linkedin': {'burst': 1, 'per_hour': 2}},
+        },
+    })
+
+    registry = load_accounts(path)
+    account = registry['budgetfamille']
+    assert DEFAULT_ACCOUNT in registry
+    assert account.credential('linkedin', 'password') == 'secret'
+    assert account.has_platform('linkedin') and not account.has_platform('twitter')
+    assert account.proxy == {'server': 'http://proxy-1:8080'}
+    assert account.rate_limits == {'linkedin': {'burst': 1, 'per_hour': 2}}
+
+
+def test_explicit_path_does_not_replace_registry(tmp_path, monkeypatch):
+    monkeypatch.setenv('ACCOUNTS_FILE', str(tmp_path / 'absent.json'))
+    other = write_accounts(tmp_path / 'autres.json', {'marque': {'twitter': {'username': 'marque'}}})
+
+    assert 'marque' in load_accounts(other)
+    with pytest.raises(KeyError):
+        get_account('marque')
+    assert get_account().is_default
+
+
+def test_default_account_uses_environment(monkeypatch):
+    monkeypatch.setenv('TWITTER_USER', 'budgetfamille')
+    account = Account(DEFAULT_ACCOUNT)
+    assert account.credential('twitter', 'username', 'TWITTER_USER') == 'budgetfamille'
+    assert account.has_platform('instagram')
+
+
+def test_resolve_accounts():
+    assert resolve_accounts({'accounts': ['a', 'b']}) == ['a', 'b']
+    assert resolve_accounts({'accounts': ['a', 'b']}, account='c') == ['c']
+    assert resolve_accounts({}) == [DEFAULT_ACCOUNT]
+    assert job_key('linkedin', DEFAULT_ACCOUNT) == 'linkedin'
+    assert job_key('linkedin', 'marque') == 'linkedin@marque'
+
+
+def test_data_dir_is_distinct_per_platform(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_DATA_DIR', str(tmp_path))
+    default = Account(DEFAULT_ACCOUNT)
+    brand = Account('marque', credentials={})
+
+    folders = {default.data_dir('facebook'), default.data_dir('instagram'), default.data_dir(),
+               brand.data_dir('facebook'), brand.data_dir()}
+    assert len(folders) == 5
+    assert brand.data_dir() == tmp_path / 'marque' / 'tabs'
+    custom = Account('perso', credentials={}, browser_data_dir='/profils')
+    assert custom.data_dir('twitter') == Path('/profils') / 'twitter'
+
+
+def test_data_dir_copies_legacy_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_DATA_DIR', str(tmp_path))
+    (tmp_path / 'Default').mkdir()
+    (tmp_path / 'Default' / 'Cookies').write_bytes(b'cookies')
+    (tmp_path / 'Local State').write_text('{}', encoding='utf-8')
+    (tmp_path / 'SingletonLock').write_text('', encoding='utf-8')
+
+    folder = Account(DEFAULT_ACCOUNT).data_dir('facebook')
+
+    assert (folder / 'Default' / 'Cookies').read_bytes() == b'cookies'
+    assert (folder / 'Local State').exists()
+    assert not (folder / 'SingletonLock').exists()
+    # Copie faite une seule fois: le profil de la plateforme vit ensuite sa vie
+    (folder / 'Default' / 'Cookies').write_bytes(b'nouveaux')
+    Account(DEFAULT_ACCOUNT).data_dir('facebook')
+    assert (folder / 'Default' / 'Cookies').read_bytes() == b'nouveaux'
+
+
+def test_data_dir_without_legacy_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_DATA_DIR', str(tmp_path))
+    folder = Account(DEFAULT_ACCOUNT).data_dir('twitter')
+    assert folder == tmp_path / 'twitter'
+    assert not folder.exists()
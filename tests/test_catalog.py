@@ -0,0 +1,120 @@
+"""
+Tests - Catalogue
+==================
+Validation des lignes de calendrier, empreintes et import dans le catalogue.
+"""
+
+import json
+
+import pytest
+
+from utils.catalog import (
+    catalog_path, content_hash, file_hash, find_catalog_post, import_calendar,
+    parse_row, read_catalog,
+)
+
+
+def write_jsonl(path, rows):
+    path.write_text(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows), encoding='utf-8')
+    return path
+
+
+def test_content_hash_normalizes_whitespace():
+    assert content_hash("Astuce  du\njour") == content_hash(" Astuce du jour ")
+    assert content_hash("Astuce du jour") != content_hash("Astuce du soir")
+
+
+def test_content_hash_includes_media(tmp_path):
+    image = tmp_path / 'a.jpg'
+    image.write_bytes(b'image-a')
+    other = tmp_path / 'b.jpg'
+    other.write_bytes(b'image-b')
+
+    assert content_hash("Texte", str(image)) != content_hash("Texte")
+    assert content_hash("Texte", str(image)) != content_hash("Texte", str(other))
+    # La même image en vidéo ne donne pas la même empreinte
+    assert content_hash("Texte", str(image)) != content_hash("Texte", None, str(image))
+
+
+def test_file_hash_uses_cache(tmp_path):
+    image = tmp_path / 'a.jpg'
+    image.write_bytes(b'image-a')
+    cache = {}
+
+    digest = file_hash(str(image), cache)
+    image.write_bytes(b'modifiee')
+    assert file_hash(str(image), cache) == digest
+    assert file_hash(str(image)) != digest
+
+
+def test_parse_row_resolves_media_and_lists(tmp_path):
+    (tmp_path / 'a.jpg').write_bytes(b'image')
+    post = parse_row({
+        'caption': ' Astuce ', 'image': 'a.jpg', 'platforms': 'linkedin;twitter',
+        'accounts': 'pro', 'schedule': '2025-03-01T09:00:00',
+    }, tmp_path)
+
+    assert post['text'] == 'Astuce'
+    assert post['date'] is None
+    assert post['image'] == str((tmp_path / 'a.jpg').resolve())
+    assert post['video'] is None
+    assert post['platforms'] == ['linkedin', 'twitter']
+    assert post['accounts'] == ['pro']
+    assert post['schedule'] == '2025-03-01T09:00:00'
+
+
+@pytest.mark.parametrize('row, message', [
+    ({'text': '  '}, 'texte vide'),
+    ({'text': 'Astuce', 'image': 'absente.jpg'}, 'image introuvable'),
+    ({'text': 'Astuce', 'platforms': 'linkedin;myspace'}, 'plateforme inconnue: myspace'),
+    ({'text': 'Astuce', 'schedule': 'demain'}, 'schedule invalide'),
+])
+def test_parse_row_rejects_invalid_rows(tmp_path, row, message):
+    with pytest.raises(ValueError, match=message):
+        parse_row(row, tmp_path)
+
+
+def test_import_calendar(tmp_path):
+    posts = tmp_path / 'posts'
+    (posts / '2025-03-05').mkdir(parents=True)
+    calendar = write_jsonl(tmp_path / 'calendrier.jsonl', [
+        {'date': '2025-03-01', 'text': 'Premier post'},
+        {'text': 'Deuxième post', 'schedule': '2025-03-02T08:00:00'},
+        {'date': '2025-03-03', 'text': 'Premier   post'},
+        {'date': '2025-03-04', 'text': ''},
+        {'date': '2025-03-05', 'text': 'Dossier existant'},
+    ])
+
+    report = import_calendar(calendar, posts)
+
+    second_hash = content_hash('Deuxième post')
+    assert report['imported'] == ['2025-03-01', f"2025-03-02-{second_hash[:8]}"]
+    assert report['duplicates'] == ['2025-03-03']
+    assert [number for number, _ in report['errors']] == [4, 5]
+    assert 'identifiant déjà utilisé' in report['errors'][1][1]
+
+    catalog = list(read_catalog(posts))
+    assert [post['date'] for post in catalog] == report['imported']
+    assert catalog[1]['hash'] == second_hash
+    assert find_catalog_post(posts, '2025-03-01')['text'] == 'Premier post'
+    assert find_catalog_post(posts, '2025-03-09') is None
+
+
+def test_import_calendar_twice_only_reports_duplicates(tmp_path):
+    posts = tmp_path / 'posts'
+    calendar = write_jsonl(tmp_path / 'calendrier.jsonl', [
+        {'date': '2025-03-01', 'text': 'Premier post'},
+        {'date': '2025-03-02', 'text': 'Deuxième post'},
+    ])
+
+    import_calendar(calendar, posts)
+    report = import_calendar(calendar, posts)
+
+    assert report == {'imported': [], 'duplicates': ['2025-03-01', '2025-03-02'], 'errors': []}
+    assert len(list(read_catalog(posts))) == 2
+
+
+def test_read_catalog_skips_unreadable_lines(tmp_path):
+    assert list(read_catalog(tmp_path)) == []
+    catalog_path(tmp_path).write_text('{"date": "a", "text": "x"}\n\n{oops\n', encoding='utf-8')
+    assert [post['date'] for post in read_catalog(tmp_path)] == ['a']
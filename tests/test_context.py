@@ -0,0 +1,71 @@
+"""
+Tests - Log Context
+====================
+Contexte par contextvars: imbrication, libellés, propagation aux workers.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import utils.context as context
+from utils.context import (
+    RUN_ID, ContextFilter, context_label, current_context, job_id, log_context, submit_in_context,
+)
+
+
+def test_run_id_always_present():
+    assert current_context() == {'run_id': RUN_ID}
+
+
+def test_nested_context_is_restored():
+    with log_context(post='2026-01-15'):
+        with log_context(platform='linkedin', account=None):
+            assert current_context() == {'run_id': RUN_ID, 'post': '2026-01-15', 'platform': 'linkedin'}
+        assert current_context() == {'run_id': RUN_ID, 'post': '2026-01-15'}
+    assert current_context() == {'run_id': RUN_ID}
+
+
+def test_job_id():
+    assert job_id('2026-01-15', 'linkedin', 'pro') == "2026-01-15:linkedin@pro"
+
+
+def test_context_label_sanitizes():
+    with log_context(post='2026-01-15', account='Jean Dupont/pro'):
+        assert context_label('run_id', 'platform', 'account') == f"{RUN_ID}_Jean-Dupont-pro"
+
+
+def test_plain_submit_does_not_inherit():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with log_context(post='2026-01-15'):
+            assert executor.submit(current_context).result() == {'run_id': RUN_ID}
+
+
+def test_submit_in_context_propagates():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with log_context(post='2026-01-15'):
+            first = submit_in_context(executor, current_context)
+        with log_context(post='2026-01-16', platform='twitter'):
+            second = submit_in_context(executor, lambda key: current_context()[key], key='platform')
+
+        assert first.result() == {'run_id': RUN_ID, 'post': '2026-01-15'}
+        assert second.result() == 'twitter'
+
+
+def test_submitted_task_does_not_leak():
+    def task():
+        # Contexte laissé ouvert (set direct): il ne vit que dans la copie
+        context._context.set({**context._context.get(), 'step': 'upload'})
+        return current_context()['step']
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with log_context(post='2026-01-15'):
+            assert submit_in_context(executor, task).result() == 'upload'
+            assert current_context() == {'run_id': RUN_ID, 'post': '2026-01-15'}
+
+
+def test_filter_keeps_explicit_extra():
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, "message", None, None)
+    record.platform = 'facebook'
+    with log_context(post='2026-01-15', platform='linkedin'):
+        ContextFilter().filter(record)
+    assert (record.run_id, record.post, record.platform) == (RUN_ID, '2026-01-15', 'facebook')
@@ -0,0 +1,104 @@
+"""
+Tests - Dedup
+==============
+Empreintes, signatures MinHash et index des publications.
+"""
+
+import pytest
+
+from utils.dedup import DedupIndex, minhash, normalize_text, similarity, text_hash
+
+TEXT = ("Astuce du jour: faites la liste des abonnements de la famille, "
+        "résiliez ceux qui ne servent plus et placez l'économie sur le livret A.")
+
+
+def post(post_id, text=TEXT, **media):
+    return {'date': post_id, 'text': text, **media}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(tmp_path / 'dedup.db', threshold=0.8)
+    yield index
+    index.close()
+
+
+def test_normalize_text():
+    assert normalize_text("  Astuce DU\n jour ") == 'astuce du jour'
+    assert text_hash("Astuce du jour") == text_hash("ASTUCE  du jour")
+
+
+def test_similarity_of_signatures():
+    signature = minhash(TEXT)
+    assert similarity(signature, minhash(TEXT.upper())) == 1.0
+    assert similarity(signature, minhash(TEXT.replace('livret A', 'livret A !'))) >= 0.8
+    assert similarity(signature, minhash("Recette du dimanche: un gratin de légumes de saison.")) < 0.2
+
+
+def test_short_texts_have_signature():
+    assert len(minhash("Bonjour")) == len(minhash(TEXT))
+
+
+def test_plan_reserves_post_in_same_run(index):
+    assert index.plan(post('2025-03-01'), 'linkedin', 'default') is None
+    assert index.plan(post('2025-03-02'), 'linkedin', 'default') == 'doublon de 2025-03-01'
+    # Autre plateforme ou autre compte: pas de doublon
+    assert index.plan(post('2025-03-02'), 'twitter', 'default') is None
+    assert index.plan(post('2025-03-02'), 'linkedin', 'pro') is None
+
+
+def test_record_is_persisted(tmp_path, index):
+    index.record(post('2025-03-01'), 'linkedin', 'default')
+    index.close()
+
+    reopened = DedupIndex(tmp_path / 'dedup.db', threshold=0.8)
+    assert reopened.find_duplicate(post('2025-03-01'), 'linkedin', 'default') == 'déjà publié'
+    assert reopened.find_duplicate(post('2025-03-09'), 'linkedin', 'default') == 'doublon de 2025-03-01'
+    reopened.close()
+
+
+def test_near_duplicate_threshold(index):
+    index.record(post('2025-03-01'), 'linkedin', 'default')
+    near = post('2025-03-02', TEXT.replace('livret A', 'livret A !'))
+
+    reason = index.find_duplicate(near, 'linkedin', 'default')
+    assert reason.startswith('quasi-doublon de 2025-03-01')
+
+    index.threshold = 1.01
+    assert index.find_duplicate(near, 'linkedin', 'default') is None
+
+
+def test_media_distinguishes_posts(tmp_path, index):
+    first = tmp_path / 'a.jpg'
+    first.write_bytes(b'image-a')
+    second = tmp_path / 'b.jpg'
+    second.write_bytes(b'image-b')
+
+    index.record(post('2025-03-01', image=str(first)), 'instagram', 'default')
+    assert index.find_duplicate(post('2025-03-02', image=str(second)), 'instagram', 'default') is None
+    assert index.find_duplicate(post('2025-03-03'), 'instagram', 'default') is None
+    assert index.find_duplicate(post('2025-03-04', image=str(first)), 'instagram', 'default') == 'doublon de 2025-03-01'
+
+
+def test_read_only_does_not_create_database(tmp_path):
+    path = tmp_path / 'data' / 'dedup.db'
+    index = DedupIndex(path, read_only=True)
+
+    assert index.plan(post('2025-03-01'), 'linkedin', 'default') is None
+    assert index.plan(post('2025-03-02'), 'linkedin', 'default') == 'doublon de 2025-03-01'
+    index.close()
+    assert not path.parent.exists()
+
+
+def test_read_only_reads_existing_database(tmp_path):
+    path = tmp_path / 'dedup.db'
+    writer = DedupIndex(path)
+    writer.record(post('2025-03-01'), 'linkedin', 'default')
+    writer.close()
+    before = path.read_bytes()
+
+    index = DedupIndex(path, read_only=True)
+    assert index.plan(post('2025-03-01'), 'linkedin', 'default') == 'déjà publié'
+    assert index.plan(post('2025-03-05', "Autre texte"), 'linkedin', 'default') is None
+    index.close()
+    assert path.read_bytes() == before
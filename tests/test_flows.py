@@ -0,0 +1,47 @@
+"""
+Tests - Flows
+==============
+Validation des parcours déclaratifs et chargement des fichiers intégrés.
+"""
+
+import re
+
+import pytest
+
+from platforms.flows import _validate, load_flows
+from platforms.registry import builtin_platforms
+
+
+def test_valid_steps_are_returned():
+    steps = [
+        {'click': 'cookie', 'method': 'force', 'timeout': 2000, 'optional': True, 'delay': [1, 2]},
+        {'js': "() => true", 'fallback': [{'wait_for_load': True}]},
+    ]
+    assert _validate(steps, 'test') is steps
+
+
+@pytest.mark.parametrize('steps, message', [
+    ({'click': 'cookie'}, "test: liste d'étapes attendue"),
+    (['click'], "test[0]: étape invalide"),
+    ([{'timeout': 2000}], "test[0]: une action parmi"),
+    ([{'click': 'cookie', 'find': 'editor'}], "test[0]: une action parmi"),
+    ([{'click': 'cookie', 'timout': 2000}], "test[0]: option inconnue timout"),
+    ([{'click': 'cookie', 'method': 'tap'}], "test[0]: method invalide (tap)"),
+    ([{'click': 'publish', 'fallback': [{'find': 'a'}, {'log': "sans action"}]}],
+     "test[0].fallback[1]: une action parmi"),
+])
+def test_invalid_steps(steps, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        _validate(steps, 'test')
+
+
+@pytest.mark.parametrize('platform', builtin_platforms())
+def test_builtin_flows_are_valid(platform):
+    flows = load_flows(platform)
+    assert flows
+    assert all(isinstance(steps, list) for steps in flows.values())
+
+
+def test_missing_flow_file():
+    with pytest.raises(FileNotFoundError):
+        load_flows('myspace')
@@ -0,0 +1,130 @@
+"""
+Tests - Logger
+===============
+Formatters, rétention des fichiers et capture des logs par job.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+from utils.context import log_context
+from utils.logger import (
+    CompactFormatter, DailyRotatingFileHandler, JsonFormatter, LogCapture, get_logger,
+)
+
+logger = get_logger('tests.logger')
+
+
+@pytest.fixture(autouse=True)
+def debug_level(caplog):
+    # Les jobs capturent le DEBUG (setup_logger met le logger principal à DEBUG)
+    with caplog.at_level(logging.DEBUG, logger='budgetfamille-bot'):
+        yield
+
+
+def make_record(message='Publication réussie', level=logging.INFO, **fields):
+    record = logging.LogRecord('budgetfamille-bot.platforms.linkedin', level, __file__, 1, message, None, None)
+    for field, value in fields.items():
+        setattr(record, field, value)
+    return record
+
+
+def test_json_formatter_includes_context():
+    record = make_record(run_id='a1b2c3d4', post='2025-01-20', platform='linkedin', step=None)
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry['msg'] == 'Publication réussie'
+    assert entry['level'] == 'INFO'
+    assert entry['post'] == '2025-01-20' and entry['platform'] == 'linkedin'
+    assert 'step' not in entry
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError('texte vide')
+    except ValueError:
+        record = logging.LogRecord('x', logging.ERROR, __file__, 1, 'Échec', None, sys.exc_info())
+    entry = json.loads(JsonFormatter().format(record))
+    assert 'ValueError: texte vide' in entry['exc']
+
+
+@pytest.mark.parametrize('fields, tag', [
+    ({'platform': 'linkedin', 'account': 'default'}, '[linkedin] '),
+    ({'platform': 'linkedin', 'account': 'marque'}, '[linkedin@marque] '),
+    ({}, ''),
+])
+def test_compact_formatter_tag(fields, tag):
+    line = CompactFormatter(color=False).format(make_record(**fields))
+    assert line.endswith(f" I {tag}Publication réussie")
+
+
+def test_daily_handler_purges_old_files_on_open(tmp_path):
+    old = tmp_path / '2024-01-01.jsonl'
+    old.write_text('{}\n', encoding='utf-8')
+    mtime = time.time() - 40 * 86400
+    os.utime(old, (mtime, mtime))
+    recent = tmp_path / '2024-12-31.jsonl.1'
+    recent.write_text('{}\n', encoding='utf-8')
+
+    handler = DailyRotatingFileHandler(tmp_path, retention_days=30)
+    handler.close()
+
+    assert not old.exists() and recent.exists()
+    assert handler.baseFilename.endswith(f"{datetime.now():%Y-%m-%d}.jsonl")
+
+
+def test_capture_is_bounded():
+    with LogCapture(size=3) as capture:
+        for i in range(5):
+            logger.debug(f"étape {i}")
+
+    assert [entry['message'] for entry in capture.captured] == ['étape 2', 'étape 3', 'étape 4']
+
+
+def test_capture_ignores_other_jobs():
+    logger.info("avant le job")
+    with LogCapture(size=10) as capture:
+        logger.info("pendant le job")
+    logger.info("après le job")
+
+    assert [entry['message'] for entry in capture.captured] == ['pendant le job']
+
+
+def test_capture_accessors_return_dicts():
+    with LogCapture(size=10) as capture:
+        logger.info("info")
+        logger.warning("attention")
+        logger.error("erreur")
+
+    errors = capture.get_errors()
+    assert errors[0]['message'] == 'erreur' and errors[0]['level'] == 'ERROR'
+    assert isinstance(errors[0]['time'], datetime)
+    assert [entry['level'] for entry in capture.get_warnings()] == ['WARNING', 'ERROR']
+
+
+def test_capture_disabled():
+    with LogCapture(size=0) as capture:
+        logger.error("erreur")
+    assert capture.captured == []
+    assert capture.dump() is None
+
+
+def test_dump_writes_context_and_records(tmp_path):
+    with log_context(post='2025-01-20', platform='linkedin'):
+        with LogCapture(size=10) as capture:
+            with log_context(step='submit'):
+                logger.error("Bouton Publier introuvable")
+
+    path = capture.dump(tmp_path)
+    lines = [json.loads(line) for line in open(path, encoding='utf-8')]
+
+    assert '2025-01-20_linkedin' in path
+    assert lines[0]['context']['platform'] == 'linkedin'
+    assert lines[1]['msg'] == 'Bouton Publier introuvable'
+    assert lines[1]['step'] == 'submit'
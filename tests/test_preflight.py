@@ -0,0 +1,111 @@
+"""
+Tests - Preflight
+==================
+Verdicts (post, plateforme): texte, formats, taille, dimensions et vidéos.
+"""
+
+import pytest
+
+from platforms.capabilities import MB
+from platforms.registry import builtin_platforms
+from utils.preflight import (
+    PreflightReport, check_post_for_platform, read_media_info, resolve_platforms, run_preflight,
+)
+
+
+def post(**fields):
+    return {'date': '2026-01-15', 'text': "Bonjour", **fields}
+
+
+def test_unknown_platform():
+    assert check_post_for_platform(post(), 'myspace', {}) == ["plateforme inconnue"]
+
+
+def test_empty_text():
+    assert check_post_for_platform(post(text=""), 'linkedin', {}) == ["texte vide"]
+
+
+def test_text_only_post_is_publishable():
+    assert check_post_for_platform(post(), 'linkedin', {}) == []
+
+
+def test_instagram_requires_media():
+    assert check_post_for_platform(post(), 'instagram', {}) == ["média requis"]
+
+
+def test_thread_too_long():
+    text = "\n\n".join(f"Paragraphe {i} " + "x" * 250 for i in range(30))
+    reasons = check_post_for_platform(post(text=text), 'twitter', {})
+    assert len(reasons) == 1
+    assert reasons[0].startswith("thread de ") and reasons[0].endswith("> 25")
+
+
+def test_image_format_refused():
+    reasons = check_post_for_platform(post(image='photo.webp'), 'linkedin', {'photo.webp': {'size': 1}})
+    assert reasons == ["format image .webp refusé"]
+
+
+def test_image_read_error_is_reported():
+    info = {'photo.jpg': {'error': "fichier introuvable"}}
+    assert check_post_for_platform(post(image='photo.jpg'), 'linkedin', info) == ["fichier introuvable"]
+
+
+def test_image_too_heavy():
+    info = {'photo.jpg': {'size': 12 * MB}}
+    assert check_post_for_platform(post(image='photo.jpg'), 'linkedin', info) == ["image 12.0 Mo > 8 Mo"]
+
+
+@pytest.mark.parametrize('width, height, expected', [
+    (1080, 1080, []),
+    (200, 200, ["image 200x200 trop petite (min 320px)"]),
+    (1080, 1920, ["ratio 0.56 hors [0.8, 1.91]"]),
+])
+def test_instagram_image_dimensions(width, height, expected):
+    info = {'photo.jpg': {'size': MB, 'width': width, 'height': height}}
+    assert check_post_for_platform(post(image='photo.jpg'), 'instagram', info) == expected
+
+
+def test_video_limits():
+    info = {'clip.mp4': {'size': MB, 'duration': 300.0, 'codec': 'vp9'}}
+    reasons = check_post_for_platform(post(video='clip.mp4'), 'twitter', info)
+    assert reasons == ["vidéo 300s > 140s", "codec vp9 refusé"]
+
+
+def test_video_without_metadata_is_accepted():
+    # Sans ffprobe, seules l'extension et la taille sont vérifiables
+    assert check_post_for_platform(post(video='clip.mp4'), 'twitter', {'clip.mp4': {'size': MB}}) == []
+
+
+def test_report_matrix():
+    report = PreflightReport()
+    report.add('2026-01-15', 'linkedin', [])
+    report.add('2026-01-15', 'instagram', ["média requis"])
+    report.add('2026-01-16', 'linkedin', [])
+
+    assert report.platforms == ['linkedin', 'instagram']
+    assert report.reasons('2026-01-15', 'instagram') == ["média requis"]
+    assert report.reasons('2026-01-16', 'instagram') is None
+    assert report.publishable_platforms('2026-01-15') == ['linkedin']
+    assert report.failures() == [('2026-01-15', 'instagram', ["média requis"])]
+    assert report.publishable_count == 2
+
+
+def test_resolve_platforms():
+    assert resolve_platforms(post(platforms=['twitter']), 'linkedin') == ['linkedin']
+    assert resolve_platforms(post(platforms=['twitter'])) == ['twitter']
+    assert resolve_platforms(post()) == builtin_platforms()
+
+
+def test_read_media_info_missing_file(tmp_path):
+    assert read_media_info(str(tmp_path / 'absente.jpg'), 'image') == {'error': "fichier introuvable"}
+
+
+def test_run_preflight_reads_images(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    image = tmp_path / 'photo.png'
+    Image.new('RGB', (200, 200)).save(image)
+
+    report = run_preflight([post(image=str(image), platforms=['linkedin', 'instagram'])])
+
+    assert report.reasons('2026-01-15', 'linkedin') == []
+    assert report.reasons('2026-01-15', 'instagram') == ["image 200x200 trop petite (min 320px)"]
@@ -0,0 +1,138 @@
+"""
+Tests - Rate Limiter
+=====================
+Token buckets: rafale, recharge, remboursement et attente.
+"""
+
+import pytest
+
+import utils.ratelimit as ratelimit
+from utils.ratelimit import TokenBucketLimiter, bucket_settings
+
+
+class Clock:
+    """Horloge contrôlée par le test (remplace time.time du module)."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def limiter(tmp_path, monkeypatch, clock):
+    # Rafale de 2, un jeton toutes les 15 minutes
+    monkeypatch.setenv('LINKEDIN_RATE_BURST', '2')
+    monkeypatch.setenv('LINKEDIN_RATE_PER_HOUR', '4')
+    limiter = TokenBucketLimiter(tmp_path / 'ratelimit.db')
+    yield limiter
+    limiter.close()
+
+
+def test_bucket_settings_env_override(monkeypatch):
+    monkeypatch.setenv('TWITTER_RATE_BURST', '7')
+    monkeypatch.setenv('TWITTER_RATE_PER_HOUR', '0.5')
+    assert bucket_settings('twitter') == (7.0, 0.5)
+
+
+def test_bucket_settings_defaults_to_capabilities(monkeypatch):
+    monkeypatch.delenv('FACEBOOK_RATE_BURST', raising=False)
+    monkeypatch.delenv('FACEBOOK_RATE_PER_HOUR', raising=False)
+    assert bucket_settings('facebook') == (2.0, 6.0)
+
+
+def test_burst_then_wait(limiter):
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') == pytest.approx(900)
+
+
+def test_refill_over_time(limiter, clock):
+    limiter.try_acquire('linkedin')
+    limiter.try_acquire('linkedin')
+
+    clock.now += 450
+    assert limiter.wait_time('linkedin') == pytest.approx(450)
+
+    clock.now += 450
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.wait_time('linkedin') == pytest.approx(900)
+
+
+def test_refill_is_capped_at_burst(limiter, clock):
+    limiter.try_acquire('linkedin')
+    clock.now += 24 * 3600
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') > 0
+
+
+def test_refund_returns_token(limiter):
+    limiter.try_acquire('linkedin')
+    limiter.try_acquire('linkedin')
+    limiter.refund('linkedin')
+    assert limiter.try_acquire('linkedin') == 0
+
+
+def test_refund_never_exceeds_burst(limiter):
+    limiter.refund('linkedin')
+    limiter.refund('linkedin')
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') == 0
+    assert limiter.try_acquire('linkedin') > 0
+
+
+def test_accounts_have_separate_buckets(limiter):
+    limiter.try_acquire('linkedin', 'a')
+    limiter.try_acquire('linkedin', 'a')
+    assert limiter.try_acquire('linkedin', 'a') > 0
+    assert limiter.try_acquire('linkedin', 'b') == 0
+
+
+def test_zero_rate_waits_forever(limiter, monkeypatch):
+    monkeypatch.setenv('TWITTER_RATE_BURST', '1')
+    monkeypatch.setenv('TWITTER_RATE_PER_HOUR', '0')
+    assert limiter.try_acquire('twitter') == 0
+    assert limiter.try_acquire('twitter') == float('inf')
+
+
+def test_state_is_shared_between_limiters(limiter, tmp_path):
+    limiter.try_acquire('linkedin')
+    limiter.try_acquire('linkedin')
+
+    other = TokenBucketLimiter(tmp_path / 'ratelimit.db')
+    try:
+        assert other.try_acquire('linkedin') > 0
+    finally:
+        other.close()
+
+
+def test_acquire_times_out(limiter):
+    limiter.try_acquire('linkedin')
+    limiter.try_acquire('linkedin')
+    assert limiter.acquire('linkedin', timeout=60) is False
+
+
+def test_estimate_post_time_follows_buckets(monkeypatch):
+    from utils.helpers import estimate_post_time
+
+    monkeypatch.setenv('LINKEDIN_RATE_BURST', '2')
+    monkeypatch.setenv('LINKEDIN_RATE_PER_HOUR', '4')
+    monkeypatch.setenv('TWITTER_RATE_BURST', '3')
+    monkeypatch.setenv('TWITTER_RATE_PER_HOUR', '10')
+
+    # Rafales: publications enchaînées (~1 minute chacune)
+    assert estimate_post_time(['linkedin', 'twitter']) == 120
+    # 3 posts LinkedIn au-delà de la rafale: 3 recharges de 15 minutes
+    assert estimate_post_time(['linkedin'], posts=5) == 3 * 900 + 60
+
+    monkeypatch.setenv('TWITTER_RATE_PER_HOUR', '0')
+    assert estimate_post_time(['twitter'], posts=5) == -1
@@ -0,0 +1,128 @@
+"""
+Tests - Retry
+==============
+Classification des erreurs et relance des étapes.
+"""
+
+import pytest
+
+import utils.retry as retry
+from utils.retry import (
+    TRANSIENT, AUTH, PERMANENT,
+    TransientError, AuthError, PermanentError,
+    RetryPolicy, classify_error, retry_call,
+)
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+# Même nom que playwright.sync_api.TimeoutError, qui n'hérite pas du natif
+PlaywrightTimeout = type('TimeoutError', (Exception,), {})
+
+
+@pytest.mark.parametrize('error, kind', [
+    (TransientError('x'), TRANSIENT),
+    (AuthError('x'), AUTH),
+    (PermanentError('x'), PERMANENT),
+    (PlaywrightTimeout('Timeout 30000ms exceeded'), TRANSIENT),
+    (TimeoutError(), TRANSIENT),
+    (ConnectionError('reset'), TRANSIENT),
+    (ValueError('texte vide'), PERMANENT),
+    (FileNotFoundError('image.jpg'), PERMANENT),
+    (RuntimeError('net::ERR_CONNECTION_RESET at https://x.com'), TRANSIENT),
+    (RuntimeError('Redirigé vers checkpoint'), AUTH),
+    (RuntimeError('Échec de la connexion'), AUTH),
+    (RuntimeError('Erreur de connexion au serveur'), TRANSIENT),
+    (RuntimeError('Element is not attached to the DOM'), TRANSIENT),
+    (RuntimeError('Bouton introuvable'), PERMANENT),
+    (KeyError('text'), PERMANENT),
+    (AttributeError("'NoneType' object has no attribute 'click'"), PERMANENT),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv('RETRY_MAX_ATTEMPTS', '5')
+    monkeypatch.setenv('INSTAGRAM_RETRY_MAX_ATTEMPTS', '2')
+    monkeypatch.setenv('RETRY_BASE_DELAY', '0.5')
+
+    assert RetryPolicy.from_env().max_attempts == 5
+    assert RetryPolicy.from_env('instagram').max_attempts == 2
+    assert RetryPolicy.from_env('instagram').base_delay == 0.5
+
+
+def test_transient_error_is_retried():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TransientError('timeout')
+        return 'ok'
+
+    assert retry_call(flaky, policy=NO_WAIT) == 'ok'
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('error', [AuthError('login'), PermanentError('refusé')])
+def test_auth_and_permanent_errors_are_not_retried(error):
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise error
+
+    with pytest.raises(type(error)):
+        retry_call(failing, policy=NO_WAIT)
+    assert len(calls) == 1
+
+
+def test_attempts_are_bounded():
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise TransientError('timeout')
+
+    with pytest.raises(TransientError):
+        retry_call(failing, policy=NO_WAIT)
+    assert len(calls) == NO_WAIT.max_attempts
+
+
+def test_can_retry_guard_stops_after_submit():
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise TransientError('timeout')
+
+    with pytest.raises(TransientError):
+        retry_call(failing, policy=NO_WAIT, can_retry=lambda: False)
+    assert len(calls) == 1
+
+
+def test_programming_errors_are_not_retried():
+    calls = []
+
+    def buggy():
+        calls.append(1)
+        return {}['text']
+
+    with pytest.raises(KeyError):
+        retry_call(buggy, policy=NO_WAIT)
+    assert len(calls) == 1
+
+
+def test_backoff_is_exponential_and_capped(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: 0)
+    monkeypatch.setattr('time.sleep', sleeps.append)
+    policy = RetryPolicy(max_attempts=5, base_delay=2, max_delay=10)
+
+    def failing():
+        raise TransientError('timeout')
+
+    with pytest.raises(TransientError):
+        retry_call(failing, policy=policy)
+    assert sleeps == [2, 4, 8, 10]
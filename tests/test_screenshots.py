@@ -0,0 +1,89 @@
+"""
+Tests - Captures d'écran
+=========================
+Rétention du dossier de captures et écriture dédupliquée.
+"""
+
+import os
+import time
+
+import pytest
+
+import utils.screenshots as screenshots
+from utils.context import RUN_ID
+from utils.screenshots import ScreenshotPipeline, apply_retention
+
+OLD_RUN = 'a1b2c3d4'
+
+
+def touch(folder, name, age_days=0.0):
+    path = folder / name
+    path.write_bytes(b'capture')
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def names(folder):
+    return sorted(path.name for path in folder.iterdir())
+
+
+def test_retention_by_age(tmp_path):
+    touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-20_step_1.jpg', age_days=10)
+    recent = touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-21_step_1.jpg', age_days=1)
+
+    assert apply_retention(tmp_path, max_age_days=7, max_files=100) == 1
+    assert names(tmp_path) == [recent.name]
+
+
+def test_retention_limited_to_prefix(tmp_path):
+    own = touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-20_step_1.jpg', age_days=10)
+    other_account = touch(tmp_path, f'linkedin_marque_{OLD_RUN}_2025-01-20_step_1.jpg', age_days=10)
+    other_platform = touch(tmp_path, f'twitter_{OLD_RUN}_2025-01-20_step_1.jpg', age_days=10)
+
+    apply_retention(tmp_path, max_age_days=7, max_files=100, prefix='linkedin')
+
+    assert not own.exists()
+    assert other_account.exists() and other_platform.exists()
+
+
+def test_retention_keeps_current_run(tmp_path):
+    current = touch(tmp_path, f'linkedin_{RUN_ID}_2025-01-20_step_1.jpg', age_days=10)
+    apply_retention(tmp_path, max_age_days=7, max_files=0)
+    assert current.exists()
+
+
+def test_retention_keeps_failed_runs_from_count(tmp_path):
+    failed = [
+        touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-20_step_1.jpg', age_days=3),
+        touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-20_error_1.jpg', age_days=3),
+    ]
+    older = touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-19_step_1.jpg', age_days=4)
+    newest = touch(tmp_path, f'linkedin_{OLD_RUN}_2025-01-21_step_1.jpg', age_days=1)
+
+    apply_retention(tmp_path, max_age_days=7, max_files=1, prefix='linkedin', keep_failed=True)
+
+    assert all(path.exists() for path in failed)
+    assert newest.exists() and not older.exists()
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    # Contenu brut comme empreinte: pas besoin de vraies images
+    monkeypatch.setattr(screenshots, 'perceptual_hash', lambda data: data.decode())
+    return ScreenshotPipeline(tmp_path, 'linkedin', fmt='png', keep_last=0)
+
+
+def test_identical_frames_are_skipped(tmp_path, pipeline):
+    pipeline._write(tmp_path / 'a.png', b'meme')
+    pipeline._write(tmp_path / 'b.png', b'meme')
+
+    assert names(tmp_path) == ['a.png']
+    assert pipeline.skipped == 1
+
+
+def test_error_frame_is_always_written(tmp_path, pipeline):
+    pipeline._write(tmp_path / 'a.png', b'meme')
+    pipeline._write(tmp_path / 'error.png', b'meme', dedup=False)
+
+    assert names(tmp_path) == ['a.png', 'error.png']
@@ -0,0 +1,66 @@
+"""
+Tests - Sessions navigateur
+============================
+Pool de sessions: une session par (compte, plateforme), un profil ouvert une fois.
+"""
+
+from platforms.session import BrowserSession, SessionPool
+
+
+class FakeContext:
+    """Contexte navigateur minimal: seule la fermeture est observée."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def open_session(pool, account, platform, user_data_dir):
+    session = pool.get(account, platform)
+    context = FakeContext()
+    session.attach(None, context, None, user_data_dir=user_data_dir)
+    return session, context
+
+
+def test_pool_returns_one_session_per_key():
+    pool = SessionPool()
+    session = pool.get('default', 'facebook')
+    assert pool.get('default', 'facebook') is session
+    assert pool.get('default', 'instagram') is not session
+    assert session.pool is pool
+    assert session.label == 'facebook@default'
+
+
+def test_release_closes_sessions_on_same_profile(tmp_path):
+    pool = SessionPool()
+    facebook, facebook_context = open_session(pool, 'default', 'facebook', tmp_path / 'chrome')
+    linkedin, linkedin_context = open_session(pool, 'default', 'linkedin', tmp_path / 'linkedin')
+    instagram = pool.get('default', 'instagram')
+
+    pool.release(tmp_path / 'chrome', keep=instagram)
+
+    assert facebook_context.closed and facebook.context is None
+    assert not linkedin_context.closed and linkedin.context is linkedin_context
+
+
+def test_release_keeps_requesting_session(tmp_path):
+    pool = SessionPool()
+    session, context = open_session(pool, 'default', 'facebook', tmp_path / 'facebook')
+
+    pool.release(tmp_path / 'facebook', keep=session)
+
+    assert not context.closed
+
+
+def test_close_resets_session():
+    session = BrowserSession('twitter@default')
+    session.attach(None, FakeContext(), None, user_data_dir='profil')
+    session.store['cookie_consent'] = True
+
+    session.close()
+
+    assert session.context is None and session.user_data_dir is None
+    assert session.store == {}
+    assert not session.alive
@@ -0,0 +1,106 @@
+"""
+Tests - DOM Snapshots
+======================
+Aller-retour d'un instantané (page factice) et choix du sélecteur retenu.
+"""
+
+import os
+
+from utils.context import RUN_ID, log_context
+from utils.snapshots import (
+    SNAPSHOT_SCRIPT, VISIBLE_MARK, evaluate_selectors, find_snapshots, load_snapshot, save_snapshot,
+)
+
+
+class FakePage:
+    """Page Playwright minimale: url, titre, viewport et evaluate."""
+
+    url = "https://www.linkedin.com/feed/"
+    viewport_size = {'width': 1280, 'height': 800}
+
+    def __init__(self, html: str = '<!DOCTYPE html><html><body><button data-bf-visible>Publier</button></body></html>'):
+        self.html = html
+        self.calls = []
+
+    def title(self) -> str:
+        return "Fil | LinkedIn"
+
+    def evaluate(self, script, arg):
+        self.calls.append((script, arg))
+        return self.html
+
+
+class BrokenPage(FakePage):
+    def title(self) -> str:
+        raise RuntimeError("Target page, context or browser has been closed")
+
+
+class CountingPage:
+    """Page dont les locators renvoient (trouvés, visibles) par sélecteur."""
+
+    def __init__(self, counts):
+        self.counts = counts
+
+    def locator(self, selector):
+        page = self
+
+        class Locator:
+            def evaluate_all(self, script, mark):
+                count = page.counts[selector]
+                if isinstance(count, Exception):
+                    raise count
+                return count
+
+        return Locator()
+
+
+def test_round_trip(tmp_path):
+    page = FakePage()
+    with log_context(post='2026-01-15'):
+        path = save_snapshot(page, 'linkedin', 'error', folder=tmp_path)
+
+    assert path.startswith(str(tmp_path / f'linkedin_{RUN_ID}_2026-01-15_error_'))
+    assert path.endswith('.json.gz')
+    assert page.calls == [(SNAPSHOT_SCRIPT, VISIBLE_MARK)]
+
+    snapshot = load_snapshot(path)
+    assert snapshot['platform'] == 'linkedin'
+    assert snapshot['name'] == 'error'
+    assert snapshot['url'] == page.url
+    assert snapshot['title'] == "Fil | LinkedIn"
+    assert snapshot['viewport'] == page.viewport_size
+    assert snapshot['html'] == page.html
+    assert snapshot['context'] == {'run_id': RUN_ID, 'post': '2026-01-15'}
+
+
+def test_save_failure_returns_none(tmp_path):
+    assert save_snapshot(BrokenPage(), 'linkedin', 'error', folder=tmp_path) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_find_snapshots_oldest_first(tmp_path):
+    old, new = tmp_path / 'b.json.gz', tmp_path / 'a.json.gz'
+    for index, path in enumerate((old, new)):
+        path.write_bytes(b'')
+        os.utime(path, (1_000_000 + index, 1_000_000 + index))
+    (tmp_path / 'notes.txt').write_text("")
+
+    assert find_snapshots(tmp_path) == [old, new]
+    assert find_snapshots(new) == [new]
+
+
+def test_evaluate_selectors_picks_first_visible():
+    page = CountingPage({
+        'button.share': (2, 0),
+        'button:has-text("Publier")': (1, 1),
+        '[aria-label="Publier"]': (1, 1),
+        'button:bad(': ValueError("Unexpected token\ndétails"),
+    })
+    selectors = {'publish': ('button.share', 'button:has-text("Publier")', '[aria-label="Publier"]'),
+                 'broken': ('button:bad(',)}
+
+    results = evaluate_selectors(page, selectors)
+
+    assert results['publish']['winner'] == 'button:has-text("Publier")'
+    assert results['publish']['selectors'][0] == ('button.share', 2, 0, None)
+    assert results['broken'] == {'winner': None, 'selectors': [('button:bad(', 0, 0, "Unexpected token")]}
@@ -0,0 +1,135 @@
+"""
+Tests - Templates
+==================
+Compilation, rendu et rendu en masse des templates de posts.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.templates import Template, get_template, render_batch, split_list
+
+
+def test_template_segments_and_variables():
+    template = Template("{{ titre }}: {{contenu}} ({{titre}})")
+    assert template.variables == ('titre', 'contenu')
+    assert template.render({'titre': 'Courses', 'contenu': 'liste'}) == 'Courses: liste (Courses)'
+
+
+def test_render_strict_reports_missing_variables():
+    template = Template("{{titre}} - {{economie}}", name='astuce')
+    with pytest.raises(KeyError, match='economie'):
+        template.render({'titre': 'Courses', 'economie': ''})
+
+
+def test_render_lenient_keeps_placeholders():
+    template = Template("{{titre}} - {{economie}}")
+    assert template.render({'titre': 'Courses'}, strict=False) == 'Courses - {{economie}}'
+
+
+def test_render_converts_values():
+    assert Template("{{n}} €").render({'n': 30}) == '30 €'
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    ('linkedin;twitter', ['linkedin', 'twitter']),
+    ('linkedin, twitter', ['linkedin', 'twitter']),
+    (['facebook'], ['facebook']),
+])
+def test_split_list(value, expected):
+    assert split_list(value) == expected
+
+
+def test_get_template_is_cached_until_modified(tmp_path):
+    path = tmp_path / 'astuce.txt'
+    path.write_text('{{titre}}', encoding='utf-8')
+
+    first = get_template('astuce', tmp_path)
+    assert get_template('astuce', tmp_path) is first
+
+    path.write_text('{{titre}} !', encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    second = get_template('astuce', tmp_path)
+    assert second is not first
+    assert second.render({'titre': 'Budget'}) == 'Budget !'
+
+
+def test_get_template_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        get_template('absent', tmp_path)
+
+
+def test_render_batch(tmp_path, monkeypatch):
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'astuce.txt').write_text('{{titre}}: {{contenu}}', encoding='utf-8')
+    monkeypatch.setenv('TEMPLATES_FOLDER', str(templates))
+
+    posts = tmp_path / 'posts'
+    (posts / '2025-02-10').mkdir(parents=True)
+
+    rows = tmp_path / 'rows.csv'
+    rows.write_text(
+        'date,titre,contenu,platforms,schedule\n'
+        '2025-02-03,Abonnements,Faites le tri,linkedin;twitter,2025-02-03T09:00:00\n'
+        '2025-02-04,Courses,,,\n'
+        ',Sans date,Texte,,\n'
+        '2025-02-10,Existant,Texte,,\n',
+        encoding='utf-8',
+    )
+
+    report = render_batch('astuce', rows, posts)
+
+    assert report['created'] == ['2025-02-03']
+    assert report['skipped'] == ['2025-02-10']
+    assert [number for number, _ in report['errors']] == [2, 3]
+    assert 'contenu' in report['errors'][0][1]
+
+    post_dir = posts / '2025-02-03'
+    assert (post_dir / 'caption.txt').read_text(encoding='utf-8') == 'Abonnements: Faites le tri'
+    config = json.loads((post_dir / 'config.json').read_text(encoding='utf-8'))
+    assert config == {'platforms': ['linkedin', 'twitter'], 'schedule': '2025-02-03T09:00:00'}
+    assert not (posts / '2025-02-04').exists()
+
+
+@pytest.mark.parametrize('date', ['../evasion', '/tmp/absolu', 'a/b', '..', 'C:\\posts'])
+def test_render_batch_rejects_paths_as_dates(tmp_path, monkeypatch, date):
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'astuce.txt').write_text('{{titre}}', encoding='utf-8')
+    monkeypatch.setenv('TEMPLATES_FOLDER', str(templates))
+
+    rows = tmp_path / 'rows.jsonl'
+    rows.write_text(json.dumps({'date': date, 'titre': 'Courses'}) + '\n', encoding='utf-8')
+    posts = tmp_path / 'data' / 'posts'
+
+    report = render_batch('astuce', rows, posts)
+
+    assert report['created'] == []
+    assert 'date invalide' in report['errors'][0][1]
+    assert not (tmp_path / 'data').exists()
+
+
+def test_render_batch_resolves_media_next_to_rows(tmp_path, monkeypatch):
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'astuce.txt').write_text('{{titre}}', encoding='utf-8')
+    monkeypatch.setenv('TEMPLATES_FOLDER', str(templates))
+
+    calendar = tmp_path / 'calendrier'
+    (calendar / 'images').mkdir(parents=True)
+    (calendar / 'images' / 'courses.PNG').write_bytes(b'image')
+    rows = calendar / 'rows.csv'
+    rows.write_text('date,titre,image\n2025-02-03,Courses,images/courses.PNG\n', encoding='utf-8')
+    # Le dossier courant n'a pas d'images/
+    monkeypatch.chdir(tmp_path)
+
+    report = render_batch('astuce', rows, tmp_path / 'posts')
+
+    assert report['created'] == ['2025-02-03']
+    assert (tmp_path / 'posts' / '2025-02-03' / 'image.png').read_bytes() == b'image'
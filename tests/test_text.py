@@ -0,0 +1,110 @@
+"""
+Tests - Text Engine
+====================
+Longueur pondérée (comptage X), troncature et découpage en threads.
+"""
+
+import pytest
+
+from utils.text import weighted_length, text_length, fit_text, split_thread
+
+
+@pytest.mark.parametrize('text, weight', [
+    ('abc', 3),
+    ('é', 1),                      # é décomposé, normalisé en NFC
+    ('中文', 4),
+    ('😀', 2),
+    ('👍🏽', 2),                           # teinte de peau
+    ('👨‍👩‍👧', 2),             # séquence ZWJ
+    ('🇫🇷', 2),                           # drapeau
+    ('1️⃣', 2),                           # keycap
+    ('https://example.com/a/very/long/path?x=1', 23),
+    ('Voir budgetfamille.fr', 5 + 23),
+])
+def test_weighted_length(text, weight):
+    assert weighted_length(text) == weight
+
+
+def test_text_length_plain_or_weighted():
+    assert text_length('😀 https://example.com') == 21
+    assert text_length('😀 https://example.com', weighted=True) == 2 + 1 + 23
+
+
+def test_fit_text_keeps_short_text():
+    assert fit_text('Bonjour', 280) == 'Bonjour'
+
+
+def test_fit_text_cuts_at_space():
+    text = 'Économisez sur vos courses chaque semaine avec une liste'
+    result = fit_text(text, 40)
+    assert len(result) <= 40
+    assert result.endswith('...')
+    assert text.startswith(result[:-3])
+    assert not result[:-3].endswith(' ')
+    assert text[len(result) - 3] == ' '
+
+
+def test_fit_text_weighted_never_exceeds_limit():
+    result = fit_text('😀' * 200, 280, weighted=True)
+    assert weighted_length(result) <= 280
+    assert result.endswith('...')
+
+
+def test_split_thread_single_part():
+    assert split_thread('  Un tweet court.  ') == ('Un tweet court.',)
+
+
+def test_split_thread_numbers_parts_within_limit():
+    text = 'Une phrase sur le budget familial. ' * 30
+    parts = split_thread(text)
+
+    assert len(parts) > 1
+    for i, part in enumerate(parts, 1):
+        assert part.endswith(f' {i}/{len(parts)}')
+        assert weighted_length(part) <= 280
+
+
+def test_split_thread_cuts_at_sentence_end():
+    sentence = 'Phrase numéro {} du fil, assez longue pour remplir.'
+    text = ' '.join(sentence.format(i) for i in range(20))
+    for part in split_thread(text):
+        body = part.rsplit(' ', 1)[0]
+        assert body.endswith('.')
+
+
+def test_split_thread_long_sentence_is_cut_at_spaces():
+    words = ' '.join(['mot'] * 200)
+    parts = split_thread(words, numbering=False)
+    assert len(parts) > 1
+    assert all(weighted_length(part) <= 280 for part in parts)
+    assert ' '.join(parts) == words
+
+
+def test_split_thread_keeps_all_text():
+    text = 'Première phrase. ' * 40
+    parts = split_thread(text.strip(), numbering=False)
+    assert ' '.join(parts) == text.strip()
+
+
+def test_validate_post_warns_on_weighted_length(caplog, monkeypatch):
+    from utils.helpers import validate_post
+
+    monkeypatch.setenv('TWITTER_THREADS', 'false')
+    with caplog.at_level('WARNING', logger='utils.helpers'):
+        validate_post({'date': '2025-01-20', 'text': '😀' * 150}, ['twitter'])
+    assert 'Texte de 300 caractères sera tronqué pour Twitter' in caplog.text
+
+    caplog.clear()
+    with caplog.at_level('WARNING', logger='utils.helpers'):
+        validate_post({'date': '2025-01-20', 'text': 'a' * 270}, ['twitter'])
+    assert 'tronqué' not in caplog.text
+
+
+def test_validate_post_announces_thread(caplog, monkeypatch):
+    from utils.helpers import validate_post
+
+    monkeypatch.setenv('TWITTER_THREADS', 'true')
+    with caplog.at_level('INFO', logger='budgetfamille-bot'):
+        validate_post({'date': '2025-01-20', 'text': 'Astuce budget. ' * 40}, ['twitter'])
+    assert 'publié en thread de 3 parties sur Twitter' in caplog.text
+    assert 'tronqué' not in caplog.text
@@ -0,0 +1,50 @@
+"""
+Tests - Popup Watchdog
+=======================
+Traduction des sélecteurs Playwright en règles pour le MutationObserver.
+"""
+
+import pytest
+
+from platforms.watchdog import observer_rule, observer_rules, watchdog_enabled
+
+
+@pytest.mark.parametrize('selector, css, text, exact', [
+    ('[data-testid="cookie-accept"]', '[data-testid="cookie-accept"]', '', False),
+    ('button:has-text("Pas maintenant")', 'button', 'pas maintenant', False),
+    ('div[role="button"]:text-is("Accepter")', 'div[role="button"]', 'accepter', True),
+    (':has-text("Not now")', '*', 'not now', False),
+])
+def test_observer_rule(selector, css, text, exact):
+    assert observer_rule(selector) == {'css': css, 'text': text, 'exact': exact, 'source': selector}
+
+
+@pytest.mark.parametrize('selector', [
+    'text=Accepter',
+    'xpath=//button',
+    '//button[@id="ok"]',
+    'div.dialog >> button',
+    'div:has-text("Cookies") button:has-text("OK")',
+    'button:has-text("OK"):visible',
+])
+def test_selectors_without_css_equivalent(selector):
+    assert observer_rule(selector) is None
+
+
+def test_observer_rules_flattens_groups():
+    groups = {
+        'cookie': ('button:has-text("Accepter")', 'text=Accepter'),
+        'not_now': ('[aria-label="Pas maintenant"]',),
+    }
+    assert [rule['source'] for rule in observer_rules(groups)] == [
+        'button:has-text("Accepter")', '[aria-label="Pas maintenant"]',
+    ]
+
+
+@pytest.mark.parametrize('value, expected', [(None, True), ('false', False), ('TRUE', True)])
+def test_watchdog_enabled(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv('POPUP_WATCHDOG', raising=False)
+    else:
+        monkeypatch.setenv('POPUP_WATCHDOG', value)
+    assert watchdog_enabled() is expected
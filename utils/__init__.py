@@ -2,28 +2,33 @@
 Budget Famille - Utilities
 ===========================
 Modules utilitaires pour le bot.
+
+Les réexports sont résolus au premier accès (PEP 562): importer un
+sous-module (utils.context, utils.logger...) ne charge pas tout le paquet.
 """
 
-from .logger import setup_logger, get_logger, LogCapture
-from .helpers import (
-    load_post,
-    validate_post,
-    get_pending_posts,
-    archive_post,
-    format_text_for_platform,
-    extract_hashtags,
-    create_post_from_template,
-)
+import importlib
+
+_EXPORTS = {
+    'setup_logger': 'logger',
+    'get_logger': 'logger',
+    'LogCapture': 'logger',
+    'load_post': 'helpers',
+    'validate_post': 'helpers',
+    'get_pending_posts': 'helpers',
+    'archive_post': 'helpers',
+    'format_text_for_platform': 'helpers',
+    'split_text_for_platform': 'helpers',
+    'extract_hashtags': 'helpers',
+    'create_post_from_template': 'helpers',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'setup_logger',
-    'get_logger',
-    'LogCapture',
-    'load_post',
-    'validate_post',
-    'get_pending_posts',
-    'archive_post',
-    'format_text_for_platform',
-    'extract_hashtags',
-    'create_post_from_template',
-]
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
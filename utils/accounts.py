@@ -0,0 +1,199 @@
+"""
+Budget Famille - Accounts
+==========================
+Registre des comptes (marques) et de leurs identifiants par plateforme.
+
+Le fichier accounts.json (ou ACCOUNTS_FILE) associe chaque compte à ses
+identifiants, son profil navigateur, son proxy et ses limites de rythme:
+
+    {
+      "budgetfamille": {
+        "linkedin": {"email": "contact@budgetfamille.com", "password": "${BF_LINKEDIN_PASS}"},
+        "twitter": {"username": "budgetfamille", "password": "${BF_TWITTER_PASS}"},
+        "proxy": {"server": "http://proxy-1:8080", "username": "u", "password": "p"},
+        "rate_limits": {"linkedin": {"burst": 1, "per_hour": 2}}
+      }
+    }
+
+Les valeurs "${VAR}" sont lues dans l'environnement (les mots de passe
+restent dans .env). Le compte "default" correspond à la configuration
+historique: identifiants lus directement dans les variables d'environnement.
+"""
+
+import os
+import re
+import json
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ACCOUNT = 'default'
+
+# Clés réservées d'une entrée de compte (les autres sont des plateformes)
+ACCOUNT_SETTINGS = ('proxy', 'rate_limits', 'browser_data_dir', 'storage_state')
+
+_ENV_PATTERN = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Contenu d'un profil Chromium à reprendre de l'ancien dossier commun (cookies, clés)
+_LEGACY_PROFILE_ITEMS = ('Default', 'Local State')
+
+_registry: Dict[str, 'Account'] = None
+
+
+@dataclass
+class Account:
+    """Un compte: identifiants par plateforme et réglages d'isolation."""
+
+    name: str
+    credentials: Optional[Dict[str, Dict[str, str]]] = None  # None = variables d'environnement
+    proxy: Optional[Dict[str, str]] = None
+    rate_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    browser_data_dir: Optional[str] = None
+    storage_state: Optional[str] = None
+
+    @property
+    def is_default(self) -> bool:
+        return self.credentials is None
+
+    def has_platform(self, platform: str) -> bool:
+        return self.is_default or platform in self.credentials
+
+    def credential(self, platform: str, key: str, env_var: str = None, default: str = None) -> Optional[str]:
+        """
+        Retourne un identifiant du compte pour une plateforme.
+
+        Args:
+            platform: Nom de la plateforme
+            key: Clé dans accounts.json (email, password, username...)
+            env_var: Variable d'environnement lue pour le compte par défaut
+            default: Valeur si absente
+        """
+        if self.is_default:
+            return os.getenv(env_var, default) if env_var else default
+        return self.credentials.get(platform, {}).get(key, default)
+
+    def data_dir(self, platform: str = None) -> Path:
+        """
+        Dossier du profil navigateur: un par compte et par plateforme, ou un
+        profil commun à toutes les plateformes du compte (platform=None, mode onglets).
+
+        Chromium refuse d'ouvrir deux fois le même profil: deux plateformes
+        ne partagent jamais un dossier. Pour le compte par défaut, l'ancien
+        profil commun (browser_data/) est copié dans chaque nouveau dossier
+        à sa première utilisation, pour garder les connexions existantes.
+        """
+        base = Path(os.getenv('BROWSER_DATA_DIR', 'browser_data'))
+        folder = platform or 'tabs'
+        if self.browser_data_dir:
+            return Path(self.browser_data_dir) / folder
+        if self.is_default:
+            path = base / folder
+            if not path.exists():
+                _migrate_legacy_profile(base, path)
+            return path
+        return base / self.name / folder
+
+
+def _migrate_legacy_profile(base: Path, target: Path):
+    """Copie le profil commun historique (base/Default...) vers target."""
+    items = [base / name for name in _LEGACY_PROFILE_ITEMS if (base / name).exists()]
+    if not items:
+        return
+
+    try:
+        target.mkdir(parents=True)
+        for item in items:
+            if item.is_dir():
+                shutil.copytree(item, target / item.name)
+            else:
+                shutil.copy2(item, target / item.name)
+        logger.info(f"📂 Profil {base} copié vers {target} (sessions existantes conservées)")
+    except OSError as e:
+        logger.warning(f"⚠️ Copie du profil {base} vers {target} impossible: {e}")
+
+
+def _expand(value: Any) -> Any:
+    """Remplace les ${VAR} par les variables d'environnement."""
+    if isinstance(value, str):
+        return _ENV_PATTERN.sub(lambda m: os.getenv(m.group(1), ''), value)
+    if isinstance(value, dict):
+        return {k: _expand(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand(v) for v in value]
+    return value
+
+
+def _parse_account(name: str, entry: Dict[str, Any]) -> Account:
+    entry = _expand(entry)
+    credentials = {key: value for key, value in entry.items() if key not in ACCOUNT_SETTINGS}
+    return Account(
+        name=name,
+        credentials=credentials,
+        proxy=entry.get('proxy'),
+        rate_limits=entry.get('rate_limits') or {},
+        browser_data_dir=entry.get('browser_data_dir'),
+        storage_state=entry.get('storage_state'),
+    )
+
+
+def load_accounts(path: Path = None) -> Dict[str, Account]:
+    """
+    Charge le registre des comptes (mis en cache pour le fichier par
+    défaut; un fichier explicite est relu sans toucher au cache).
+
+    Args:
+        path: Fichier des comptes (défaut: ACCOUNTS_FILE ou accounts.json)
+
+    Returns:
+        Comptes indexés par nom, "default" toujours présent
+    """
+    global _registry
+
+    if _registry is not None and path is None:
+        return _registry
+
+    accounts = {DEFAULT_ACCOUNT: Account(DEFAULT_ACCOUNT)}
+    explicit = path is not None
+    path = Path(path or os.getenv('ACCOUNTS_FILE', 'accounts.json'))
+
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for name, entry in json.load(f).items():
+                    accounts[name] = _parse_account(name, entry or {})
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Erreur parsing {path}: {e}")
+
+    if not explicit:
+        _registry = accounts
+    return accounts
+
+
+def get_account(name: str = None) -> Account:
+    """
+    Retourne un compte du registre.
+
+    Raises:
+        KeyError: Si le compte est inconnu
+    """
+    accounts = load_accounts()
+    name = name or DEFAULT_ACCOUNT
+    if name not in accounts:
+        raise KeyError(f"Compte inconnu: {name}")
+    return accounts[name]
+
+
+def resolve_accounts(post: Dict[str, Any], account: str = None) -> List[str]:
+    """Comptes cibles d'un post (--account > config.json > default)."""
+    if account:
+        return [account]
+    return post.get('accounts') or [DEFAULT_ACCOUNT]
+
+
+def job_key(platform: str, account: str) -> str:
+    """Clé d'un résultat: "linkedin" (compte par défaut) ou "linkedin@marque"."""
+    return platform if account == DEFAULT_ACCOUNT else f"{platform}@{account}"
@@ -0,0 +1,197 @@
+"""
+Budget Famille - Posts Catalog
+===============================
+Catalogue de posts importés en masse depuis un calendrier CSV/JSONL.
+
+Un calendrier de plusieurs centaines de posts n'a pas besoin d'autant de
+dossiers: chaque ligne est validée puis ajoutée à posts/_catalog.jsonl (un
+post JSON par ligne), lu en une seule passe par get_pending_posts. Les
+dossiers posts/<date>/ restent pris en charge à côté du catalogue.
+
+Colonnes reconnues: text (ou caption), image, video, platforms, accounts
+(séparés par ";" dans un CSV), schedule (ISO 8601) et date (identifiant du
+post, sinon jour de planification + empreinte). Un post dont l'empreinte
+(texte normalisé + contenu des médias) est déjà au catalogue est ignoré.
+"""
+
+import json
+import hashlib
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_FILE = '_catalog.jsonl'
+
+
+def catalog_path(posts_dir: Path) -> Path:
+    return Path(posts_dir) / CATALOG_FILE
+
+
+def file_hash(path: str, cache: Dict[str, str] = None) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (lu par blocs)."""
+    if cache is not None and path in cache:
+        return cache[path]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+
+    if cache is not None:
+        cache[path] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def content_hash(text: str, image: str = None, video: str = None, cache: Dict[str, str] = None) -> str:
+    """Empreinte d'un post: texte aux espaces normalisés et contenu des médias."""
+    digest = hashlib.sha256(' '.join(text.split()).encode('utf-8'))
+    for media in (image, video):
+        digest.update(b'\0' + (file_hash(media, cache).encode() if media else b''))
+    return digest.hexdigest()
+
+
+def read_catalog(posts_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Posts du catalogue, dans l'ordre d'import."""
+    path = catalog_path(posts_dir)
+    if not path.exists():
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"Catalogue ligne {number} illisible: {e}")
+
+
+def find_catalog_post(posts_dir: Path, post_id: str) -> Optional[Dict[str, Any]]:
+    """Post du catalogue par identifiant."""
+    return next((post for post in read_catalog(posts_dir) if post['date'] == post_id), None)
+
+
+def _media_path(value: Any, base: Path) -> Optional[str]:
+    """Chemin absolu d'un média (relatif au fichier calendrier)."""
+    if not value:
+        return None
+    path = Path(value)
+    if not path.is_absolute():
+        path = base / path
+    return str(path.resolve())
+
+
+def parse_row(row: Dict[str, Any], base: Path) -> Dict[str, Any]:
+    """
+    Convertit une ligne de calendrier en post.
+
+    Raises:
+        ValueError: Si la ligne est invalide
+    """
+    # Imports différés: la lecture du catalogue (--list) n'en a pas besoin
+    from platforms.registry import is_platform
+    from utils.templates import split_list
+
+    text = str(row.get('text') or row.get('caption') or '').strip()
+    if not text:
+        raise ValueError("texte vide")
+
+    post = {
+        'date': str(row.get('date') or '').strip() or None,
+        'text': text,
+        'image': _media_path(row.get('image'), base),
+        'video': _media_path(row.get('video'), base),
+        'platforms': split_list(row.get('platforms')),
+    }
+
+    for kind in ('image', 'video'):
+        if post[kind] and not Path(post[kind]).exists():
+            raise ValueError(f"{kind} introuvable: {post[kind]}")
+
+    unknown = [name for name in post['platforms'] or [] if not is_platform(name)]
+    if unknown:
+        raise ValueError(f"plateforme inconnue: {', '.join(unknown)}")
+
+    accounts = split_list(row.get('accounts'))
+    if accounts:
+        post['accounts'] = accounts
+
+    if row.get('schedule'):
+        try:
+            datetime.fromisoformat(str(row['schedule']))
+        except ValueError:
+            raise ValueError(f"schedule invalide: {row['schedule']}")
+        post['schedule'] = str(row['schedule'])
+
+    return post
+
+
+def import_calendar(calendar: Path, posts_dir: Path) -> Dict[str, List]:
+    """
+    Importe un calendrier CSV/JSONL dans le catalogue, en une passe.
+
+    Les lignes invalides sont signalées sans interrompre l'import; les
+    doublons (même empreinte que le catalogue ou qu'une ligne précédente)
+    sont ignorés.
+
+    Args:
+        calendar: Fichier CSV ou JSONL
+        posts_dir: Dossier des posts (contient le catalogue)
+
+    Returns:
+        {'imported': [ids], 'duplicates': [ids], 'errors': [(ligne, message)]}
+    """
+    from utils.templates import read_rows
+
+    calendar = Path(calendar)
+    base = calendar.parent
+    report = {'imported': [], 'duplicates': [], 'errors': []}
+
+    known_hashes = set()
+    known_ids = {item.name for item in Path(posts_dir).iterdir()} if Path(posts_dir).exists() else set()
+    for post in read_catalog(posts_dir):
+        known_hashes.add(post.get('hash'))
+        known_ids.add(post['date'])
+
+    media_hashes: Dict[str, str] = {}
+    path = catalog_path(posts_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'a', encoding='utf-8') as catalog:
+        for number, row in enumerate(read_rows(calendar), 1):
+            if '_error' in row:
+                report['errors'].append((number, row['_error']))
+                continue
+
+            try:
+                post = parse_row(row, base)
+                post['hash'] = content_hash(post['text'], post['image'], post['video'], media_hashes)
+            except (ValueError, OSError) as e:
+                report['errors'].append((number, str(e)))
+                continue
+
+            if not post['date']:
+                day = post.get('schedule', '')[:10] or date.today().isoformat()
+                post['date'] = f"{day}-{post['hash'][:8]}"
+
+            if post['hash'] in known_hashes:
+                report['duplicates'].append(post['date'])
+                continue
+            if post['date'] in known_ids:
+                report['errors'].append((number, f"identifiant déjà utilisé: {post['date']}"))
+                continue
+
+            catalog.write(json.dumps(post, ensure_ascii=False) + '\n')
+            known_hashes.add(post['hash'])
+            known_ids.add(post['date'])
+            report['imported'].append(post['date'])
+
+    logger.info(
+        f"Catalogue: {len(report['imported'])} post(s) importé(s), "
+        f"{len(report['duplicates'])} doublon(s), {len(report['errors'])} erreur(s)"
+    )
+    return report
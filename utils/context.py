@@ -0,0 +1,76 @@
+"""
+Budget Famille - Log Context
+=============================
+Identité du travail en cours (lancement, post, plateforme, compte, étape)
+propagée par contextvars.
+
+Le contexte est posé là où il est connu (main pour le post, BasePoster pour
+la plateforme et le compte, _step pour l'étape) et recopié dans chaque
+record de log, dans les noms de captures et dans les profils. Les threads
+ne l'héritent pas: les tâches soumises à un pool passent par
+submit_in_context, qui exécute la tâche dans une copie du contexte appelant.
+"""
+
+import re
+import uuid
+import logging
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future
+from typing import Dict, Any
+
+# Identifiant du lancement
+RUN_ID = uuid.uuid4().hex[:8]
+
+# Champs de contexte, dans l'ordre d'affichage
+CONTEXT_FIELDS = ('run_id', 'job_id', 'post', 'platform', 'account', 'step')
+
+_context: contextvars.ContextVar = contextvars.ContextVar('budgetfamille_context', default={})
+
+
+def current_context() -> Dict[str, Any]:
+    """Contexte courant (run_id toujours présent)."""
+    return {'run_id': RUN_ID, **_context.get()}
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Complète le contexte le temps d'un bloc.
+
+    Exemple:
+        with log_context(post='2025-01-20', platform='linkedin'):
+            ...
+    """
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def job_id(post_id: str, platform: str, account: str) -> str:
+    """Identifiant d'un job: "2025-01-20:linkedin@compte"."""
+    return f"{post_id}:{platform}@{account}"
+
+
+def context_label(*fields: str) -> str:
+    """Champs du contexte joints pour un nom de fichier ("a1b2c3d4_2025-01-20")."""
+    context = current_context()
+    values = [str(context[field]) for field in fields if context.get(field)]
+    return re.sub(r'[^\w.-]+', '-', '_'.join(values))
+
+
+def submit_in_context(executor: Executor, func, *args, **kwargs) -> Future:
+    """executor.submit, la tâche héritant du contexte de l'appelant."""
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+class ContextFilter(logging.Filter):
+    """Ajoute les champs du contexte aux records (sans écraser un extra=)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for field, value in current_context().items():
+            if not getattr(record, field, None):
+                setattr(record, field, value)
+        return True
@@ -0,0 +1,193 @@
+"""
+Budget Famille - Dedup Index
+=============================
+Garde-fou contre la republication d'un même post.
+
+Chaque publication réussie est enregistrée par (plateforme, compte) avec:
+- l'empreinte du texte normalisé (casse, espaces) et celle des médias;
+- une signature MinHash du texte (shingles de 3 mots), qui estime la
+  similarité de Jaccard entre deux légendes sans les comparer mot à mot.
+
+À la planification, un job est rejeté (avant tout navigateur) si le même
+texte et les mêmes médias ont déjà été publiés, ou si la légende est
+quasi identique (similarité >= DEDUP_THRESHOLD) avec les mêmes médias.
+Deux posts identiques d'un même lancement sont aussi détectés.
+
+L'index est persisté dans SQLite (DEDUP_DB, défaut data/dedup.db).
+"""
+
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.catalog import file_hash
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB = Path('data') / 'dedup.db'
+
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Permutations fixes: les signatures restent comparables d'un lancement à l'autre
+_rng = random.Random(0x42F)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+_WORD = re.compile(r'\w+')
+
+
+def dedup_enabled() -> bool:
+    """Contrôle des doublons activé (DEDUP, défaut: true)."""
+    return os.getenv('DEDUP', 'true').lower() == 'true'
+
+
+def normalize_text(text: str) -> str:
+    """Texte comparable: NFKC, minuscules, espaces réduits."""
+    return ' '.join(unicodedata.normalize('NFKC', text).lower().split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def media_hash(post: Dict[str, Any], cache: Dict[str, str] = None) -> str:
+    """Empreinte des médias du post ('' sans média)."""
+    hashes = [file_hash(post[kind], cache) for kind in ('image', 'video')
+              if post.get(kind) and Path(post[kind]).exists()]
+    return hashlib.sha256('|'.join(hashes).encode()).hexdigest() if hashes else ''
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    """Signature MinHash des shingles de mots du texte."""
+    words = _WORD.findall(normalize_text(text))
+    if len(words) < SHINGLE_SIZE:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+              for s in shingles]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Similarité de Jaccard estimée entre deux signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERMUTATIONS
+
+
+class DedupIndex:
+    """Index des publications réussies, par (plateforme, compte)."""
+
+    def __init__(self, path: Path = None, threshold: float = None, read_only: bool = False):
+        self.path = Path(path or os.getenv('DEDUP_DB', DEFAULT_DB))
+        self.read_only = read_only  # dry-run: la base n'est ni créée ni modifiée
+        self.threshold = threshold if threshold is not None else float(os.getenv('DEDUP_THRESHOLD', 0.85))
+        self._lock = threading.Lock()
+        self._conn = None
+        self._media_cache: Dict[str, str] = {}
+        self._fingerprints: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+        # (plateforme, compte) -> [(post, texte, médias, signature)] publiés ou planifiés
+        self._entries: Dict[Tuple[str, str], List[Tuple[str, str, str, Tuple[int, ...]]]] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.read_only and self.path.exists():
+                self._conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                             check_same_thread=False)
+                return self._conn
+            if self.read_only:
+                # Base absente: index vide, en mémoire
+                self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS published ("
+                " platform TEXT NOT NULL, account TEXT NOT NULL,"
+                " text_hash TEXT NOT NULL, media_hash TEXT NOT NULL,"
+                " signature TEXT NOT NULL, post_id TEXT, published REAL NOT NULL,"
+                " PRIMARY KEY (platform, account, text_hash, media_hash))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def fingerprint(self, post: Dict[str, Any]) -> Tuple[str, str, Tuple[int, ...]]:
+        """(texte, médias, signature) d'un post, calculés une fois par lancement."""
+        if post['date'] not in self._fingerprints:
+            self._fingerprints[post['date']] = (
+                text_hash(post['text']), media_hash(post, self._media_cache), minhash(post['text'])
+            )
+        return self._fingerprints[post['date']]
+
+    def _load(self, platform: str, account: str) -> list:
+        key = (platform, account)
+        if key not in self._entries:
+            rows = self.conn.execute(
+                "SELECT post_id, text_hash, media_hash, signature FROM published WHERE platform = ? AND account = ?",
+                key,
+            ).fetchall()
+            self._entries[key] = [(post_id, th, mh, tuple(json.loads(sig))) for post_id, th, mh, sig in rows]
+        return self._entries[key]
+
+    def find_duplicate(self, post: Dict[str, Any], platform: str, account: str) -> Optional[str]:
+        """
+        Cherche un doublon publié (ou déjà planifié) du post.
+
+        Returns:
+            Raison du rejet, None si le post est nouveau
+        """
+        th, mh, signature = self.fingerprint(post)
+        for post_id, other_th, other_mh, other_signature in self._load(platform, account):
+            if other_mh != mh:
+                continue
+            if other_th == th:
+                return "déjà publié" if post_id == post['date'] else f"doublon de {post_id}"
+            score = similarity(signature, other_signature)
+            if score >= self.threshold:
+                return f"quasi-doublon de {post_id} ({score:.0%})"
+        return None
+
+    def plan(self, post: Dict[str, Any], platform: str, account: str) -> Optional[str]:
+        """
+        Vérifie un job à la planification et le réserve s'il est nouveau:
+        un second post identique du même lancement sera rejeté.
+
+        Returns:
+            Raison du rejet, None si le job peut partir
+        """
+        with self._lock:
+            reason = self.find_duplicate(post, platform, account)
+            if reason is None:
+                self._load(platform, account).append((post['date'], *self.fingerprint(post)))
+            return reason
+
+    def record(self, post: Dict[str, Any], platform: str, account: str):
+        """Enregistre une publication réussie."""
+        with self._lock:
+            th, mh, signature = self.fingerprint(post)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO published (platform, account, text_hash, media_hash, signature, post_id, published)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (platform, account, th, mh, json.dumps(signature), post['date'], time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -11,7 +11,10 @@ from pathlib import Path
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 
+from platforms.registry import builtin_platforms, get_capabilities, is_platform
+from utils.catalog import read_catalog
 from utils.logger import get_logger
+from utils.text import fit_text, split_thread, text_length
 
 logger = get_logger(__name__)
 
@@ -83,6 +86,9 @@ def load_post(post_dir: Path) -> Dict[str, Any]:
             if 'platforms' in config:
                 post['platforms'] = config['platforms']
             
+            if 'accounts' in config:
+                post['accounts'] = config['accounts']
+            
             if 'schedule' in config:
                 post['schedule'] = config['schedule']
                 
@@ -92,12 +98,13 @@ def load_post(post_dir: Path) -> Dict[str, Any]:
     return post
 
 
-def validate_post(post: Dict[str, Any]) -> tuple[bool, List[str]]:
+def validate_post(post: Dict[str, Any], platforms: List[str] = None) -> tuple[bool, List[str]]:
     """
-    Valide un post avant publication.
+    Valide un post avant publication, d'après les capacités des plateformes.
     
     Args:
         post: Dictionnaire du post
+        platforms: Plateformes cibles (défaut: celles du post, sinon toutes)
         
     Returns:
         Tuple (is_valid, list of errors)
@@ -108,11 +115,6 @@ def validate_post(post: Dict[str, Any]) -> tuple[bool, List[str]]:
     if not post.get('text'):
         errors.append("Le texte (caption.txt) est vide")
     
-    # Vérifier la longueur pour Twitter
-    if post.get('text') and len(post['text']) > 280:
-        # Pas une erreur, juste un warning - sera tronqué automatiquement
-        logger.warning(f"Texte de {len(post['text'])} caractères sera tronqué pour Twitter")
-    
     # Vérifier les fichiers média
     if post.get('image') and not Path(post['image']).exists():
         errors.append(f"Image non trouvée: {post['image']}")
@@ -120,10 +122,41 @@ def validate_post(post: Dict[str, Any]) -> tuple[bool, List[str]]:
     if post.get('video') and not Path(post['video']).exists():
         errors.append(f"Vidéo non trouvée: {post['video']}")
     
-    # Instagram nécessite un média
-    platforms = post.get('platforms', ['linkedin', 'instagram', 'facebook', 'twitter'])
-    if 'instagram' in platforms and not post.get('image') and not post.get('video'):
-        errors.append("Instagram nécessite une image ou une vidéo")
+    if platforms is None:
+        platforms = post.get('platforms') or builtin_platforms()
+    
+    for platform in platforms:
+        if not is_platform(platform):
+            errors.append(f"Plateforme inconnue: {platform}")
+            continue
+        
+        capabilities = get_capabilities(platform)
+        
+        if capabilities.requires_media and not post.get('image') and not post.get('video'):
+            errors.append(f"{platform.capitalize()} nécessite une image ou une vidéo")
+        
+        if post.get('image') and not capabilities.accepts_image(post['image']):
+            errors.append(f"{platform.capitalize()}: format d'image non supporté ({Path(post['image']).suffix})")
+        
+        if post.get('video') and not capabilities.accepts_video(post['video']):
+            errors.append(f"{platform.capitalize()}: format vidéo non supporté ({Path(post['video']).suffix})")
+        
+        # Pas une erreur, juste un warning - sera tronqué (ou publié en
+        # thread) automatiquement (longueur comptée comme la plateforme:
+        # URL = 23, emoji = 2 sur X)
+        length = text_length(post.get('text') or '', weighted=capabilities.weighted_length)
+        if length > capabilities.max_text_length:
+            if threads_enabled(platform):
+                parts = len(split_text_for_platform(post['text'], platform))
+                logger.info(
+                    f"Texte de {length} caractères publié en thread de {parts} parties "
+                    f"sur {platform.capitalize()} (max {capabilities.max_text_length} par partie)"
+                )
+            else:
+                logger.warning(
+                    f"Texte de {length} caractères sera tronqué pour {platform.capitalize()} "
+                    f"(max {capabilities.max_text_length})"
+                )
     
     return len(errors) == 0, errors
 
@@ -144,7 +177,9 @@ def get_pending_posts(posts_dir: Path) -> List[Dict[str, Any]]:
         logger.warning(f"Dossier des posts non trouvé: {posts_dir}")
         return posts
     
-    # Parcourir tous les sous-dossiers
+    # Posts importés en masse (catalogue), puis sous-dossiers
+    candidates = list(read_catalog(posts_dir))
+    
     for item in posts_dir.iterdir():
         if not item.is_dir():
             continue
@@ -154,13 +189,15 @@ def get_pending_posts(posts_dir: Path) -> List[Dict[str, Any]]:
             continue
         
         # Charger le post
-        post = load_post(item)
-        
-        # Valider
-        is_valid, errors = validate_post(post)
+        candidates.append(load_post(item))
+    
+    for post in candidates:
+        # Valider (contrôles communs uniquement, les contrôles par
+        # plateforme sont faits en masse par utils.preflight)
+        is_valid, errors = validate_post(post, platforms=[])
         
         if not is_valid:
-            logger.warning(f"Post {item.name} invalide: {errors}")
+            logger.warning(f"Post {post['date']} invalide: {errors}")
             continue
         
         # Vérifier la date de planification si présente
@@ -168,7 +205,7 @@ def get_pending_posts(posts_dir: Path) -> List[Dict[str, Any]]:
             try:
                 scheduled_time = datetime.fromisoformat(post['schedule'])
                 if scheduled_time > datetime.now():
-                    logger.info(f"Post {item.name} planifié pour {scheduled_time}")
+                    logger.info(f"Post {post['date']} planifié pour {scheduled_time}")
                     continue  # Pas encore l'heure
             except ValueError:
                 pass
@@ -213,30 +250,42 @@ def format_text_for_platform(text: str, platform: str) -> str:
     Returns:
         Texte formaté
     """
-    if platform == 'twitter':
-        # Tronquer pour Twitter
-        if len(text) > 280:
-            # Trouver un bon point de coupure
-            truncated = text[:277]
-            
-            # Essayer de couper à un espace
-            last_space = truncated.rfind(' ')
-            if last_space > 200:
-                truncated = truncated[:last_space]
-            
-            return truncated + "..."
+    if not is_platform(platform):
+        return text
+    
+    caps = get_capabilities(platform)
+    return fit_text(text, caps.max_text_length, weighted=caps.weighted_length)
+
+
+def threads_enabled(platform: str) -> bool:
+    """Indique si un texte trop long part en thread ({PLATEFORME}_THREADS, défaut: true)."""
+    if not is_platform(platform) or get_capabilities(platform).max_thread_parts <= 1:
+        return False
+    return os.getenv(f'{platform.upper()}_THREADS', 'true').lower() == 'true'
+
+
+def split_text_for_platform(text: str, platform: str) -> List[str]:
+    """
+    Découpe le texte en parties publiables (thread) selon la plateforme.
     
-    elif platform == 'linkedin':
-        # LinkedIn supporte plus de caractères mais préfère les paragraphes
-        # Ajouter des sauts de ligne après les phrases si absent
-        pass
+    Les plateformes sans thread (ou TWITTER_THREADS=false) reçoivent une
+    seule partie, tronquée si nécessaire.
     
-    elif platform == 'instagram':
-        # Instagram a une limite de 2200 caractères
-        if len(text) > 2200:
-            text = text[:2197] + "..."
+    Args:
+        text: Texte original
+        platform: Nom de la plateforme
+        
+    Returns:
+        Parties du texte, dans l'ordre de publication
+    """
+    if not is_platform(platform):
+        return [text]
     
-    return text
+    if not threads_enabled(platform):
+        return [format_text_for_platform(text, platform)]
+    
+    caps = get_capabilities(platform)
+    return list(split_thread(text, caps.max_text_length, weighted=caps.weighted_length))
 
 
 def extract_hashtags(text: str) -> List[str]:
@@ -261,22 +310,16 @@ def create_post_from_template(template_name: str, variables: Dict[str, str]) ->
         variables: Dictionnaire de variables à remplacer
         
     Returns:
-        Texte formaté
+        Texte formaté (les variables manquantes restent en {{variable}})
     """
-    templates_dir = Path('templates')
-    template_file = templates_dir / f'{template_name}.txt'
-    
-    if not template_file.exists():
-        raise FileNotFoundError(f"Template non trouvé: {template_file}")
-    
-    with open(template_file, 'r', encoding='utf-8') as f:
-        template = f.read()
+    from utils.templates import get_template
     
-    # Remplacer les variables {{variable}}
-    for key, value in variables.items():
-        template = template.replace(f'{{{{{key}}}}}', value)
+    template = get_template(template_name)
+    missing = template.missing(variables)
+    if missing:
+        logger.warning(f"Variables manquantes pour {template_name}: {', '.join(missing)}")
     
-    return template
+    return template.render(variables, strict=False)
 
 
 def get_optimal_posting_time(platform: str) -> str:
@@ -289,31 +332,44 @@ def get_optimal_posting_time(platform: str) -> str:
     Returns:
         Heure au format HH:MM
     """
-    # Basé sur des études de marketing digital
-    optimal_times = {
-        'linkedin': '10:00',    # Mardi-Jeudi, 10h-12h
-        'instagram': '11:00',   # Lundi, Mercredi, 11h
-        'facebook': '13:00',    # Mercredi, 13h-16h
-        'twitter': '09:00',     # Mercredi, 9h-12h
-    }
+    # Basé sur des études de marketing digital (déclaré par chaque poster)
+    if not is_platform(platform):
+        return '10:00'
     
-    return optimal_times.get(platform, '10:00')
+    return get_capabilities(platform).best_time
 
 
-def estimate_post_time(platforms: List[str]) -> int:
+def estimate_post_time(platforms: List[str], posts: int = 1, account: str = None) -> int:
     """
-    Estime le temps total de publication en secondes.
+    Estime le temps total de publication en secondes, au rythme des token
+    buckets (buckets pleins au départ).
+    
+    Chaque plateforme publie sa rafale tout de suite, puis un post par
+    intervalle de recharge; les plateformes attendent en parallèle, les
+    publications elles-mêmes s'enchaînent.
     
     Args:
         platforms: Liste des plateformes
+        posts: Nombre de posts à publier sur chaque plateforme
+        account: Compte (limites surchargées dans accounts.json)
         
     Returns:
-        Temps estimé en secondes
+        Temps estimé en secondes, -1 si un rythme nul bloque la publication
     """
-    delay_between = int(os.getenv('DELAY_BETWEEN_POSTS', 300))
-    time_per_platform = 60  # ~1 minute par plateforme
+    from utils.accounts import DEFAULT_ACCOUNT
+    from utils.ratelimit import bucket_settings
     
-    total = len(platforms) * time_per_platform
-    total += (len(platforms) - 1) * delay_between
+    time_per_post = 60  # ~1 minute par publication
+    
+    total = len(platforms) * posts * time_per_post
+    for platform in platforms:
+        if not is_platform(platform):
+            continue
+        burst, per_hour = bucket_settings(platform, account or DEFAULT_ACCOUNT)
+        waiting = max(0, posts - int(burst))
+        if waiting and per_hour <= 0:
+            return -1
+        if waiting:
+            total = max(total, int(waiting * 3600 / per_hour) + time_per_post)
     
     return total
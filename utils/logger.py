@@ -2,99 +2,250 @@
 Budget Famille - Logger
 ========================
 Configuration du système de logging.
+
+Les threads de publication ne font jamais d'écriture: le logger principal
+n'a qu'un QueueHandler (file non bornée, put() ne bloque pas). Un
+QueueListener, dans son propre thread, distribue ensuite les records:
+- console: rendu compact (heure, niveau, plateforme, message);
+- logs/<jour>.jsonl: une ligne JSON par record avec le contexte du job
+  (utils.context: run, post, plateforme, compte, étape), rotation à
+  minuit et par taille;
+- logs/errors.log: erreurs en texte, rotation par taille.
+
+LogCapture garde en plus, par job, les derniers records (DEBUG compris)
+dans un tampon borné, écrit dans logs/failures/ seulement si le job échoue.
 """
 
 import os
+import re
+import json
+import time
+import queue
+import atexit
 import logging
+import contextvars
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+from utils.context import CONTEXT_FIELDS, ContextFilter, current_context
 
-# Créer le dossier de logs s'il n'existe pas
+# Dossier de logs (créé au premier logger avec fichiers)
 LOGS_DIR = Path('logs')
-LOGS_DIR.mkdir(exist_ok=True)
 
 # Format de log
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+_listener: QueueListener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CompactFormatter(logging.Formatter):
+    """Rendu console compact: "09:12:03 I [linkedin] message"."""
+
+    COLORS = {'DEBUG': 36, 'INFO': 32, 'WARNING': 33, 'ERROR': 31, 'CRITICAL': 41}
+
+    def __init__(self, color: bool = True):
+        super().__init__('%(asctime)s %(levelname).1s %(tag)s%(message)s', '%H:%M:%S')
+        self.color = color
+
+    def format(self, record: logging.LogRecord) -> str:
+        platform = getattr(record, 'platform', None)
+        account = getattr(record, 'account', None)
+        if platform and account and account != 'default':
+            platform = f"{platform}@{account}"
+        record.tag = f"[{platform}] " if platform else ''
+        line = super().format(record)
+        if self.color:
+            return f"\033[{self.COLORS.get(record.levelname, 0)}m{line}\033[0m"
+        return line
+
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """
+    Fichier par jour (logs/<jour>.jsonl), découpé par taille dans la journée
+    (<jour>.jsonl.1, .2...). Les fichiers plus vieux que retention_days sont
+    supprimés à l'ouverture (lancements cron ou CLI, qui ne changent jamais
+    de jour) puis à chaque changement de jour.
+    """
+
+    def __init__(self, folder: Path, suffix: str = '.jsonl', max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5, retention_days: int = 30):
+        self.folder = Path(folder)
+        self.suffix = suffix
+        self.retention_days = retention_days
+        self.day = datetime.now().strftime('%Y-%m-%d')
+        super().__init__(self.folder / f'{self.day}{suffix}', maxBytes=max_bytes,
+                         backupCount=backup_count, encoding='utf-8', delay=True)
+        self._purge()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        day = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d')
+        if day != self.day:
+            # Nouveau jour: nouveau fichier
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.day = day
+            self.baseFilename = os.path.abspath(self.folder / f'{day}{self.suffix}')
+            self._purge()
+        return super().shouldRollover(record)
+
+    def _purge(self):
+        purge_old_files(self.folder, f'*{self.suffix}*', self.retention_days)
+
+
+def purge_old_files(folder: Path, pattern: str, retention_days: int):
+    """Supprime les fichiers du dossier plus vieux que retention_days."""
+    limit = time.time() - retention_days * 86400
+    for path in Path(folder).glob(pattern):
+        try:
+            if path.stat().st_mtime < limit:
+                path.unlink()
+        except OSError:
+            pass
 
-def setup_logger(name: str = 'budgetfamille-bot', level: str = None) -> logging.Logger:
+
+class _ContextQueueHandler(QueueHandler):
+    """QueueHandler qui fige le message et le contexte dans le thread appelant."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _console_formatter() -> logging.Formatter:
+    if os.getenv('LOG_CONSOLE', 'compact').lower() == 'compact':
+        return CompactFormatter(color=os.getenv('NO_COLOR') is None)
+    # Format historique
+    try:
+        import colorlog
+        return colorlog.ColoredFormatter(
+            '%(log_color)s%(asctime)s - %(levelname)s - %(message)s%(reset)s',
+            datefmt=DATE_FORMAT,
+            log_colors={
+                'DEBUG': 'cyan',
+                'INFO': 'green',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'red,bg_white',
+            }
+        )
+    except ImportError:
+        return logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+
+def setup_logger(name: str = 'budgetfamille-bot', level: str = None,
+                 file_logging: bool = True) -> logging.Logger:
     """
     Configure et retourne le logger principal.
     
     Args:
         name: Nom du logger
         level: Niveau de log (DEBUG, INFO, WARNING, ERROR)
+        file_logging: Si False, console uniquement (commandes en lecture seule)
         
     Returns:
         Logger configuré
     """
+    global _listener
+    
     # Déterminer le niveau de log
     if level is None:
         level = 'DEBUG' if os.getenv('DEBUG_MODE', 'false').lower() == 'true' else 'INFO'
     
     log_level = getattr(logging, level.upper(), logging.INFO)
     
-    # Créer le logger
+    # Créer le logger (DEBUG si les jobs capturent leurs logs: le filtrage
+    # au niveau demandé se fait alors sur la file)
     logger = logging.getLogger(name)
-    logger.setLevel(log_level)
+    logger.setLevel(logging.DEBUG if capture_size() > 0 else log_level)
     
     # Éviter les doublons de handlers
-    if logger.handlers:
+    if any(isinstance(handler, _ContextQueueHandler) for handler in logger.handlers):
         return logger
     
-    # Handler console avec couleurs
+    # Handler console (rendu compact)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
+    console_handler.setFormatter(_console_formatter())
+    handlers = [console_handler]
     
-    # Essayer d'utiliser colorlog si disponible
-    try:
-        import colorlog
-        console_formatter = colorlog.ColoredFormatter(
-            '%(log_color)s%(asctime)s - %(levelname)s - %(message)s%(reset)s',
-            datefmt=DATE_FORMAT,
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'red,bg_white',
-            }
+    if file_logging:
+        LOGS_DIR.mkdir(exist_ok=True)
+        
+        # Lignes JSON, un fichier par jour découpé par taille
+        json_handler = DailyRotatingFileHandler(
+            LOGS_DIR,
+            max_bytes=int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+            backup_count=int(os.getenv('LOG_BACKUP_COUNT', 5)),
+            retention_days=int(os.getenv('LOG_RETENTION_DAYS', 30)),
         )
-    except ImportError:
-        console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # Handler fichier (un fichier par jour)
-    today = datetime.now().strftime('%Y-%m-%d')
-    file_handler = RotatingFileHandler(
-        LOGS_DIR / f'{today}.log',
-        maxBytes=10*1024*1024,  # 10 MB
-        backupCount=5,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
-    # Handler pour les erreurs uniquement
-    error_handler = RotatingFileHandler(
-        LOGS_DIR / 'errors.log',
-        maxBytes=5*1024*1024,  # 5 MB
-        backupCount=3,
-        encoding='utf-8'
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(file_formatter)
-    logger.addHandler(error_handler)
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+        
+        # Handler pour les erreurs uniquement
+        error_handler = RotatingFileHandler(
+            LOGS_DIR / 'errors.log',
+            maxBytes=5*1024*1024,  # 5 MB
+            backupCount=3,
+            encoding='utf-8',
+            delay=True
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+        handlers.append(error_handler)
+    
+    # Les écritures se font dans le thread du listener, jamais dans l'appelant
+    # (le contexte run/post/plateforme/étape est lu ici, dans le thread appelant)
+    log_queue = queue.SimpleQueue()
+    queue_handler = _ContextQueueHandler(log_queue)
+    queue_handler.setLevel(log_level)
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
     
     return logger
 
 
+def stop_logging():
+    """Vide la file et arrête le listener (appelé à la sortie)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str = None) -> logging.Logger:
     """
     Récupère un logger enfant.
@@ -113,39 +264,128 @@ def get_logger(name: str = None) -> logging.Logger:
     return parent_logger
 
 
+class CapturedRecord:
+    """Record capturé, figé (message rendu, pas de référence au LogRecord)."""
+
+    __slots__ = ('created', 'level', 'logger', 'message', 'step', 'exc')
+
+    def __init__(self, record: logging.LogRecord, step: str = None):
+        self.created = record.created
+        self.level = record.levelname
+        self.logger = record.name
+        self.message = record.getMessage()
+        self.step = step
+        self.exc = (logging.Formatter().formatException(record.exc_info)
+                    if record.exc_info else record.exc_text)
+
+    def to_dict(self) -> dict:
+        entry = {
+            'ts': datetime.fromtimestamp(self.created).isoformat(timespec='milliseconds'),
+            'level': self.level,
+            'logger': self.logger,
+            'msg': self.message,
+        }
+        if self.step:
+            entry['step'] = self.step
+        if self.exc:
+            entry['exc'] = self.exc
+        return entry
+
+    def as_entry(self) -> dict:
+        """Forme historique des accesseurs de LogCapture: level, message, time."""
+        return {'level': self.level, 'message': self.message, 'time': datetime.fromtimestamp(self.created)}
+
+
+class _CaptureHandler(logging.Handler):
+    """Handler partagé: range chaque record dans la capture du job courant."""
+
+    def emit(self, record: logging.LogRecord):
+        capture = _active_capture.get()
+        if capture is not None:
+            capture.records.append(CapturedRecord(record, current_context().get('step')))
+
+
+_active_capture: contextvars.ContextVar = contextvars.ContextVar('budgetfamille_capture', default=None)
+_capture_handler = _CaptureHandler(logging.DEBUG)
+
+
+def capture_size() -> int:
+    """Taille du tampon de capture par job (LOG_CAPTURE_SIZE, 0 = désactivé)."""
+    return int(os.getenv('LOG_CAPTURE_SIZE', 500))
+
+
 class LogCapture:
-    """Context manager pour capturer les logs."""
+    """
+    Capture les logs d'un job (DEBUG compris) dans un tampon circulaire.
+
+    Seuls les records émis dans le contexte du job sont gardés (les autres
+    jobs, même en parallèle, ont leur propre capture), et seulement les
+    `size` derniers: la mémoire reste bornée quelle que soit la durée du
+    job. Rien n'est écrit tant que dump() n'est pas appelé, en pratique
+    seulement quand la publication échoue.
+
+    Exemple:
+        with LogCapture() as capture:
+            ...
+        if failed:
+            capture.dump()
+    """
     
-    def __init__(self, logger_name: str = 'budgetfamille-bot'):
+    def __init__(self, logger_name: str = 'budgetfamille-bot', size: int = None):
         self.logger = logging.getLogger(logger_name)
-        self.captured = []
-        self.handler = None
+        self.records: deque = deque(maxlen=size if size is not None else capture_size())
+        self.context = {}
+        self._token = None
+    
+    @property
+    def captured(self) -> list:
+        """Records capturés, en dicts {'level', 'message', 'time'} (records: objets bruts)."""
+        return [record.as_entry() for record in self.records]
     
     def __enter__(self):
-        class CaptureHandler(logging.Handler):
-            def __init__(self, captured_list):
-                super().__init__()
-                self.captured = captured_list
-            
-            def emit(self, record):
-                self.captured.append({
-                    'level': record.levelname,
-                    'message': record.getMessage(),
-                    'time': datetime.fromtimestamp(record.created)
-                })
-        
-        self.handler = CaptureHandler(self.captured)
-        self.logger.addHandler(self.handler)
+        if self.records.maxlen:
+            if _capture_handler not in self.logger.handlers:
+                self.logger.addHandler(_capture_handler)
+            self.context = current_context()
+            self._token = _active_capture.set(self)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.handler:
-            self.logger.removeHandler(self.handler)
+        if self._token is not None:
+            _active_capture.reset(self._token)
+            self._token = None
     
     def get_errors(self):
         """Retourne uniquement les erreurs capturées."""
-        return [log for log in self.captured if log['level'] in ('ERROR', 'CRITICAL')]
+        return [log.as_entry() for log in self.records if log.level in ('ERROR', 'CRITICAL')]
     
     def get_warnings(self):
         """Retourne les warnings et erreurs."""
-        return [log for log in self.captured if log['level'] in ('WARNING', 'ERROR', 'CRITICAL')]
+        return [log.as_entry() for log in self.records if log.level in ('WARNING', 'ERROR', 'CRITICAL')]
+    
+    def dump(self, folder: Path = None) -> str:
+        """
+        Écrit la capture dans logs/failures/ (une ligne JSON par record,
+        précédée du contexte du job).
+        
+        Returns:
+            Chemin du fichier, None si la capture est vide ou l'écriture échoue
+        """
+        if not self.records:
+            return None
+        
+        folder = Path(folder or LOGS_DIR / 'failures')
+        label = '_'.join(str(self.context[field]) for field in ('run_id', 'post', 'platform', 'account')
+                         if self.context.get(field))
+        label = re.sub(r'[^\w.-]+', '-', label)
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{label}.jsonl"
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+            purge_old_files(folder, '*.jsonl', int(os.getenv('LOG_RETENTION_DAYS', 30)))
+            with open(folder / name, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'context': self.context}, ensure_ascii=False) + '\n')
+                for record in self.records:
+                    f.write(json.dumps(record.to_dict(), ensure_ascii=False) + '\n')
+        except OSError:
+            return None
+        return str(folder / name)
@@ -0,0 +1,239 @@
+"""
+Budget Famille - Preflight
+===========================
+Validation en masse des posts avant toute session navigateur.
+
+Chaque couple (post, plateforme) est vérifié contre les capacités
+déclarées par le poster: texte, formats, taille des fichiers, dimensions
+et ratio des images, durée et codec des vidéos. Les métadonnées des
+médias sont lues en parallèle (en-têtes uniquement).
+"""
+
+import os
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+
+from platforms.capabilities import MB
+from platforms.registry import builtin_platforms, get_capabilities, is_platform
+from utils.helpers import split_text_for_platform
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_image_info(path: str) -> Dict[str, Any]:
+    """Lit les dimensions d'une image (en-tête uniquement, via Pillow si disponible)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+
+    try:
+        with Image.open(path) as img:
+            return {'width': img.width, 'height': img.height, 'format': (img.format or '').lower()}
+    except Exception as e:
+        return {'error': f"image illisible ({e})"}
+
+
+def read_video_info(path: str) -> Dict[str, Any]:
+    """Lit la durée et le codec d'une vidéo via ffprobe (ffmpeg-python ou binaire)."""
+    # ffmpeg-python et le binaire reposent tous deux sur ffprobe
+    if not shutil.which('ffprobe'):
+        return {}
+
+    try:
+        try:
+            import ffmpeg
+            probe = ffmpeg.probe(path)
+        except ImportError:
+            output = subprocess.run(
+                ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+                capture_output=True, text=True, timeout=30, check=True,
+            ).stdout
+            probe = json.loads(output)
+    except Exception as e:
+        return {'error': f"vidéo illisible ({e})"}
+
+    if not probe:
+        return {}
+
+    info = {}
+    duration = probe.get('format', {}).get('duration')
+    if duration:
+        info['duration'] = float(duration)
+
+    for stream in probe.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            info['codec'] = stream.get('codec_name')
+            info['width'] = stream.get('width')
+            info['height'] = stream.get('height')
+            break
+
+    return info
+
+
+def read_media_info(path: str, kind: str) -> Dict[str, Any]:
+    """
+    Lit les métadonnées d'un média.
+
+    Args:
+        path: Chemin du fichier
+        kind: 'image' ou 'video'
+
+    Returns:
+        Dictionnaire (size, width, height, duration, codec...) ou {'error': ...}
+    """
+    try:
+        info = {'size': os.path.getsize(path)}
+    except OSError:
+        return {'error': "fichier introuvable"}
+
+    info.update(read_image_info(path) if kind == 'image' else read_video_info(path))
+    return info
+
+
+def check_post_for_platform(post: Dict[str, Any], platform: str,
+                            media_info: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Vérifie un post pour une plateforme.
+
+    Args:
+        post: Dictionnaire du post
+        platform: Nom de la plateforme
+        media_info: Métadonnées des médias, indexées par chemin
+
+    Returns:
+        Liste des raisons d'échec (vide si publiable)
+    """
+    if not is_platform(platform):
+        return ["plateforme inconnue"]
+
+    caps = get_capabilities(platform)
+    reasons = []
+
+    if not post.get('text'):
+        reasons.append("texte vide")
+    elif caps.max_thread_parts > 1:
+        parts = split_text_for_platform(post['text'], platform)
+        if len(parts) > caps.max_thread_parts:
+            reasons.append(f"thread de {len(parts)} parties > {caps.max_thread_parts}")
+
+    image, video = post.get('image'), post.get('video')
+
+    if caps.requires_media and not image and not video:
+        reasons.append("média requis")
+
+    if image:
+        info = media_info.get(image, {})
+        if not caps.accepts_image(image):
+            reasons.append(f"format image {Path(image).suffix} refusé")
+        elif 'error' in info:
+            reasons.append(info['error'])
+        else:
+            if info.get('size', 0) > caps.max_image_size:
+                reasons.append(f"image {info['size'] / MB:.1f} Mo > {caps.max_image_size / MB:.0f} Mo")
+            width, height = info.get('width'), info.get('height')
+            if width and height:
+                if caps.min_image_dimension and min(width, height) < caps.min_image_dimension:
+                    reasons.append(f"image {width}x{height} trop petite (min {caps.min_image_dimension}px)")
+                if caps.max_image_dimension and max(width, height) > caps.max_image_dimension:
+                    reasons.append(f"image {width}x{height} trop grande (max {caps.max_image_dimension}px)")
+                if caps.aspect_ratio_range:
+                    low, high = caps.aspect_ratio_range
+                    ratio = width / height
+                    if not low <= ratio <= high:
+                        reasons.append(f"ratio {ratio:.2f} hors [{low}, {high}]")
+
+    if video:
+        info = media_info.get(video, {})
+        if not caps.accepts_video(video):
+            reasons.append(f"format vidéo {Path(video).suffix} refusé")
+        elif 'error' in info:
+            reasons.append(info['error'])
+        else:
+            if info.get('size', 0) > caps.max_video_size:
+                reasons.append(f"vidéo {info['size'] / MB:.0f} Mo > {caps.max_video_size / MB:.0f} Mo")
+            duration = info.get('duration')
+            if duration and caps.max_video_duration and duration > caps.max_video_duration:
+                reasons.append(f"vidéo {duration:.0f}s > {caps.max_video_duration:.0f}s")
+            codec = info.get('codec')
+            if codec and caps.video_codecs and codec not in caps.video_codecs:
+                reasons.append(f"codec {codec} refusé")
+
+    return reasons
+
+
+class PreflightReport:
+    """Matrice des verdicts (post, plateforme)."""
+
+    def __init__(self):
+        self.verdicts: Dict[Tuple[str, str], List[str]] = {}
+        self.platforms: List[str] = []
+
+    def add(self, post_id: str, platform: str, reasons: List[str]):
+        self.verdicts[(post_id, platform)] = reasons
+        if platform not in self.platforms:
+            self.platforms.append(platform)
+
+    def reasons(self, post_id: str, platform: str) -> Optional[List[str]]:
+        """Raisons d'échec, [] si publiable, None si non ciblé."""
+        return self.verdicts.get((post_id, platform))
+
+    def publishable_platforms(self, post_id: str) -> List[str]:
+        return [p for (pid, p), reasons in self.verdicts.items() if pid == post_id and not reasons]
+
+    def failures(self) -> List[Tuple[str, str, List[str]]]:
+        return [(pid, p, reasons) for (pid, p), reasons in self.verdicts.items() if reasons]
+
+    @property
+    def publishable_count(self) -> int:
+        return sum(1 for reasons in self.verdicts.values() if not reasons)
+
+
+def resolve_platforms(post: Dict[str, Any], platform: str = None) -> List[str]:
+    """Plateformes cibles d'un post (--platform > config.json > toutes)."""
+    if platform:
+        return [platform]
+    return post.get('platforms') or builtin_platforms()
+
+
+def run_preflight(posts: List[Dict[str, Any]], platform: str = None, max_workers: int = 8) -> PreflightReport:
+    """
+    Valide tous les posts contre toutes leurs plateformes cibles.
+
+    Args:
+        posts: Posts à valider
+        platform: Restreindre à cette plateforme (option --platform)
+        max_workers: Lectures de métadonnées en parallèle
+
+    Returns:
+        PreflightReport
+    """
+    media = {}
+    for post in posts:
+        if post.get('image'):
+            media[post['image']] = 'image'
+        if post.get('video'):
+            media[post['video']] = 'video'
+
+    media_info: Dict[str, Dict[str, Any]] = {}
+    if media:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(media))) as executor:
+            futures = {path: executor.submit(read_media_info, path, kind) for path, kind in media.items()}
+            for path, future in futures.items():
+                media_info[path] = future.result()
+
+    report = PreflightReport()
+    for post in posts:
+        for target in resolve_platforms(post, platform):
+            report.add(post['date'], target, check_post_for_platform(post, target, media_info))
+
+    failures = report.failures()
+    if failures:
+        logger.warning(f"Pré-vol: {len(failures)} publication(s) bloquée(s) sur {len(report.verdicts)}")
+
+    return report
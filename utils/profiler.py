@@ -0,0 +1,154 @@
+"""
+Budget Famille - Profiler
+==========================
+Profilage des publications lentes (trace Playwright + HAR).
+
+Le mode profilage enregistre une trace et un HAR pour chaque plateforme.
+Les artefacts ne sont conservés que si une étape dépasse le seuil de
+latence (PROFILE_THRESHOLD) ou si la publication échoue.
+"""
+
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any
+
+from utils.context import context_label, current_context
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILES_DIR = Path('profiles')
+
+
+class RunProfiler:
+    """Mesure les étapes d'une publication et capture trace/HAR à la demande."""
+
+    def __init__(self, platform: str, threshold: float = None, output_dir: Path = None):
+        self.platform = platform
+        self.threshold = threshold if threshold is not None else float(os.getenv('PROFILE_THRESHOLD', 10))
+        self.steps: List[Dict[str, Any]] = []
+        self.triggered = False
+        self.tracing = False
+
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        self.context = current_context()
+        tag = context_label('run_id', 'post')
+        self.run_dir = (output_dir or PROFILES_DIR) / f"{platform}_{tag}_{timestamp}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.har_path = self.run_dir / 'network.har'
+        self.trace_path = self.run_dir / 'trace.zip'
+        self.summary_path = self.run_dir / 'summary.json'
+
+    def context_options(self) -> Dict[str, Any]:
+        """Options à passer à la création du contexte navigateur (HAR)."""
+        return {
+            'record_har_path': str(self.har_path),
+            'record_har_content': 'omit',
+        }
+
+    def start_tracing(self, context):
+        """Démarre la trace Playwright sur le contexte."""
+        try:
+            context.tracing.start(screenshots=True, snapshots=True)
+            self.tracing = True
+        except Exception as e:
+            logger.warning(f"Impossible de démarrer la trace: {e}")
+
+    def stop_tracing(self, context, failed: bool = False):
+        """Arrête la trace et ne l'écrit que si elle est utile."""
+        if not self.tracing:
+            return
+
+        self.tracing = False
+        try:
+            if self.triggered or failed:
+                context.tracing.stop(path=str(self.trace_path))
+            else:
+                context.tracing.stop()
+        except Exception as e:
+            logger.debug(f"Arrêt de la trace échoué: {e}")
+
+    @contextmanager
+    def step(self, name: str):
+        """Chronomètre une étape et déclenche la capture si elle est trop lente."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            slow = duration > self.threshold
+            self.steps.append({'step': name, 'duration': round(duration, 3), 'slow': slow})
+
+            if slow:
+                self.triggered = True
+                logger.warning(f"⏱️ Étape lente sur {self.platform}: {name} ({duration:.1f}s > {self.threshold:.0f}s)")
+
+    def finalize(self, failed: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        À appeler après la fermeture du contexte (le HAR est écrit à ce moment).
+
+        Returns:
+            Résumé du profil, ou None si rien n'a été conservé
+        """
+        if not (self.triggered or failed):
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            return None
+
+        summary = {
+            **self.context,
+            'platform': self.platform,
+            'threshold': self.threshold,
+            'failed': failed,
+            'steps': sorted(self.steps, key=lambda s: s['duration'], reverse=True),
+            'trace': str(self.trace_path) if self.trace_path.exists() else None,
+            'har': str(self.har_path) if self.har_path.exists() else None,
+        }
+
+        if self.har_path.exists():
+            summary.update(summarize_har(self.har_path))
+
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"📈 Profil sauvegardé dans {self.run_dir}")
+        summary['path'] = str(self.summary_path)
+        return summary
+
+
+def summarize_har(har_path: Path, top: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Résume un fichier HAR: requêtes les plus lentes et plus longues attentes serveur.
+
+    Args:
+        har_path: Chemin vers le fichier HAR
+        top: Nombre d'entrées à conserver
+
+    Returns:
+        Dictionnaire avec 'slowest_requests' et 'longest_waits'
+    """
+    try:
+        with open(har_path, 'r', encoding='utf-8') as f:
+            har = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"HAR illisible {har_path}: {e}")
+        return {'slowest_requests': [], 'longest_waits': []}
+
+    entries = []
+    for entry in har.get('log', {}).get('entries', []):
+        timings = entry.get('timings', {})
+        entries.append({
+            'url': entry.get('request', {}).get('url', '')[:200],
+            'method': entry.get('request', {}).get('method'),
+            'status': entry.get('response', {}).get('status'),
+            'time_ms': round(max(entry.get('time') or 0, 0), 1),
+            'wait_ms': round(max(timings.get('wait') or 0, 0), 1),
+        })
+
+    return {
+        'slowest_requests': sorted(entries, key=lambda e: e['time_ms'], reverse=True)[:top],
+        'longest_waits': sorted(entries, key=lambda e: e['wait_ms'], reverse=True)[:top],
+    }
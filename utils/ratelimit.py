@@ -0,0 +1,148 @@
+"""
+Budget Famille - Rate Limiter
+==============================
+Token buckets par (plateforme, compte), partagés entre processus.
+
+L'état est persisté dans une base SQLite locale: plusieurs lancements du
+bot (cron, terminal...) consomment les mêmes jetons et ne peuvent pas
+dépasser ensemble le rythme sûr d'une plateforme.
+
+Capacité (rafale) et recharge par heure viennent de CAPABILITIES.rate_limit,
+surchargeables par {PLATEFORME}_RATE_BURST et {PLATEFORME}_RATE_PER_HOUR,
+puis par compte ("rate_limits" dans accounts.json).
+"""
+
+import os
+import time
+import sqlite3
+from pathlib import Path
+from typing import Tuple
+
+from platforms.registry import get_capabilities
+from utils.accounts import DEFAULT_ACCOUNT, get_account
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB = Path('data') / 'ratelimit.db'
+
+
+def bucket_settings(platform: str, account: str = DEFAULT_ACCOUNT) -> Tuple[float, float]:
+    """Retourne (rafale, jetons par heure) pour une plateforme et un compte."""
+    limit = get_capabilities(platform).rate_limit
+    burst = float(os.getenv(f'{platform.upper()}_RATE_BURST', limit.burst))
+    per_hour = float(os.getenv(f'{platform.upper()}_RATE_PER_HOUR', limit.per_hour))
+
+    try:
+        overrides = get_account(account).rate_limits.get(platform, {})
+    except KeyError:
+        overrides = {}
+    burst = float(overrides.get('burst', burst))
+    per_hour = float(overrides.get('per_hour', per_hour))
+
+    return max(1.0, burst), per_hour
+
+
+class TokenBucketLimiter:
+    """Token buckets persistés dans SQLite."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or os.getenv('RATE_LIMIT_DB', DEFAULT_DB))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions explicites (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " platform TEXT NOT NULL, account TEXT NOT NULL,"
+            " tokens REAL NOT NULL, updated REAL NOT NULL,"
+            " PRIMARY KEY (platform, account))"
+        )
+
+    def _refill(self, platform: str, account: str, now: float) -> Tuple[float, float, float]:
+        """Lit le bucket et applique la recharge. Retourne (jetons, rafale, par heure)."""
+        burst, per_hour = bucket_settings(platform, account)
+        row = self.conn.execute(
+            "SELECT tokens, updated FROM buckets WHERE platform = ? AND account = ?",
+            (platform, account),
+        ).fetchone()
+
+        if row is None:
+            return burst, burst, per_hour
+
+        tokens, updated = row
+        tokens = min(burst, tokens + max(0.0, now - updated) * per_hour / 3600)
+        return tokens, burst, per_hour
+
+    def _save(self, platform: str, account: str, tokens: float, now: float):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO buckets (platform, account, tokens, updated) VALUES (?, ?, ?, ?)",
+            (platform, account, tokens, now),
+        )
+
+    @staticmethod
+    def _wait_for(tokens: float, per_hour: float) -> float:
+        if tokens >= 1:
+            return 0.0
+        if per_hour <= 0:
+            return float('inf')
+        return (1 - tokens) * 3600 / per_hour
+
+    def try_acquire(self, platform: str, account: str = None) -> float:
+        """
+        Consomme un jeton si disponible.
+
+        Returns:
+            0 si le jeton est pris, sinon le nombre de secondes à attendre
+        """
+        account = account or DEFAULT_ACCOUNT
+        now = time.time()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, _, per_hour = self._refill(platform, account, now)
+            wait = self._wait_for(tokens, per_hour)
+            if wait == 0:
+                tokens -= 1
+            self._save(platform, account, tokens, now)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return wait
+
+    def wait_time(self, platform: str, account: str = None) -> float:
+        """Secondes avant qu'un jeton soit disponible (sans le consommer)."""
+        account = account or DEFAULT_ACCOUNT
+        tokens, _, per_hour = self._refill(platform, account, time.time())
+        return self._wait_for(tokens, per_hour)
+
+    def refund(self, platform: str, account: str = None):
+        """Rend un jeton (publication abandonnée avant envoi)."""
+        account = account or DEFAULT_ACCOUNT
+        now = time.time()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, burst, _ = self._refill(platform, account, now)
+            self._save(platform, account, min(burst, tokens + 1), now)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, platform: str, account: str = None, timeout: float = None) -> bool:
+        """Attend (au plus timeout secondes) puis consomme un jeton."""
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while True:
+            wait = self.try_acquire(platform, account)
+            if wait == 0:
+                return True
+            if deadline is not None and time.time() + wait > deadline:
+                return False
+            logger.info(f"⏳ {platform}: prochain créneau dans {wait:.0f}s")
+            time.sleep(wait)
+
+    def close(self):
+        self.conn.close()
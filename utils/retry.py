@@ -0,0 +1,167 @@
+"""
+Budget Famille - Retry
+=======================
+Classification des erreurs et relance des étapes de publication.
+
+Trois familles d'erreurs:
+- transitoire (timeout, navigation, réseau): relancée avec un backoff
+  exponentiel et du jitter, en ne rejouant que l'étape en échec;
+- authentification (connexion refusée, checkpoint): jamais relancée;
+- permanente (validation, contenu refusé, erreur de programmation, et
+  toute erreur non reconnue): jamais relancée.
+
+Une étape qui a déjà envoyé la publication n'est jamais rejouée, pour ne
+pas créer de doublon.
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from typing import Callable, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRANSIENT = 'transient'
+AUTH = 'auth'
+PERMANENT = 'permanent'
+
+# Fragments de messages reconnus (Playwright, réseau, posters)
+TRANSIENT_MARKERS = (
+    'timeout', 'net::err', 'navigation', 'target closed', 'target page', 'has been closed',
+    'not attached', 'detached', 'intercepts pointer events',
+    'connection', 'econnreset', 'socket', 'temporarily',
+    'erreur de connexion', 'connexion perdue', 'connexion interrompue', 'réseau',
+)
+AUTH_MARKERS = (
+    'échec de la connexion', 'connexion requise', 'login', 'checkpoint', 'authwall',
+    'challenge', 'two-factor', '2fa',
+)
+
+
+class PostError(Exception):
+    """Erreur de publication typée."""
+
+    kind = PERMANENT
+
+
+class TransientError(PostError):
+    """Erreur passagère: l'étape peut être rejouée."""
+
+    kind = TRANSIENT
+
+
+class AuthError(PostError):
+    """Connexion refusée ou vérification de sécurité."""
+
+    kind = AUTH
+
+
+class PermanentError(PostError):
+    """Erreur définitive (contenu invalide, publication refusée)."""
+
+    kind = PERMANENT
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classe une exception en 'transient', 'auth' ou 'permanent'.
+
+    Seules les erreurs connues pour être passagères (timeouts, réseau,
+    navigation, élément détaché) sont transitoires. Les autres, dont les
+    erreurs de programmation (KeyError, TypeError...), sont permanentes:
+    les relancer ne changerait rien. Les étapes des posters signalent un
+    élément introuvable par TransientError.
+    """
+    if isinstance(error, PostError):
+        return error.kind
+
+    # playwright.sync_api.TimeoutError n'hérite pas du TimeoutError natif
+    if isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ == 'TimeoutError':
+        return TRANSIENT
+
+    if isinstance(error, (ValueError, TypeError, FileNotFoundError, PermissionError)):
+        return PERMANENT
+
+    message = str(error).lower()
+    if any(marker in message for marker in TRANSIENT_MARKERS):
+        return TRANSIENT
+    if any(marker in message for marker in AUTH_MARKERS):
+        return AUTH
+
+    return PERMANENT
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Nombre de tentatives et backoff (secondes) pour une plateforme."""
+
+    max_attempts: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 30.0
+
+    @classmethod
+    def from_env(cls, platform: str = None) -> 'RetryPolicy':
+        """
+        Lit RETRY_MAX_ATTEMPTS / RETRY_BASE_DELAY / RETRY_MAX_DELAY, surchargés
+        par plateforme (ex: INSTAGRAM_RETRY_MAX_ATTEMPTS).
+        """
+        def read(name, default):
+            value = os.getenv(f'{platform.upper()}_{name}') if platform else None
+            return value if value is not None else os.getenv(name, default)
+
+        return cls(
+            max_attempts=max(1, int(read('RETRY_MAX_ATTEMPTS', cls.max_attempts))),
+            base_delay=float(read('RETRY_BASE_DELAY', cls.base_delay)),
+            max_delay=float(read('RETRY_MAX_DELAY', cls.max_delay)),
+        )
+
+
+def retry_call(func: Callable, *args, policy: RetryPolicy = None, step: str = '',
+               can_retry: Optional[Callable[[], bool]] = None, **kwargs):
+    """
+    Appelle func en relançant les erreurs transitoires.
+
+    Args:
+        func: Fonction à appeler
+        policy: Politique de relance (défaut: variables d'environnement)
+        step: Nom de l'étape (logs)
+        can_retry: Garde supplémentaire évaluée avant chaque relance
+            (ex: la publication n'a pas encore été envoyée)
+
+    Returns:
+        Le résultat de func
+
+    Raises:
+        La dernière exception si les relances sont épuisées ou interdites
+    """
+    # Import différé: inutile pour les commandes en lecture seule
+    from tenacity import Retrying, retry_if_exception, stop_after_attempt
+
+    policy = policy or RetryPolicy.from_env()
+
+    def should_retry(error: BaseException) -> bool:
+        if classify_error(error) != TRANSIENT:
+            return False
+        return can_retry() if can_retry else True
+
+    def backoff(state) -> float:
+        # base * 2^(n-1) + jitter, plafonné (même calcul pour tenacity 8 et 9)
+        delay = policy.base_delay * 2 ** (state.attempt_number - 1) + random.uniform(0, policy.base_delay)
+        return min(delay, policy.max_delay)
+
+    def log_retry(state):
+        error = state.outcome.exception()
+        logger.warning(
+            f"🔁 {step or func.__name__}: tentative {state.attempt_number}/{policy.max_attempts} "
+            f"échouée ({error}), relance dans {state.next_action.sleep:.1f}s"
+        )
+
+    retrying = Retrying(
+        stop=stop_after_attempt(policy.max_attempts),
+        wait=backoff,
+        retry=retry_if_exception(should_retry),
+        before_sleep=log_retry,
+        reraise=True,
+    )
+    return retrying(func, *args, **kwargs)
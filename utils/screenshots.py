@@ -0,0 +1,235 @@
+"""
+Budget Famille - Screenshots
+=============================
+Pipeline de captures d'écran asynchrone et dédupliqué.
+
+La capture brute reste sur le thread appelant (l'API sync de Playwright
+n'est pas thread-safe), mais l'encodage, la déduplication par hash
+perceptuel, l'écriture disque et la rétention sont faits par un worker.
+La rétention ne touche qu'aux captures du poster (préfixe) et garde celles
+des exécutions en échec tant qu'elles ne sont pas trop anciennes.
+"""
+
+import io
+import os
+import re
+import time
+import queue
+import hashlib
+import threading
+import contextvars
+from pathlib import Path
+from typing import List, Set
+
+from utils.context import RUN_ID, context_label
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+_pil_image = False
+
+
+def _load_pil():
+    """Import différé de Pillow (optionnel: sans lui, pas de WebP et dédup par hash exact)."""
+    global _pil_image
+    if _pil_image is False:
+        try:
+            from PIL import Image
+            _pil_image = Image
+        except ImportError:
+            _pil_image = None
+    return _pil_image
+
+
+def perceptual_hash(data: bytes) -> str:
+    """
+    Calcule un dHash 64 bits d'une image (hash exact si Pillow absent).
+
+    Args:
+        data: Contenu de l'image encodée
+
+    Returns:
+        Hash hexadécimal
+    """
+    Image = _load_pil()
+    if Image is None:
+        return hashlib.sha1(data).hexdigest()
+
+    with Image.open(io.BytesIO(data)) as img:
+        pixels = list(img.convert('L').resize((9, 8)).getdata())
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def apply_retention(directory: Path, max_age_days: float = None, max_files: int = None,
+                    prefix: str = None, keep_failed: bool = False) -> int:
+    """
+    Applique la politique de rétention du dossier de captures.
+
+    Les fichiers du lancement en cours ne sont jamais supprimés: d'autres
+    workers peuvent être en train de les écrire.
+
+    Args:
+        directory: Dossier des captures
+        max_age_days: Âge maximum des fichiers (en jours)
+        max_files: Nombre maximum de fichiers conservés (les plus récents)
+        prefix: Ne traiter que les captures "<prefix>_<run_id>_..." d'un poster
+        keep_failed: Ne pas compter dans max_files les captures des exécutions
+            en échec (celles qui ont une capture "error"); seul l'âge les purge
+
+    Returns:
+        Nombre de fichiers supprimés
+    """
+    if max_age_days is None:
+        max_age_days = float(os.getenv('SCREENSHOT_RETENTION_DAYS', 7))
+    if max_files is None:
+        max_files = int(os.getenv('SCREENSHOT_MAX_FILES', 500))
+
+    owned = re.compile(rf"{re.escape(prefix)}_[0-9a-f]{{8}}_") if prefix else None
+    try:
+        files = sorted(
+            (f for f in directory.iterdir()
+             if f.is_file() and (owned is None or owned.match(f.name)) and f"_{RUN_ID}_" not in f.name),
+            key=lambda f: f.stat().st_mtime,
+            reverse=True,
+        )
+    except OSError:
+        return 0
+
+    # Exécutions en échec: "<prefix>_<run_id>_<post>" de leur capture d'erreur
+    failed = tuple(f.name.split('_error_')[0] + '_' for f in files if '_error_' in f.name) if keep_failed else ()
+
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    counted = 0
+    for file in files:
+        try:
+            kept = file.name.startswith(failed) if failed else False
+            if not kept:
+                counted += 1
+            if (counted > max_files and not kept) or file.stat().st_mtime < cutoff:
+                file.unlink()
+                removed += 1
+        except OSError:
+            continue
+
+    if removed:
+        logger.debug(f"Rétention captures: {removed} fichier(s) supprimé(s)")
+    return removed
+
+
+class ScreenshotPipeline:
+    """Captures d'écran d'une exécution, écrites en arrière-plan."""
+
+    def __init__(self, directory: Path, prefix: str, fmt: str = None, quality: int = None,
+                 keep_last: int = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(exist_ok=True)
+        self.prefix = prefix
+        self.format = (fmt or os.getenv('SCREENSHOT_FORMAT', 'jpeg')).lower()
+        self.quality = quality if quality is not None else int(os.getenv('SCREENSHOT_QUALITY', 70))
+        self.keep_last = keep_last if keep_last is not None else int(os.getenv('SCREENSHOT_KEEP', 3))
+
+        if self.format == 'jpg':
+            self.format = 'jpeg'
+        if self.format == 'webp' and _load_pil() is None:
+            logger.debug("Pillow absent: captures en JPEG au lieu de WebP")
+            self.format = 'jpeg'
+
+        self.written: List[Path] = []
+        self.skipped = 0
+        self._hashes: Set[str] = set()
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = None
+
+    @property
+    def extension(self) -> str:
+        return 'jpg' if self.format == 'jpeg' else self.format
+
+    def capture(self, page, name: str):
+        """Prend la capture (thread appelant) et délègue le reste au worker."""
+        try:
+            if self.format == 'png':
+                data = page.screenshot(type='png')
+            elif self.format == 'jpeg':
+                data = page.screenshot(type='jpeg', quality=self.quality)
+            else:
+                data = page.screenshot(type='png')
+        except Exception as e:
+            logger.debug(f"Capture impossible ({name}): {e}")
+            return
+
+        # Lancement et post dans le nom: les captures de runs parallèles restent distinctes
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        tag = context_label('run_id', 'post')
+        filename = self.directory / f"{self.prefix}_{tag}_{name}_{timestamp}.{self.extension}"
+        self._ensure_worker()
+        # La capture d'erreur est toujours écrite, même identique à une précédente
+        self._queue.put(('force' if name == 'error' else 'write', filename, data))
+
+    def close(self, failed: bool = False):
+        """
+        Attend la fin des écritures puis ne garde que les N dernières
+        captures de l'exécution, sauf en cas d'échec (tout est conservé).
+        """
+        if self._worker is None:
+            return
+
+        self._queue.put((_STOP, None, None))
+        self._worker.join(timeout=30)
+        self._worker = None
+
+        if not failed and self.keep_last > 0:
+            for file in self.written[:-self.keep_last]:
+                try:
+                    file.unlink()
+                except OSError:
+                    pass
+
+        self.written = []
+        self._hashes.clear()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            # Le worker logue dans le contexte du job qui l'a démarré
+            self._worker = threading.Thread(target=contextvars.copy_context().run, args=(self._run,),
+                                            name=f"screenshots-{self.prefix}", daemon=True)
+            self._worker.start()
+            self._queue.put(('retention', None, None))
+
+    def _run(self):
+        while True:
+            action, filename, data = self._queue.get()
+            if action is _STOP:
+                return
+            try:
+                if action == 'retention':
+                    apply_retention(self.directory, prefix=self.prefix, keep_failed=True)
+                else:
+                    self._write(filename, data, dedup=action == 'write')
+            except Exception as e:
+                logger.debug(f"Erreur pipeline captures: {e}")
+
+    def _write(self, filename: Path, data: bytes, dedup: bool = True):
+        digest = perceptual_hash(data)
+        if dedup and digest in self._hashes:
+            self.skipped += 1
+            logger.debug(f"Capture identique ignorée: {filename.name}")
+            return
+        self._hashes.add(digest)
+
+        if self.format == 'webp':
+            with _load_pil().open(io.BytesIO(data)) as img:
+                img.save(filename, format='WEBP', quality=self.quality)
+        else:
+            filename.write_bytes(data)
+
+        self.written.append(filename)
+        logger.debug(f"Screenshot: {filename}")
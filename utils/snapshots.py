@@ -0,0 +1,212 @@
+"""
+Budget Famille - DOM Snapshots
+===============================
+Instantanés DOM des pages en échec et évaluation hors ligne des sélecteurs.
+
+Quand une publication échoue, la page est sérialisée (sans scripts ni
+styles) après avoir marqué chaque élément visible d'un attribut
+data-bf-visible: la visibilité calculée par le navigateur survit ainsi au
+HTML statique. L'instantané est écrit compressé dans snapshots/.
+
+Hors ligne, les listes SELECTORS de chaque poster sont rejouées sur ces
+instantanés dans un Chromium sans réseau: nombre d'éléments trouvés,
+visibles, et sélecteur que le poster aurait retenu (le premier visible).
+
+    python main.py --selectors snapshots/
+"""
+
+import os
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.context import current_context, context_label
+from utils.logger import get_logger
+from utils.screenshots import apply_retention
+
+logger = get_logger(__name__)
+
+VISIBLE_MARK = 'data-bf-visible'
+
+# Marque les éléments visibles, sérialise une copie allégée du document
+SNAPSHOT_SCRIPT = """
+(mark) => {
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (!rect.width || !rect.height) return false;
+        if (el.checkVisibility) {
+            return el.checkVisibility({opacityProperty: true, visibilityProperty: true});
+        }
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) > 0;
+    };
+
+    const marked = [];
+    for (const el of document.body ? document.body.querySelectorAll('*') : []) {
+        if (visible(el)) {
+            el.setAttribute(mark, '');
+            marked.push(el);
+        }
+    }
+
+    const clone = document.documentElement.cloneNode(true);
+    for (const el of marked) el.removeAttribute(mark);
+
+    clone.querySelectorAll('script, style, noscript, link, meta, iframe, svg path, svg g')
+        .forEach(el => el.remove());
+    clone.querySelectorAll('[style]').forEach(el => el.removeAttribute('style'));
+
+    // Valeurs saisies (absentes du HTML)
+    const fields = document.querySelectorAll('input, textarea');
+    clone.querySelectorAll('input, textarea').forEach((el, i) => {
+        if (fields[i] && fields[i].value && fields[i].type !== 'password') {
+            el.setAttribute('value', fields[i].value);
+        }
+    });
+
+    return '<!DOCTYPE html>' + clone.outerHTML;
+}
+"""
+
+# Compte les éléments trouvés et visibles (marqués) d'un sélecteur
+COUNT_SCRIPT = "(els, mark) => [els.length, els.filter(el => el.hasAttribute(mark)).length]"
+
+
+def snapshots_enabled() -> bool:
+    """Instantanés DOM en cas d'échec (DOM_SNAPSHOTS, défaut: true)."""
+    return os.getenv('DOM_SNAPSHOTS', 'true').lower() == 'true'
+
+
+def snapshots_dir() -> Path:
+    return Path(os.getenv('SNAPSHOTS_FOLDER', 'snapshots'))
+
+
+def save_snapshot(page, platform: str, name: str, folder: Path = None) -> Optional[str]:
+    """
+    Enregistre l'instantané DOM de la page.
+
+    Doit être appelé depuis le thread du navigateur (API sync de Playwright).
+
+    Args:
+        page: Page Playwright
+        platform: Plateforme du poster (choisit les sélecteurs à l'évaluation)
+        name: Nom de l'étape ou de l'erreur
+
+    Returns:
+        Chemin de l'instantané, None en cas d'échec
+    """
+    folder = Path(folder or snapshots_dir())
+    try:
+        snapshot = {
+            'platform': platform,
+            'name': name,
+            'url': page.url,
+            'title': page.title(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'context': current_context(),
+            'viewport': page.viewport_size,
+            'html': page.evaluate(SNAPSHOT_SCRIPT, VISIBLE_MARK),
+        }
+
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{platform}_{context_label('run_id', 'post')}_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+
+        apply_retention(
+            folder,
+            max_age_days=float(os.getenv('SNAPSHOT_RETENTION_DAYS', 7)),
+            max_files=int(os.getenv('SNAPSHOT_MAX_FILES', 100)),
+        )
+        logger.info(f"🧩 Instantané DOM: {path}")
+        return str(path)
+    except Exception as e:
+        logger.debug(f"Instantané DOM impossible: {e}")
+        return None
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_snapshots(path: Path) -> List[Path]:
+    """Instantanés d'un dossier (ou le fichier lui-même), du plus ancien au plus récent."""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(path.glob('*.json.gz'), key=lambda item: item.stat().st_mtime)
+
+
+def evaluate_selectors(page, selectors: Dict[str, tuple]) -> Dict[str, Dict[str, Any]]:
+    """
+    Évalue des groupes de sélecteurs sur la page chargée.
+
+    Returns:
+        {groupe: {'winner': sélecteur retenu ou None,
+                  'selectors': [(sélecteur, trouvés, visibles, erreur)]}}
+    """
+    results = {}
+    for group, candidates in selectors.items():
+        rows = []
+        winner = None
+        for selector in candidates:
+            try:
+                found, visible = page.locator(selector).evaluate_all(COUNT_SCRIPT, VISIBLE_MARK)
+                rows.append((selector, found, visible, None))
+                if visible and winner is None:
+                    winner = selector
+            except Exception as e:
+                rows.append((selector, 0, 0, str(e).splitlines()[0]))
+        results[group] = {'winner': winner, 'selectors': rows}
+    return results
+
+
+def evaluate_snapshots(paths: List[Path]) -> List[Dict[str, Any]]:
+    """
+    Rejoue les SELECTORS des posters sur des instantanés, dans un Chromium
+    headless sans réseau ni JavaScript.
+
+    Returns:
+        [{'path', 'platform', 'name', 'url', 'groups'}] (voir evaluate_selectors)
+    """
+    from playwright.sync_api import sync_playwright
+    from platforms.registry import get_poster_class, is_platform
+
+    reports = []
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        try:
+            for path in paths:
+                try:
+                    snapshot = load_snapshot(path)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Instantané illisible {path}: {e}")
+                    continue
+
+                if not is_platform(snapshot.get('platform', '')):
+                    logger.error(f"Plateforme inconnue dans {path}: {snapshot.get('platform')}")
+                    continue
+
+                context = browser.new_context(java_script_enabled=False,
+                                              viewport=snapshot.get('viewport'))
+                try:
+                    page = context.new_page()
+                    page.route('**/*', lambda route: route.abort())
+                    page.set_content(snapshot['html'], wait_until='domcontentloaded')
+                    groups = evaluate_selectors(page, get_poster_class(snapshot['platform']).SELECTORS)
+                finally:
+                    context.close()
+
+                reports.append({
+                    'path': str(path),
+                    'platform': snapshot['platform'],
+                    'name': snapshot.get('name'),
+                    'url': snapshot.get('url'),
+                    'groups': groups,
+                })
+        finally:
+            browser.close()
+    return reports
@@ -0,0 +1,228 @@
+"""
+Budget Famille - Templates
+===========================
+Templates de posts (templates/*.txt) compilés et mis en cache.
+
+Un template est découpé une seule fois en segments (texte fixe et
+variables {{nom}}), puis gardé en mémoire tant que le fichier n'est pas
+modifié (mtime). Le rendu assemble les segments sans rechercher/remplacer
+et signale les variables manquantes au lieu de laisser passer "{{nom}}".
+
+Le rendu en masse lit un CSV ou un JSONL (une ligne = un post) et crée les
+dossiers posts/<date>/ en une passe:
+
+    date,titre,contenu,economie,platforms,schedule
+    2025-02-03,Les abonnements,Faites le tri...,30€/mois,linkedin;twitter,2025-02-03T09:00:00
+"""
+
+import os
+import re
+import csv
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_VARIABLE = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}')
+
+# Colonnes d'une ligne qui décrivent le post (les autres sont des variables)
+POST_FIELDS = ('date', 'platforms', 'accounts', 'schedule', 'image', 'video')
+
+_cache: Dict[Path, Tuple[float, 'Template']] = {}
+
+
+class Template:
+    """Template compilé: segments de texte fixe et noms de variables."""
+
+    __slots__ = ('name', 'segments', 'variables')
+
+    def __init__(self, source: str, name: str = ''):
+        self.name = name
+        # Segments alternés: texte, variable, texte, variable, ..., texte
+        self.segments: List[str] = _VARIABLE.split(source)
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(self.segments[1::2]))
+
+    def missing(self, variables: Dict[str, Any]) -> List[str]:
+        """Variables du template absentes (ou vides) dans `variables`."""
+        return [name for name in self.variables if variables.get(name) in (None, '')]
+
+    def render(self, variables: Dict[str, Any], strict: bool = True) -> str:
+        """
+        Assemble le texte.
+
+        Args:
+            variables: Valeurs des variables
+            strict: Lever une erreur si des variables manquent (sinon "{{nom}}" est conservé)
+
+        Raises:
+            KeyError: Si strict et que des variables manquent
+        """
+        missing = self.missing(variables)
+        if missing and strict:
+            raise KeyError(f"Variables manquantes pour {self.name}: {', '.join(missing)}")
+
+        parts = []
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                parts.append(segment)
+            elif segment in missing:
+                parts.append(f'{{{{{segment}}}}}')
+            else:
+                parts.append(str(variables[segment]))
+        return ''.join(parts)
+
+
+def templates_dir() -> Path:
+    return Path(os.getenv('TEMPLATES_FOLDER', 'templates'))
+
+
+def get_template(name: str, folder: Path = None) -> Template:
+    """
+    Retourne un template compilé (recompilé seulement si le fichier a changé).
+
+    Args:
+        name: Nom du template (sans extension)
+        folder: Dossier des templates (défaut: TEMPLATES_FOLDER ou templates/)
+
+    Raises:
+        FileNotFoundError: Si le template n'existe pas
+    """
+    path = Path(folder or templates_dir()) / f'{name}.txt'
+    if not path.exists():
+        raise FileNotFoundError(f"Template non trouvé: {path}")
+
+    mtime = path.stat().st_mtime
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    template = Template(path.read_text(encoding='utf-8'), name=name)
+    _cache[path] = (mtime, template)
+    return template
+
+
+def read_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lit les lignes d'un CSV ou d'un JSONL, une à une."""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            yield from csv.DictReader(f)
+            return
+
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {'_error': f"ligne {number}: JSON invalide ({e})"}
+
+
+def split_list(value: Any) -> Optional[List[str]]:
+    """Liste depuis une cellule CSV ("linkedin;twitter") ou un tableau JSON."""
+    if value in (None, ''):
+        return None
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in re.split(r'[;,]', str(value)) if item.strip()]
+
+
+def _is_folder_name(value: str) -> bool:
+    """Nom de dossier simple (pas de chemin absolu, de séparateur ni de '..')."""
+    return value not in ('.', '..') and '/' not in value and '\\' not in value and ':' not in value
+
+
+def _media_path(value: Any, base: Path) -> Optional[str]:
+    """Chemin d'un média, relatif au fichier des lignes s'il n'est pas absolu."""
+    if not value:
+        return None
+    path = Path(str(value))
+    return str(path if path.is_absolute() else base / path)
+
+
+def write_post(post_dir: Path, text: str, row: Dict[str, Any]):
+    """Écrit un dossier de post (caption.txt, config.json, médias copiés)."""
+    post_dir.mkdir(parents=True, exist_ok=True)
+    (post_dir / 'caption.txt').write_text(text, encoding='utf-8')
+
+    config = {}
+    for key in ('platforms', 'accounts'):
+        values = split_list(row.get(key))
+        if values:
+            config[key] = values
+    if row.get('schedule'):
+        config['schedule'] = row['schedule']
+    if config:
+        with open(post_dir / 'config.json', 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+
+    for kind in ('image', 'video'):
+        if row.get(kind):
+            source = Path(row[kind])
+            shutil.copy2(source, post_dir / f'{kind}{source.suffix.lower()}')
+
+
+def render_batch(template_name: str, rows_path: Path, posts_folder: Path = None,
+                 overwrite: bool = False) -> Dict[str, List]:
+    """
+    Crée un dossier de post par ligne d'un CSV/JSONL.
+
+    Une ligne invalide (date absente ou qui n'est pas un simple nom de
+    dossier, variable manquante, média introuvable) est signalée sans
+    interrompre les autres. Les médias relatifs sont lus à côté du fichier
+    des lignes.
+
+    Args:
+        template_name: Nom du template
+        rows_path: Fichier CSV ou JSONL des variables
+        posts_folder: Dossier des posts (défaut: POSTS_FOLDER ou posts/)
+        overwrite: Remplacer les dossiers existants
+
+    Returns:
+        {'created': [dates], 'skipped': [dates], 'errors': [(ligne, message)]}
+    """
+    template = get_template(template_name)
+    posts_folder = Path(posts_folder or os.getenv('POSTS_FOLDER', 'posts'))
+    report = {'created': [], 'skipped': [], 'errors': []}
+    base = Path(rows_path).parent
+
+    for number, row in enumerate(read_rows(rows_path), 1):
+        if '_error' in row:
+            report['errors'].append((number, row['_error']))
+            continue
+
+        date = str(row.get('date') or '').strip()
+        if not date:
+            report['errors'].append((number, "colonne 'date' vide"))
+            continue
+        if not _is_folder_name(date):
+            report['errors'].append((number, f"date invalide (nom de dossier attendu): {date}"))
+            continue
+
+        post_dir = posts_folder / date
+        if post_dir.exists() and not overwrite:
+            report['skipped'].append(date)
+            continue
+
+        variables = {key: value for key, value in row.items() if key not in POST_FIELDS}
+        row = {**row, 'image': _media_path(row.get('image'), base), 'video': _media_path(row.get('video'), base)}
+        try:
+            text = template.render(variables)
+            for kind in ('image', 'video'):
+                if row.get(kind) and not Path(row[kind]).exists():
+                    raise FileNotFoundError(f"{kind} introuvable: {row[kind]}")
+            write_post(post_dir, text, row)
+            report['created'].append(date)
+        except (KeyError, OSError) as e:
+            message = e.args[0] if isinstance(e, KeyError) else str(e)
+            report['errors'].append((number, f"{date}: {message}"))
+
+    logger.info(
+        f"Templates: {len(report['created'])} post(s) créé(s), "
+        f"{len(report['skipped'])} existant(s), {len(report['errors'])} erreur(s)"
+    )
+    return report
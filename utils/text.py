@@ -0,0 +1,235 @@
+"""
+Budget Famille - Text Engine
+=============================
+Longueur pondérée des textes et découpage en threads.
+
+X ne compte pas les caractères mais un poids (règles twitter-text v3):
+- latin, ponctuation courante: 1;
+- autres écritures (CJK...) et emojis: 2, une séquence emoji (drapeau,
+  ZWJ, teinte de peau) comptant pour un seul emoji;
+- URL: 23 quelle que soit sa longueur (raccourcie en t.co).
+
+Un texte trop long est découpé aux fins de phrase en un thread numéroté
+("1/3"). Les découpages sont mis en cache: un même post n'est calculé
+qu'une fois (pré-vol, formatage et publication).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Tuple
+
+URL_WEIGHT = 23
+
+# Plages pondérées 1 (twitter-text v3), le reste compte 2
+_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+|\b[a-z0-9-]+(?:\.[a-z0-9-]+)*\.(?:com|fr|org|net|io|co|app)(?:/\S*)?\b',
+                          re.IGNORECASE)
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+ZWJ = 0x200D
+VARIATION_SELECTOR = 0xFE0F
+KEYCAP = 0x20E3
+
+
+def _is_emoji(cp: int) -> bool:
+    return (0x1F000 <= cp <= 0x1FAFF or 0x2600 <= cp <= 0x27BF
+            or 0x2300 <= cp <= 0x23FF or 0x2B00 <= cp <= 0x2BFF)
+
+
+def _is_emoji_modifier(cp: int) -> bool:
+    """Caractères qui prolongent la séquence emoji précédente."""
+    return (cp in (VARIATION_SELECTOR, KEYCAP) or 0x1F3FB <= cp <= 0x1F3FF
+            or 0xE0020 <= cp <= 0xE007F)
+
+
+def _char_weight(cp: int) -> int:
+    for low, high in _LIGHT_RANGES:
+        if low <= cp <= high:
+            return 1
+    return 2
+
+
+def _plain_weight(text: str) -> int:
+    """Poids d'un texte sans URL."""
+    codes = [ord(c) for c in text]
+    weight = 0
+    i = 0
+    while i < len(codes):
+        cp = codes[i]
+        nxt = codes[i + 1] if i + 1 < len(codes) else None
+
+        # Keycap: 1️⃣ = chiffre + FE0F + 20E3
+        if nxt is not None and (nxt == KEYCAP or (nxt == VARIATION_SELECTOR and KEYCAP in codes[i + 2:i + 3])):
+            weight += 2
+            i += 3 if nxt == VARIATION_SELECTOR else 2
+            continue
+
+        if _is_emoji(cp):
+            # Drapeau: paire d'indicateurs régionaux
+            if 0x1F1E6 <= cp <= 0x1F1FF and nxt is not None and 0x1F1E6 <= nxt <= 0x1F1FF:
+                i += 2
+            else:
+                i += 1
+                while i < len(codes):
+                    if _is_emoji_modifier(codes[i]):
+                        i += 1
+                    elif codes[i] == ZWJ and i + 1 < len(codes):
+                        i += 2
+                    else:
+                        break
+            weight += 2
+            continue
+
+        weight += _char_weight(cp)
+        i += 1
+    return weight
+
+
+def weighted_length(text: str) -> int:
+    """
+    Longueur d'un texte telle que comptée par X.
+
+    Args:
+        text: Texte à mesurer
+
+    Returns:
+        Poids total (280 maximum pour un tweet)
+    """
+    text = unicodedata.normalize('NFC', text)
+    weight = 0
+    position = 0
+    for match in _URL_PATTERN.finditer(text):
+        weight += _plain_weight(text[position:match.start()]) + URL_WEIGHT
+        position = match.end()
+    return weight + _plain_weight(text[position:])
+
+
+def text_length(text: str, weighted: bool = False) -> int:
+    """Longueur pondérée (X) ou simple nombre de caractères."""
+    return weighted_length(text) if weighted else len(text)
+
+
+def _fit_end(text: str, limit: int, weighted: bool) -> int:
+    """Nombre de caractères du plus long début de texte qui tient dans la limite."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if text_length(text[:middle], weighted) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _cut(text: str, limit: int, weighted: bool, min_ratio: float = 0.0) -> Tuple[str, str]:
+    """
+    Coupe un texte au dernier espace qui tient dans la limite (en plein mot
+    si cet espace ferait perdre plus que `min_ratio` de la partie).
+
+    Returns:
+        (début, reste)
+    """
+    if text_length(text, weighted) <= limit:
+        return text, ''
+
+    end = _fit_end(text, limit, weighted)
+    space = text.rfind(' ', 0, end + 1)
+    if space > 0 and space >= end * min_ratio:
+        end = space
+    return text[:end].rstrip(), text[end:].lstrip()
+
+
+def fit_text(text: str, max_length: int, weighted: bool = False, ellipsis: str = '...') -> str:
+    """
+    Tronque un texte à une longueur maximale, à un espace si possible.
+
+    Args:
+        text: Texte original
+        max_length: Longueur maximale (pondérée si weighted)
+        weighted: Utiliser le comptage de X
+        ellipsis: Suffixe ajouté en cas de coupe
+
+    Returns:
+        Texte tronqué
+    """
+    if text_length(text, weighted) <= max_length:
+        return text
+
+    # Couper à un espace sans perdre plus de ~30% du texte
+    head, _ = _cut(text, max_length - text_length(ellipsis, weighted), weighted, min_ratio=0.7)
+    return head + ellipsis
+
+
+def _units(text: str) -> List[str]:
+    """Phrases et paragraphes du texte (séparateurs conservés)."""
+    units = []
+    position = 0
+    for match in _SENTENCE_END.finditer(text):
+        units.append(text[position:match.end()])
+        position = match.end()
+    if position < len(text):
+        units.append(text[position:])
+    return units
+
+
+def _pack(text: str, limit: int, weighted: bool) -> List[str]:
+    """Regroupe les phrases en parties d'au plus `limit`."""
+    parts = []
+    current = ''
+    for unit in _units(text):
+        candidate = current + unit
+        if text_length(candidate.strip(), weighted) <= limit:
+            current = candidate
+            continue
+
+        if current.strip():
+            parts.append(current.strip())
+        current = unit
+
+        # Phrase plus longue qu'une partie: coupée aux espaces
+        while text_length(current.strip(), weighted) > limit:
+            head, current = _cut(current.strip(), limit, weighted)
+            parts.append(head)
+
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+@lru_cache(maxsize=256)
+def split_thread(text: str, max_length: int = 280, weighted: bool = True,
+                 numbering: bool = True) -> Tuple[str, ...]:
+    """
+    Découpe un texte en thread aux fins de phrase.
+
+    Un texte qui tient dans une partie est retourné tel quel; sinon chaque
+    partie reçoit son numéro (" 1/3") compté dans la limite.
+
+    Args:
+        text: Texte complet
+        max_length: Longueur maximale d'une partie
+        weighted: Utiliser le comptage de X
+        numbering: Ajouter la numérotation
+
+    Returns:
+        Parties du thread (tuple: résultat mis en cache)
+    """
+    text = text.strip()
+    if text_length(text, weighted) <= max_length:
+        return (text,)
+
+    if not numbering:
+        return tuple(_pack(text, max_length, weighted))
+
+    # La place réservée au numéro dépend du nombre de parties
+    total = 9
+    while True:
+        suffix = f" {total}/{total}"
+        parts = _pack(text, max_length - text_length(suffix, weighted), weighted)
+        if len(str(len(parts))) <= len(str(total)):
+            break
+        total = 10 ** len(str(len(parts))) - 1
+
+    return tuple(f"{part} {i}/{len(parts)}" for i, part in enumerate(parts, 1))